@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Comprueba el enrutado del FailoverParser con backends falsos.
+
+No llama a Gemini: cada backend es un parser local que responde, falla o
+se cuelga a voluntad. Verifica el failover, que una llamada colgada no
+quite hilos a los demás backends, la apertura y el cierre del circuito y
+la preferencia entre backends sanos.
+
+Uso: python scripts/check_failover_parser.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from domain.entities.routine import Exercise, Routine
+from domain.exceptions import ParsingError
+from domain.interfaces.routine_parser import RoutineParserInterface
+from infrastructure.ai.failover_parser import FailoverParser, ParserBackend
+
+
+class FakeParser(RoutineParserInterface):
+    """Parser que responde con su nombre, falla o se cuelga."""
+
+    def __init__(self, name: str, mode: str = "ok"):
+        self.name = name
+        self.mode = mode
+        self.calls = 0
+        self.release = threading.Event()
+
+    def parse(self, text: str):
+        self.calls += 1
+        if self.mode == "fail":
+            raise ParsingError(f"{self.name} caído")
+        if self.mode == "hang":
+            self.release.wait()
+        return [Routine(day_number=1, exercises=[Exercise(self.name, "1", ["1"])])]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def answered_by(parser: FailoverParser) -> str:
+    return parser.parse("rutina")[0].exercises[0].name
+
+
+def check_failover():
+    primary, local = FakeParser("gemini", "fail"), FakeParser("rule_based")
+    parser = FailoverParser(
+        [ParserBackend("gemini", primary), ParserBackend("rule_based", local)]
+    )
+    return answered_by(parser) == "rule_based" and primary.calls == 1
+
+
+def check_preference():
+    primary, local = FakeParser("gemini"), FakeParser("rule_based")
+    parser = FailoverParser(
+        [
+            ParserBackend("gemini", primary),
+            ParserBackend("rule_based", local, inline=True),
+        ]
+    )
+    return all(answered_by(parser) == "gemini" for _ in range(5)) and not local.calls
+
+
+def check_timeout_isolation():
+    hung, local = FakeParser("gemini", "hang"), FakeParser("rule_based")
+    parser = FailoverParser(
+        [
+            ParserBackend("gemini", hung, timeout=0.2, max_concurrency=1),
+            ParserBackend("rule_based", local, inline=True),
+        ],
+        failure_threshold=100,
+    )
+    try:
+        first = answered_by(parser)
+        # El único hilo de gemini sigue colgado: se salta sin esperar
+        started = time.monotonic()
+        second = answered_by(parser)
+        elapsed = time.monotonic() - started
+        busy = parser.stats()["gemini"]["in_flight"] == 1
+    finally:
+        hung.release.set()
+    return first == second == "rule_based" and elapsed < 0.1 and busy
+
+
+def check_circuit():
+    clock = FakeClock()
+    flaky, local = FakeParser("gemini", "fail"), FakeParser("rule_based")
+    parser = FailoverParser(
+        [
+            ParserBackend("gemini", flaky),
+            ParserBackend("rule_based", local, inline=True),
+        ],
+        failure_threshold=2,
+        cooldown=30.0,
+        clock=clock,
+    )
+    for _ in range(4):
+        answered_by(parser)
+    opened = parser.stats()["gemini"]["circuit_open"] and flaky.calls == 2
+
+    # Pasado el cooldown el circuito se cierra y gemini vuelve a preferirse
+    clock.now += 31
+    flaky.mode = "ok"
+    recovered = answered_by(parser) == "gemini"
+    return opened and recovered
+
+
+CHECKS = {
+    "failover al siguiente backend": check_failover,
+    "preferencia entre backends sanos": check_preference,
+    "una llamada colgada no bloquea a los demás": check_timeout_isolation,
+    "el circuito se abre y se cierra": check_circuit,
+}
+
+
+def main():
+    failures = 0
+    for name, check in CHECKS.items():
+        ok = check()
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
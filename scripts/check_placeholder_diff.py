@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Comprueba en dry-run las actualizaciones de la estrategia de placeholders.
+
+No hace llamadas a Google: aplica los requests de `compile` y después los
+de `diff` sobre un modelo en memoria de la presentación (slides, títulos y
+tablas con el estilo de cada fila) y verifica que el resultado coincide
+con compilar la versión nueva desde cero, y que ninguna fila de datos ha
+heredado el estilo de los encabezados.
+
+Uso: python scripts/check_placeholder_diff.py
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from domain.entities.routine import Exercise, Routine
+from infrastructure.google.placeholder_planner import (
+    DAY_MARKER,
+    ROW_MARKERS,
+    PlaceholderFillPlanner,
+)
+
+NUM_EXISTING = 2
+
+
+def routine(day: int, exercises: int, tag: str = "") -> Routine:
+    """Un día con `exercises` ejercicios (`tag` cambia sus textos)."""
+    return Routine(
+        day_number=day,
+        exercises=[
+            Exercise(name=f"Ejercicio {i}{tag}", sets="4", reps=["10", "8"])
+            for i in range(1, exercises + 1)
+        ],
+    )
+
+
+class FakePresentation:
+    """Modelo mínimo de una presentación que entiende los requests usados."""
+
+    def __init__(self):
+        # Plantilla: una slide normal y el esqueleto (la última)
+        self.order = ["intro", "skeleton"]
+        self.slides = {
+            "intro": {"title": ("t_intro", "Intro"), "table": None},
+            "skeleton": {
+                "title": ("skeleton_title", DAY_MARKER),
+                "table": (
+                    "skeleton_table",
+                    [
+                        ["header", ["Ejercicio", "Series", "Repeticiones"]],
+                        ["data", list(ROW_MARKERS)],
+                    ],
+                ),
+            },
+        }
+
+    def apply(self, requests):
+        for request in requests:
+            (kind, body), = request.items()
+            getattr(self, f"_{kind}")(body)
+
+    def snapshot(self):
+        """[(título, [(estilo, textos)])] de las slides de rutina, en orden."""
+        result = []
+        for slide_id in self.order[NUM_EXISTING - 1 :]:
+            slide = self.slides[slide_id]
+            rows = [(style, tuple(texts)) for style, texts in slide["table"][1]]
+            result.append((slide["title"][1], rows))
+        return result
+
+    # Requests ────────────────────────────────────────────────
+
+    def _duplicateObject(self, body):
+        source = body["objectId"]
+        ids = body["objectIds"]
+        slide = copy.deepcopy(self.slides[source])
+        slide["title"] = (ids[slide["title"][0]], slide["title"][1])
+        slide["table"] = (ids[slide["table"][0]], slide["table"][1])
+        self.slides[ids[source]] = slide
+        self.order.insert(self.order.index(source) + 1, ids[source])
+
+    def _deleteObject(self, body):
+        del self.slides[body["objectId"]]
+        self.order.remove(body["objectId"])
+
+    def _updateSlidesPosition(self, body):
+        moved = body["slideObjectIds"]
+        before = self.order[: body["insertionIndex"]]
+        rest = [s for s in before if s not in moved]
+        tail = [s for s in self.order if s not in before and s not in moved]
+        self.order = rest + moved + tail
+
+    def _replaceAllText(self, body):
+        marker = body["containsText"]["text"]
+        text = body["replaceText"]
+        for slide_id in body["pageObjectIds"]:
+            slide = self.slides[slide_id]
+            title_id, title = slide["title"]
+            slide["title"] = (title_id, title.replace(marker, text))
+            for row in slide["table"][1]:
+                row[1] = [cell.replace(marker, text) for cell in row[1]]
+
+    def _insertTableRows(self, body):
+        rows = self._table(body["tableObjectId"])
+        anchor = body["cellLocation"]["rowIndex"]
+        style = rows[anchor][0]
+        for _ in range(body["number"]):
+            rows.insert(anchor + 1, [style, ["", "", ""]])
+
+    def _deleteTableRow(self, body):
+        del self._table(body["tableObjectId"])[body["cellLocation"]["rowIndex"]]
+
+    def _deleteText(self, body):
+        self._write(body, "")
+
+    def _insertText(self, body):
+        self._write(body, body["text"])
+
+    def _write(self, body, text):
+        cell = body.get("cellLocation")
+        if cell is None:
+            for slide in self.slides.values():
+                if slide["title"][0] == body["objectId"]:
+                    slide["title"] = (body["objectId"], text)
+            return
+        row = self._table(body["objectId"])[cell["rowIndex"]]
+        row[1][cell["columnIndex"]] = text
+
+    def _table(self, table_id):
+        for slide in self.slides.values():
+            if slide["table"] and slide["table"][0] == table_id:
+                return slide["table"][1]
+        raise KeyError(table_id)
+
+
+CASES = {
+    "más filas": ([routine(1, 3)], [routine(1, 6)]),
+    "menos filas": ([routine(1, 6)], [routine(1, 2)]),
+    "textos cambiados": ([routine(1, 4)], [routine(1, 4, "b")]),
+    "día vacío que crece": (
+        [routine(1, 3), routine(2, 0)],
+        [routine(1, 5), routine(2, 2), routine(3, 1)],
+    ),
+    "día que se vacía": (
+        [routine(1, 3), routine(2, 4)],
+        [routine(1, 3), routine(2, 0)],
+    ),
+    "días nuevos": ([routine(1, 2)], [routine(1, 2), routine(2, 3), routine(3, 0)]),
+    "días quitados": ([routine(1, 2), routine(2, 3), routine(3, 1)], [routine(1, 2)]),
+    "paginación": ([routine(1, 20)], [routine(1, 30), routine(2, 12)]),
+}
+
+
+def main():
+    planner = PlaceholderFillPlanner(
+        "layout", "skeleton", "skeleton_title", "skeleton_table", max_rows_per_slide=8
+    )
+    failures = 0
+
+    for name, (previous, current) in CASES.items():
+        updated = FakePresentation()
+        updated.apply(planner.compile(previous, NUM_EXISTING))
+        updated.apply(planner.diff(previous, current, NUM_EXISTING))
+
+        expected = FakePresentation()
+        expected.apply(planner.compile(current, NUM_EXISTING))
+
+        result = updated.snapshot()
+        header_rows = sum(
+            style == "header" for _, rows in result for style, _ in rows[1:]
+        )
+        ok = result == expected.snapshot() and not header_rows
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {name}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Compara en dry-run las estrategias de generación de Google Slides.
+
+No hace llamadas a Google: compila los requests de cada estrategia para
+una rutina de ejemplo y muestra número de requests y bytes del batchUpdate.
+
+Uso: python scripts/compare_slides_strategies.py [días] [ejercicios_por_día]
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from domain.entities.routine import Exercise, Routine
+from infrastructure.google.placeholder_planner import PlaceholderFillPlanner
+from infrastructure.google.request_planner import (
+    SlidesRequestPlanner,
+    compare_strategies,
+)
+
+
+def sample_routines(days: int, exercises: int) -> list:
+    """Genera una rutina de ejemplo."""
+    return [
+        Routine(
+            day_number=day,
+            exercises=[
+                Exercise(name=f"Ejercicio {i}", sets="4", reps=["10", "8", "6"])
+                for i in range(1, exercises + 1)
+            ],
+        )
+        for day in range(1, days + 1)
+    ]
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    exercises = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    planners = [
+        SlidesRequestPlanner("layout"),
+        PlaceholderFillPlanner("layout", "skeleton", "skeleton_title", "skeleton_table"),
+    ]
+    result = compare_strategies(
+        planners, sample_routines(days, exercises), "template", num_existing=2
+    )
+
+    print(f"\n📊 {days} días x {exercises} ejercicios\n")
+    print(f"{'Estrategia':<14}{'Requests':>10}{'Bytes':>10}{'Round trips':>13}")
+    print("-" * 47)
+    for name, metrics in result.items():
+        print(
+            f"{name:<14}{metrics['requests']:>10}{metrics['bytes']:>10}"
+            f"{metrics['round_trips']:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
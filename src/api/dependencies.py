@@ -4,18 +4,66 @@ Inyección de dependencias para FastAPI.
 Configura y proporciona las instancias de los servicios.
 """
 
+import json
 import logging
 from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
 
+from application.dtos.routine_dto import RoutineDTO
 from application.use_cases.generate_presentation import GeneratePresentationUseCase
 from application.use_cases.parse_routine import ParseRoutineUseCase
+from application.use_cases.update_presentation import UpdatePresentationUseCase
+from domain.interfaces.presentation_generator import PresentationGeneratorInterface
+from infrastructure.ai.failover_parser import FailoverParser, ParserBackend
 from infrastructure.ai.gemini_parser import GeminiParser
+from infrastructure.ai.rule_based_parser import RuleBasedParser
 from infrastructure.chatwoot import ChatwootLogger, NullChatwootLogger
 from infrastructure.chatwoot.interface import ChatwootLoggerInterface
 from infrastructure.config.settings import settings
+from infrastructure.google.placeholder_planner import PlaceholderFillPlanner
+from infrastructure.google.request_planner import SlidesRequestPlanner
+from infrastructure.google.retention_sweeper import RetentionSweeper
+from infrastructure.google.sharded_generator import (
+    AccountShard,
+    ShardedSlidesGenerator,
+    TokenBucket,
+)
 from infrastructure.google.slides_generator import GoogleSlidesGenerator
+from infrastructure.jobs import (
+    JOB_GENERATE_PRESENTATION,
+    JOB_UPDATE_PRESENTATION,
+    FairScheduler,
+    JobWorkerPool,
+    SQLiteJobQueue,
+)
+from infrastructure.persistence.sqlite_presentation_cache import (
+    SQLitePresentationCache,
+)
+from infrastructure.persistence.sqlite_presentation_ownership import (
+    SQLitePresentationOwnership,
+)
+from infrastructure.persistence.sqlite_retention_store import SQLiteRetentionStore
+from infrastructure.persistence.sqlite_routine_store import SQLiteRoutineStore
+from infrastructure.persistence.sqlite_seen_updates import SQLiteSeenUpdates
+from infrastructure.persistence.sqlite_snapshot_store import SQLiteRoutineSnapshotStore
+from infrastructure.persistence.sqlite_update_inbox import SQLiteUpdateInbox
+from infrastructure.powerpoint.fallback_generator import FallbackPresentationGenerator
+from infrastructure.powerpoint.pptx_generator import PptxPresentationGenerator
+from infrastructure.state import (
+    ConversationStateStoreInterface,
+    MemoryStateStore,
+    RedisStateStore,
+    SQLiteStateStore,
+)
+from infrastructure.telegram.async_bot import AsyncTelegramBot
 from infrastructure.telegram.bot import TelegramBot
 from infrastructure.telegram.handlers import TelegramHandler
+from infrastructure.telegram.rate_limiter import TelegramRateLimiter
+from infrastructure.telegram.update_deduplicator import UpdateDeduplicator
+from infrastructure.telegram.update_dispatcher import UpdateDispatcher
+from infrastructure.telegram.update_poller import UpdatePoller
+from infrastructure.viewer.routine_viewer import RoutineViewer
 
 logger = logging.getLogger(__name__)
 
@@ -32,19 +80,284 @@ def get_gemini_parser() -> GeminiParser:
 
 
 @lru_cache()
-def get_slides_generator() -> GoogleSlidesGenerator:
-    """Devuelve instancia singleton del generador de slides."""
-    return GoogleSlidesGenerator(
-        credentials_json=settings.google_credentials,
+def get_routine_parser() -> FailoverParser:
+    """
+    Devuelve el parser compuesto con failover (singleton).
+
+    Orden de preferencia: Gemini, modelo alternativo (si está configurado)
+    y parser local por reglas (si está habilitado).
+    """
+    timeout = settings.parser_backend_timeout_seconds
+    backends = [ParserBackend("gemini", get_gemini_parser(), timeout=timeout)]
+
+    if settings.gemini_fallback_model:
+        fallback = GeminiParser(
+            api_key=settings.gemini_api_key, model=settings.gemini_fallback_model
+        )
+        backends.append(ParserBackend("gemini_fallback", fallback, timeout=timeout))
+
+    if settings.parser_rule_based_fallback:
+        backends.append(ParserBackend("rule_based", RuleBasedParser(), inline=True))
+
+    return FailoverParser(backends, deadline=settings.parser_deadline_seconds)
+
+
+def get_slides_planner() -> SlidesRequestPlanner:
+    """Devuelve la estrategia de generación configurada para la plantilla."""
+    limits = {
+        "max_rows_per_slide": settings.slides_max_rows_per_slide,
+        "max_batch_requests": settings.slides_max_batch_requests,
+        "max_batch_bytes": settings.slides_max_batch_bytes,
+    }
+    if settings.slides_strategy == "placeholder":
+        if not (
+            settings.skeleton_slide_id
+            and settings.skeleton_title_id
+            and settings.skeleton_table_id
+        ):
+            raise ValueError(
+                "La estrategia 'placeholder' requiere SKELETON_SLIDE_ID, "
+                "SKELETON_TITLE_ID y SKELETON_TABLE_ID"
+            )
+        return PlaceholderFillPlanner(
+            layout_id=settings.routine_layout_id,
+            skeleton_slide_id=settings.skeleton_slide_id,
+            title_id=settings.skeleton_title_id,
+            table_id=settings.skeleton_table_id,
+            **limits,
+        )
+    return SlidesRequestPlanner(settings.routine_layout_id, **limits)
+
+
+@lru_cache()
+def get_slides_generator() -> Union[GoogleSlidesGenerator, ShardedSlidesGenerator]:
+    """
+    Devuelve instancia singleton del generador de slides.
+
+    Con GOOGLE_CREDENTIALS_POOL se reparte la generación entre la cuenta
+    principal y las adicionales, cada una con su propio presupuesto.
+    """
+    if not settings.google_credentials_pool:
+        return _build_google_generator(settings.google_credentials)
+
+    accounts = [settings.google_credentials] + [
+        json.dumps(info) for info in json.loads(settings.google_credentials_pool)
+    ]
+    shards = []
+    for credentials_json in accounts:
+        generator = _build_google_generator(credentials_json)
+        shards.append(
+            AccountShard(
+                name=generator.transport.credentials.service_account_email,
+                generator=generator,
+                bucket=TokenBucket(settings.google_writes_per_minute),
+            )
+        )
+    return ShardedSlidesGenerator(
+        shards,
+        accounts=get_snapshot_store(),
+        quarantine=settings.google_quarantine_seconds,
+    )
+
+
+def _build_google_generator(credentials_json: str) -> GoogleSlidesGenerator:
+    """Generador de Google Slides para una service account."""
+    generator = GoogleSlidesGenerator(
+        credentials_json=credentials_json,
         template_id=settings.template_presentation_id,
         layout_id=settings.routine_layout_id,
+        template_cache_ttl=settings.template_cache_ttl_seconds,
+        timeout=settings.google_api_timeout_seconds,
+        snapshots=get_snapshot_store(),
+        planner=get_slides_planner(),
+        retention=get_retention_store(),
+    )
+    if settings.copy_pool_enabled:
+        generator.enable_copy_pool(
+            low_watermark=settings.copy_pool_low_watermark,
+            high_watermark=settings.copy_pool_high_watermark,
+            max_age=settings.copy_pool_max_age_seconds,
+        )
+    return generator
+
+
+@lru_cache()
+def get_snapshot_store() -> SQLiteRoutineSnapshotStore:
+    """Devuelve el almacén de versiones de rutinas por presentación."""
+    return SQLiteRoutineSnapshotStore(str(Path(settings.data_dir) / "snapshots.db"))
+
+
+@lru_cache()
+def get_retention_store() -> Optional[SQLiteRetentionStore]:
+    """Devuelve el registro de presentaciones creadas (o None sin retención)."""
+    if not settings.retention_enabled:
+        return None
+    return SQLiteRetentionStore(str(Path(settings.data_dir) / "retention.db"))
+
+
+@lru_cache()
+def get_retention_sweeper() -> Optional[RetentionSweeper]:
+    """Devuelve el sweeper que borra las presentaciones caducadas."""
+    store = get_retention_store()
+    if store is None:
+        return None
+
+    cache = get_presentation_cache()
+    snapshots = get_snapshot_store()
+    owners = get_presentation_ownership()
+
+    def forget(presentation_id: str) -> None:
+        snapshots.delete(presentation_id)
+        owners.forget(presentation_id)
+        if cache:
+            cache.discard_presentation(presentation_id)
+
+    return RetentionSweeper(
+        store=store,
+        delete_many=get_presentation_generator().delete_many,
+        max_age=settings.retention_max_age_seconds,
+        interval=settings.retention_sweep_interval_seconds,
+        batch_size=settings.retention_batch_size,
+        deletes_per_minute=settings.retention_deletes_per_minute,
+        on_deleted=forget,
+    )
+
+
+@lru_cache()
+def get_local_generator() -> Optional[PptxPresentationGenerator]:
+    """Devuelve el generador local de .pptx (o None si no se usa)."""
+    if settings.presentation_backend != "pptx" and not settings.local_fallback_enabled:
+        return None
+    return PptxPresentationGenerator(
+        output_dir=str(Path(settings.data_dir) / "pptx"),
+        template_path=settings.pptx_template_path,
+        layout_index=settings.pptx_layout_index,
+        base_url=settings.public_base_url,
+        max_rows_per_slide=settings.slides_max_rows_per_slide,
+        max_workers=settings.pptx_workers,
+        retention=get_retention_store(),
+    )
+
+
+@lru_cache()
+def get_presentation_generator() -> PresentationGeneratorInterface:
+    """
+    Devuelve el generador de presentaciones configurado.
+
+    - PRESENTATION_BACKEND=pptx: solo el generador local.
+    - LOCAL_FALLBACK_ENABLED: Google Slides con respaldo local.
+    - Por defecto: Google Slides.
+    """
+    if settings.presentation_backend == "pptx":
+        return get_local_generator()
+    if settings.local_fallback_enabled:
+        return FallbackPresentationGenerator(
+            primary=get_slides_generator(),
+            fallback=get_local_generator(),
+            fallback_after=settings.local_fallback_after_seconds,
+        )
+    return get_slides_generator()
+
+
+@lru_cache()
+def get_presentation_cache() -> Optional[SQLitePresentationCache]:
+    """Devuelve la caché de presentaciones (o None si está deshabilitada)."""
+    if not settings.presentation_cache_enabled:
+        return None
+    return SQLitePresentationCache(
+        path=str(Path(settings.data_dir) / "presentations.db"),
+        ttl=settings.presentation_cache_ttl_seconds,
     )
 
 
+@lru_cache()
+def get_presentation_ownership() -> SQLitePresentationOwnership:
+    """Devuelve el registro de propietarios de presentaciones (singleton)."""
+    return SQLitePresentationOwnership(str(Path(settings.data_dir) / "owners.db"))
+
+
+@lru_cache()
+def get_routine_viewer() -> RoutineViewer:
+    """Devuelve el visor HTML/PDF de rutinas (singleton)."""
+    return RoutineViewer(
+        store=SQLiteRoutineStore(str(Path(settings.data_dir) / "routines.db")),
+        base_url=settings.public_base_url,
+        max_entries=settings.viewer_cache_size,
+    )
+
+
+@lru_cache()
+def get_job_pool() -> JobWorkerPool:
+    """
+    Devuelve el pool de workers de la cola de trabajos (singleton).
+
+    Registra los handlers de generación y de actualización de
+    presentaciones: el payload lleva la rutina serializada (y el cliente
+    que la pide) y el resultado es el PresentationDTO.
+    """
+    weights = settings.job_tenant_weights
+    scheduler = FairScheduler.default(
+        interactive=settings.job_interactive_concurrency,
+        bulk=settings.job_bulk_concurrency,
+        weights=json.loads(weights) if weights else None,
+    )
+    pool = JobWorkerPool(
+        queue=SQLiteJobQueue(str(Path(settings.data_dir) / "jobs.db")),
+        workers=settings.job_workers,
+        max_attempts=settings.job_max_attempts,
+        backoff_base=settings.job_backoff_seconds,
+        job_ttl=settings.job_ttl_seconds,
+        scheduler=scheduler,
+    )
+
+    def generate_presentation(payload: Dict[str, Any]) -> Dict[str, Any]:
+        routine = RoutineDTO(**payload["routine"])
+        use_case = get_generate_presentation_use_case()
+        return use_case.execute(routine, payload.get("owner")).model_dump()
+
+    def update_presentation(payload: Dict[str, Any]) -> Dict[str, Any]:
+        routine = RoutineDTO(**payload["routine"])
+        use_case = get_update_presentation_use_case()
+        result = use_case.execute(
+            payload["presentation_id"], routine, payload.get("owner")
+        )
+        return result.model_dump()
+
+    pool.register(JOB_GENERATE_PRESENTATION, generate_presentation)
+    pool.register(JOB_UPDATE_PRESENTATION, update_presentation)
+    return pool
+
+
 @lru_cache()
 def get_telegram_bot() -> TelegramBot:
     """Devuelve instancia singleton del bot de Telegram."""
-    return TelegramBot(token=settings.telegram_token, webhook_url=settings.webhook_url)
+    return TelegramBot(
+        token=settings.telegram_token,
+        webhook_url=settings.webhook_url,
+        api_url=settings.telegram_api_url,
+    )
+
+
+@lru_cache()
+def get_async_telegram_bot() -> AsyncTelegramBot:
+    """
+    Devuelve el cliente asíncrono del bot (una conexión compartida).
+
+    Todos los envíos pasan por el limitador de la Bot API.
+    """
+    return AsyncTelegramBot(
+        token=settings.telegram_token,
+        webhook_url=settings.webhook_url,
+        timeout=settings.telegram_timeout_seconds,
+        max_connections=settings.telegram_max_connections,
+        limiter=TelegramRateLimiter(
+            global_per_second=settings.telegram_global_per_second,
+            chat_per_second=settings.telegram_chat_per_second,
+            group_per_minute=settings.telegram_group_per_minute,
+            max_retries=settings.telegram_max_retries,
+        ),
+        api_url=settings.telegram_api_url,
+    )
 
 
 @lru_cache()
@@ -77,12 +390,25 @@ def get_chatwoot_logger() -> ChatwootLoggerInterface:
 
 def get_parse_routine_use_case() -> ParseRoutineUseCase:
     """Devuelve caso de uso para parsear rutinas."""
-    return ParseRoutineUseCase(parser=get_gemini_parser())
+    return ParseRoutineUseCase(parser=get_routine_parser())
 
 
 def get_generate_presentation_use_case() -> GeneratePresentationUseCase:
     """Devuelve caso de uso para generar presentaciones."""
-    return GeneratePresentationUseCase(generator=get_slides_generator())
+    return GeneratePresentationUseCase(
+        generator=get_presentation_generator(),
+        cache=get_presentation_cache(),
+        owners=get_presentation_ownership(),
+    )
+
+
+def get_update_presentation_use_case() -> UpdatePresentationUseCase:
+    """Devuelve caso de uso para actualizar presentaciones."""
+    return UpdatePresentationUseCase(
+        generator=get_presentation_generator(),
+        cache=get_presentation_cache(),
+        owners=get_presentation_ownership(),
+    )
 
 
 # ─────────────────────────────────────────────────────────
@@ -90,12 +416,77 @@ def get_generate_presentation_use_case() -> GeneratePresentationUseCase:
 # ─────────────────────────────────────────────────────────
 
 
+@lru_cache()
+def get_state_store() -> ConversationStateStoreInterface:
+    """Devuelve el almacén de estado de conversación (singleton)."""
+    backend = settings.state_backend
+    if backend == "redis":
+        if not settings.redis_url:
+            raise ValueError("STATE_BACKEND=redis requiere REDIS_URL")
+        return RedisStateStore(settings.redis_url, ttl=settings.state_ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteStateStore(
+            str(Path(settings.data_dir) / "states.db"),
+            ttl=settings.state_ttl_seconds,
+        )
+    if backend != "memory":
+        raise ValueError(f"STATE_BACKEND desconocido: {backend}")
+    return MemoryStateStore(
+        ttl=settings.state_ttl_seconds, max_size=settings.state_max_size
+    )
+
+
 @lru_cache()
 def get_telegram_handler() -> TelegramHandler:
     """Devuelve handler de Telegram con todas las dependencias."""
     return TelegramHandler(
-        bot=get_telegram_bot(),
+        bot=get_async_telegram_bot(),
         parse_use_case=get_parse_routine_use_case(),
         generate_use_case=get_generate_presentation_use_case(),
         chatwoot_logger=get_chatwoot_logger(),
+        # Los enlaces al visor solo sirven en Telegram si son absolutos
+        viewer=get_routine_viewer() if settings.public_base_url else None,
+        jobs=get_job_pool(),
+        states=get_state_store(),
+    )
+
+
+@lru_cache()
+def get_update_inbox() -> SQLiteUpdateInbox:
+    """Devuelve la bandeja de updates de Telegram (singleton)."""
+    return SQLiteUpdateInbox(str(Path(settings.data_dir) / "inbox.db"))
+
+
+@lru_cache()
+def get_update_deduplicator() -> UpdateDeduplicator:
+    """Devuelve el filtro de updates repetidos (singleton)."""
+    shared = None
+    if settings.dedup_shared:
+        shared = SQLiteSeenUpdates(str(Path(settings.data_dir) / "dedup.db"))
+    return UpdateDeduplicator(capacity=settings.dedup_capacity, shared=shared)
+
+
+@lru_cache()
+def get_update_dispatcher() -> UpdateDispatcher:
+    """Devuelve el dispatcher que procesa la bandeja de updates (singleton)."""
+    return UpdateDispatcher(
+        inbox=get_update_inbox(),
+        handle=get_telegram_handler().handle_update,
+        workers=settings.inbox_workers,
+        retention=settings.inbox_retention_seconds,
+        dedup=get_update_deduplicator(),
+    )
+
+
+@lru_cache()
+def get_update_poller() -> Optional[UpdatePoller]:
+    """Devuelve el bucle de getUpdates (o None si se usa el webhook)."""
+    if settings.telegram_ingestion_mode != "polling":
+        return None
+    return UpdatePoller(
+        bot=get_async_telegram_bot(),
+        inbox=get_update_inbox(),
+        dispatcher=get_update_dispatcher(),
+        batch_size=settings.telegram_poll_batch_size,
+        timeout=settings.telegram_poll_timeout_seconds,
     )
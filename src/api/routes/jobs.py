@@ -0,0 +1,42 @@
+"""
+Endpoints de la cola de trabajos.
+
+Permite consultar el estado y el resultado de los trabajos encolados
+(ej: la generación de una presentación).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from api.dependencies import get_job_pool
+from api.schemas.routine_schemas import JobResponse, PresentationResponse
+from infrastructure.jobs import Job, JobStatus, JobWorkerPool
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, pool: JobWorkerPool = Depends(get_job_pool)):
+    """
+    Devuelve el estado de un trabajo.
+
+    Cuando termina bien, `result` contiene la presentación generada.
+    """
+    job = pool.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Trabajo no encontrado")
+    return to_job_response(job)
+
+
+def to_job_response(job: Job) -> JobResponse:
+    """Convierte un trabajo de la cola al schema de respuesta."""
+    result = None
+    if job.status == JobStatus.SUCCEEDED and job.result:
+        result = PresentationResponse(id=job.result["id"], url=job.result["url"])
+    return JobResponse(
+        id=job.id,
+        status=job.status.value,
+        attempts=job.attempts,
+        result=result,
+        error=job.error,
+        status_url=f"{router.prefix}/{job.id}",
+    )
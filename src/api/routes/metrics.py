@@ -0,0 +1,85 @@
+"""
+Endpoint de métricas internas.
+
+Expone contadores de los componentes (parsers, generador de slides...)
+en JSON para monitorización.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import APIRouter
+
+from api.dependencies import (
+    get_async_telegram_bot,
+    get_job_pool,
+    get_local_generator,
+    get_presentation_generator,
+    get_retention_sweeper,
+    get_routine_parser,
+    get_routine_viewer,
+    get_slides_generator,
+    get_state_store,
+    get_update_deduplicator,
+    get_update_dispatcher,
+    get_update_poller,
+)
+from infrastructure.config.settings import settings
+from infrastructure.powerpoint.fallback_generator import FallbackPresentationGenerator
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics")
+async def metrics():
+    """
+    Métricas de los componentes de la aplicación.
+
+    Cada componente se consulta por separado: los que no están configurados
+    (ej: Google Slides en un despliegue solo pptx) o fallan se omiten sin
+    tumbar el resto.
+    """
+    components: Dict[str, Callable[[], Optional[Dict[str, Any]]]] = {
+        "parser": lambda: get_routine_parser().stats(),
+        "slides": _slides_stats,
+        "pptx": lambda: _optional_stats(get_local_generator()),
+        "fallback": _fallback_stats,
+        "viewer": lambda: get_routine_viewer().stats(),
+        "retention": lambda: _optional_stats(get_retention_sweeper()),
+        "jobs": lambda: get_job_pool().stats(),
+        "inbox": lambda: get_update_dispatcher().stats(),
+        "dedup": lambda: get_update_deduplicator().stats(),
+        "states": lambda: get_state_store().stats(),
+        "polling": lambda: _optional_stats(get_update_poller()),
+        "telegram": lambda: get_async_telegram_bot().limiter.stats(),
+    }
+
+    result: Dict[str, Any] = {}
+    for name, stats in components.items():
+        try:
+            value = stats()
+        except Exception as e:
+            logger.warning(f"No se pudieron obtener las métricas de '{name}': {e}")
+            continue
+        if value is not None:
+            result[name] = value
+    return result
+
+
+def _optional_stats(component: Any) -> Optional[Dict[str, Any]]:
+    return component.stats() if component is not None else None
+
+
+def _slides_stats() -> Optional[Dict[str, Any]]:
+    if settings.presentation_backend == "pptx":
+        return None
+    return get_slides_generator().stats()
+
+
+def _fallback_stats() -> Optional[Dict[str, Any]]:
+    generator = get_presentation_generator()
+    if not isinstance(generator, FallbackPresentationGenerator):
+        return None
+    return generator.stats()
@@ -4,27 +4,48 @@ Endpoints REST para rutinas.
 API pública para usar fuera de Telegram.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import re
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
 
 from api.dependencies import (
-    get_generate_presentation_use_case,
+    get_job_pool,
+    get_local_generator,
+    get_routine_viewer,
     get_parse_routine_use_case,
 )
 from api.schemas.routine_schemas import (
     DaySchema,
     ExerciseSchema,
     GenerateSlidesRequest,
+    JobResponse,
     ParseRoutineRequest,
-    PresentationResponse,
     RoutineResponse,
+    ViewerResponse,
 )
+from api.routes.jobs import to_job_response
 from application.dtos.routine_dto import DayDTO, ExerciseDTO, RoutineDTO
-from application.use_cases.generate_presentation import GeneratePresentationUseCase
 from application.use_cases.parse_routine import ParseRoutineUseCase
 from domain.exceptions import DomainException
+from infrastructure.jobs import (
+    JOB_GENERATE_PRESENTATION,
+    JOB_UPDATE_PRESENTATION,
+    LANE_BULK,
+    JobWorkerPool,
+)
+from infrastructure.powerpoint.pptx_generator import (
+    PPTX_MEDIA_TYPE,
+    PptxPresentationGenerator,
+)
+from infrastructure.viewer.routine_viewer import CACHE_CONTROL, RoutineViewer
 
 router = APIRouter(prefix="/api/v1/routines", tags=["routines"])
 
+_ROUTINE_KEY = re.compile(r"^[0-9a-f]{64}$")
+
 
 @router.post("/parse", response_model=RoutineResponse)
 async def parse_routine(
@@ -60,37 +81,179 @@ async def parse_routine(
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
 
-@router.post("/generate-slides", response_model=PresentationResponse)
+@router.post("/generate-slides", response_model=JobResponse, status_code=202)
 async def generate_slides(
     request: GenerateSlidesRequest,
-    use_case: GeneratePresentationUseCase = Depends(get_generate_presentation_use_case),
+    http_request: Request,
+    response: Response,
+    x_client_id: Optional[str] = Header(default=None),
+    pool: JobWorkerPool = Depends(get_job_pool),
 ):
     """
-    Genera una presentación de Google Slides.
+    Encola la generación de una presentación de Google Slides.
 
-    Recibe una rutina estructurada y crea la presentación.
+    Responde al momento con el ID del trabajo; el estado y la URL final se
+    consultan en `status_url` (también en la cabecera Location).
+
+    Va siempre a la clase masiva, repartida de forma justa entre clientes
+    (cabecera `X-Client-Id`, o la IP si no se envía). La clase interactiva
+    queda reservada a Telegram: la decide el servidor, no el cliente.
     """
-    try:
-        # Convertir schema a DTO
-        routine_dto = RoutineDTO(
-            days=[
-                DayDTO(
-                    day_number=day.day_number,
-                    exercises=[
-                        ExerciseDTO(name=ex.name, sets=ex.sets, reps=ex.reps)
-                        for ex in day.exercises
-                    ],
-                    total_exercises=day.total_exercises,
-                )
-                for day in request.days
-            ]
+    routine = _to_routine_dto(request)
+    if not routine.days:
+        raise HTTPException(
+            status_code=400, detail="La rutina no tiene días para generar"
         )
 
-        result = use_case.execute(routine_dto)
+    client = _client_id(http_request, x_client_id)
+    payload = {"routine": routine.model_dump(), "owner": client}
+    return await _submit(
+        pool, JOB_GENERATE_PRESENTATION, payload, LANE_BULK, client, response
+    )
 
-        return PresentationResponse(id=result.id, url=result.url)
 
-    except DomainException as e:
-        raise HTTPException(status_code=400, detail=str(e))
+@router.put(
+    "/presentations/{presentation_id}", response_model=JobResponse, status_code=202
+)
+async def update_slides(
+    presentation_id: str,
+    request: GenerateSlidesRequest,
+    http_request: Request,
+    response: Response,
+    x_client_id: Optional[str] = Header(default=None),
+    pool: JobWorkerPool = Depends(get_job_pool),
+):
+    """
+    Encola la actualización de una presentación con una rutina revisada.
+
+    Solo se modifica en sitio (reescribiendo las slides, filas o celdas
+    que cambiaron) si la generó este mismo cliente y no se ha compartido
+    con nadie desde la caché; si no, el trabajo genera una presentación
+    nueva y la original no se toca. El resultado indica el ID final.
+    """
+    routine = _to_routine_dto(request)
+    if not routine.days:
+        raise HTTPException(
+            status_code=400, detail="La rutina no tiene días para generar"
+        )
+
+    client = _client_id(http_request, x_client_id)
+    payload = {
+        "presentation_id": presentation_id,
+        "routine": routine.model_dump(),
+        "owner": client,
+    }
+    return await _submit(
+        pool, JOB_UPDATE_PRESENTATION, payload, LANE_BULK, client, response
+    )
+
+
+@router.get("/presentations/{presentation_id}/download")
+async def download_presentation(
+    presentation_id: str,
+    generator: Optional[PptxPresentationGenerator] = Depends(get_local_generator),
+):
+    """
+    Descarga una presentación generada en local (.pptx).
+    """
+    path = generator.local_path(presentation_id) if generator else None
+    if not path:
+        raise HTTPException(status_code=404, detail="Presentación no encontrada")
+
+    return FileResponse(path, media_type=PPTX_MEDIA_TYPE, filename="rutina.pptx")
+
+
+@router.post("/view", response_model=ViewerResponse)
+async def publish_routine(
+    request: GenerateSlidesRequest,
+    viewer: RoutineViewer = Depends(get_routine_viewer),
+):
+    """
+    Publica una rutina en el visor web.
+
+    Devuelve enlaces instantáneos (HTML y PDF) sin esperar a Google Slides.
+    """
+    routine = _to_routine_dto(request)
+    if not routine.days:
+        raise HTTPException(status_code=400, detail="La rutina no tiene días")
+
+    key = routine.content_hash()
+    html_url = viewer.publish(key, routine.to_entities())
+    return ViewerResponse(id=key, html_url=html_url, pdf_url=viewer.url(key, "pdf"))
+
+
+@router.get("/view/{routine_id}")
+async def view_routine(
+    routine_id: str,
+    format: str = "html",
+    if_none_match: Optional[str] = Header(default=None),
+    viewer: RoutineViewer = Depends(get_routine_viewer),
+):
+    """
+    Muestra una rutina publicada en HTML o PDF (?format=pdf).
+
+    El contenido de un ID nunca cambia, así que la respuesta es cacheable
+    indefinidamente y las revisitas con ETag responden 304 sin renderizar.
+    """
+    if not _ROUTINE_KEY.match(routine_id):
+        raise HTTPException(status_code=404, detail="Rutina no encontrada")
+    if not viewer.supports(format):
+        raise HTTPException(status_code=501, detail=f"Formato no disponible: {format}")
+
+    headers = {"ETag": viewer.etag(routine_id, format), "Cache-Control": CACHE_CONTROL}
+    if if_none_match == headers["ETag"]:
+        # El ETag se deriva del ID: comprobar que sigue publicada antes del 304
+        if not await run_in_threadpool(viewer.published, routine_id, format):
+            raise HTTPException(status_code=404, detail="Rutina no encontrada")
+        return Response(status_code=304, headers=headers)
+
+    # El PDF puede tardar: se renderiza fuera del event loop
+    document = await run_in_threadpool(viewer.render, routine_id, format)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Rutina no encontrada")
+
+    return Response(document.content, media_type=document.media_type, headers=headers)
+
+
+async def _submit(
+    pool: JobWorkerPool,
+    kind: str,
+    payload: Dict[str, Any],
+    lane: str,
+    client: str,
+    response: Response,
+) -> JobResponse:
+    """Encola un trabajo y responde con su estado (y la cabecera Location)."""
+    try:
+        job = await run_in_threadpool(
+            pool.submit, kind, payload, lane=lane, tenant=client
+        )
     except Exception:
         raise HTTPException(status_code=500, detail="Error interno del servidor")
+
+    result = to_job_response(job)
+    response.headers["Location"] = result.status_url
+    return result
+
+
+def _client_id(request: Request, x_client_id: Optional[str]) -> str:
+    """Cliente de la API: cabecera X-Client-Id, o la IP si no se envía."""
+    host = request.client.host if request.client else "unknown"
+    return f"api:{x_client_id or host}"
+
+
+def _to_routine_dto(request: GenerateSlidesRequest) -> RoutineDTO:
+    """Convierte el schema de la petición a DTO."""
+    return RoutineDTO(
+        days=[
+            DayDTO(
+                day_number=day.day_number,
+                exercises=[
+                    ExerciseDTO(name=ex.name, sets=ex.sets, reps=ex.reps)
+                    for ex in day.exercises
+                ],
+                total_exercises=day.total_exercises,
+            )
+            for day in request.days
+        ]
+    )
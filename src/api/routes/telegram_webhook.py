@@ -5,10 +5,11 @@ Webhook de Telegram.
 import logging
 
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
 
-from api.dependencies import get_telegram_bot, get_telegram_handler
+from api.dependencies import get_telegram_bot, get_update_dispatcher
 from infrastructure.telegram.bot import TelegramBot
-from infrastructure.telegram.handlers import TelegramHandler
+from infrastructure.telegram.update_dispatcher import UpdateDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -17,20 +18,28 @@ router = APIRouter(prefix="/api/v1/telegram", tags=["telegram"])
 
 @router.post("/webhook")
 async def telegram_webhook(
-    request: Request, handler: TelegramHandler = Depends(get_telegram_handler)
+    request: Request, dispatcher: UpdateDispatcher = Depends(get_update_dispatcher)
 ):
     """
     Webhook para recibir updates de Telegram.
 
-    Procesa mensajes, comandos y callbacks del bot.
+    Guarda el update en la bandeja y responde al momento; los mensajes,
+    comandos y callbacks se procesan en segundo plano. Si no se puede
+    guardar responde 500 para que Telegram lo reenvíe.
     """
     try:
         data = await request.json()
-        result = handler.handle_update(data)
-        return result
+    except Exception:
+        return {"status": "ignored"}
+    if not isinstance(data, dict):
+        return {"status": "ignored"}
+
+    try:
+        seq = await dispatcher.submit(data)
     except Exception as e:
         logger.error(f"Webhook error: {e}", exc_info=True)
-        return {"status": "error"}
+        return JSONResponse(status_code=500, content={"status": "error"})
+    return {"status": "ok" if seq is not None else "duplicate"}
 
 
 @router.get("/set-webhook")
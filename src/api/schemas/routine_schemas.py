@@ -4,7 +4,7 @@ Schemas para la API de rutinas.
 Define los modelos de request/response para los endpoints.
 """
 
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -91,6 +91,39 @@ class PresentationResponse(BaseModel):
         }
 
 
+class ViewerResponse(BaseModel):
+    """Response con los enlaces del visor de la rutina."""
+
+    id: str = Field(..., description="Hash de contenido de la rutina")
+    html_url: str = Field(..., description="URL del visor HTML")
+    pdf_url: str = Field(..., description="URL de la versión PDF")
+
+
+class JobResponse(BaseModel):
+    """Response con el estado de un trabajo en segundo plano."""
+
+    id: str = Field(..., description="ID del trabajo")
+    status: str = Field(..., description="Estado: queued, running, succeeded o failed")
+    attempts: int = Field(0, description="Intentos realizados")
+    result: Optional[PresentationResponse] = Field(
+        None, description="Presentación generada (cuando termina bien)"
+    )
+    error: Optional[str] = Field(None, description="Último error")
+    status_url: str = Field(..., description="URL para consultar el estado")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": "3f2a9c0d4e5b4a1c9f8e7d6c5b4a3f2e",
+                "status": "queued",
+                "attempts": 0,
+                "result": None,
+                "error": None,
+                "status_url": "/api/v1/jobs/3f2a9c0d4e5b4a1c9f8e7d6c5b4a3f2e",
+            }
+        }
+
+
 class HealthResponse(BaseModel):
     """Response del health check."""
 
@@ -4,7 +4,9 @@ DTOs para rutinas.
 Data Transfer Objects que se usan para transferir datos entre capas.
 """
 
-from typing import List
+import hashlib
+import json
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -65,9 +67,32 @@ class RoutineDTO(BaseModel):
     def total_exercises(self) -> int:
         return sum(day.total_exercises for day in self.days)
 
+    def content_hash(self) -> str:
+        """
+        Hash canónico del contenido (días, nombres, series y repeticiones).
+
+        Dos rutinas con el mismo contenido producen el mismo hash aunque
+        difieran en espacios sobrantes o en campos derivados.
+        """
+        canonical = [
+            [
+                day.day_number,
+                [
+                    [ex.name.strip(), ex.sets.strip(), [r.strip() for r in ex.reps]]
+                    for ex in day.exercises
+                ],
+            ]
+            for day in self.days
+        ]
+        payload = json.dumps(canonical, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 class PresentationDTO(BaseModel):
     """DTO para una presentación generada."""
 
     id: str = Field(..., description="ID de la presentación")
     url: str = Field(..., description="URL de la presentación")
+    file_path: Optional[str] = Field(
+        None, description="Fichero local (solo presentaciones generadas en local)"
+    )
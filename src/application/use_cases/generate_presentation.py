@@ -5,10 +5,13 @@ Crea una presentación de Google Slides a partir de una rutina.
 """
 
 import logging
+from typing import Optional
 
 from application.dtos.routine_dto import PresentationDTO, RoutineDTO
 from domain.exceptions import PresentationError
+from domain.interfaces.presentation_cache import PresentationCacheInterface
 from domain.interfaces.presentation_generator import PresentationGeneratorInterface
+from domain.interfaces.presentation_ownership import PresentationOwnershipInterface
 
 logger = logging.getLogger(__name__)
 
@@ -18,18 +21,31 @@ class GeneratePresentationUseCase:
     Caso de uso para generar presentaciones.
 
     Recibe una implementación de PresentationGeneratorInterface
-    y la usa para crear slides.
+    y la usa para crear slides. Si recibe una caché, las rutinas con el
+    mismo contenido reutilizan la presentación ya generada. Si recibe un
+    registro de propietarios, anota quién generó cada presentación y a
+    quién se entregó desde caché.
     """
 
-    def __init__(self, generator: PresentationGeneratorInterface):
+    def __init__(
+        self,
+        generator: PresentationGeneratorInterface,
+        cache: Optional[PresentationCacheInterface] = None,
+        owners: Optional[PresentationOwnershipInterface] = None,
+    ):
         self.generator = generator
+        self.cache = cache
+        self.owners = owners
 
-    def execute(self, routine: RoutineDTO) -> PresentationDTO:
+    def execute(
+        self, routine: RoutineDTO, owner: Optional[str] = None
+    ) -> PresentationDTO:
         """
         Genera una presentación a partir de la rutina.
 
         Args:
             routine: RoutineDTO con los datos de la rutina
+            owner: Cliente que la pide (ej: "chat:123"); None si es anónimo
 
         Returns:
             PresentationDTO con el ID y URL de la presentación
@@ -40,23 +56,61 @@ class GeneratePresentationUseCase:
         if not routine.days:
             raise PresentationError("La rutina no tiene días para generar")
 
+        key = routine.content_hash()
+        cached = self._from_cache(key)
+        if cached:
+            if self.owners:
+                # Entregada a otro cliente: su propietario ya no puede
+                # modificarla en sitio
+                self.owners.share(cached.id, owner or "")
+            return cached
+
         logger.info(f"Generando presentación para {len(routine.days)} días")
 
         try:
             # Convertir DTO a entidades
             entities = routine.to_entities()
 
-            # Generar presentación
-            presentation_id = self.generator.create(entities)
-
-            # Configurar permisos
-            self.generator.set_permissions(presentation_id)
+            # Generar presentación y configurar permisos
+            presentation_id = self.generator.create_and_share(entities)
 
-            url = f"https://docs.google.com/presentation/d/{presentation_id}"
+            url = self.generator.get_url(presentation_id)
             logger.info(f"Presentación creada: {url}")
 
-            return PresentationDTO(id=presentation_id, url=url)
-
         except Exception as e:
             logger.error(f"Error generando presentación: {e}")
             raise PresentationError(f"Error al crear la presentación: {str(e)}")
+
+        if self.owners and owner:
+            self.owners.record(presentation_id, owner)
+        if self.cache:
+            self.cache.put(key, presentation_id, url)
+
+        return self._result(presentation_id, url)
+
+    def _from_cache(self, key: str) -> Optional[PresentationDTO]:
+        """Devuelve la presentación en caché si sigue existiendo."""
+        if not self.cache:
+            return None
+
+        cached = self.cache.get(key)
+        if not cached:
+            return None
+
+        presentation_id, url = cached
+        try:
+            if self.generator.exists(presentation_id):
+                logger.info(f"Presentación reutilizada desde caché: {url}")
+                return self._result(presentation_id, url)
+        except Exception as e:
+            logger.warning(f"No se pudo verificar la presentación en caché: {e}")
+
+        self.cache.discard(key)
+        return None
+
+    def _result(self, presentation_id: str, url: str) -> PresentationDTO:
+        return PresentationDTO(
+            id=presentation_id,
+            url=url,
+            file_path=self.generator.local_path(presentation_id),
+        )
@@ -0,0 +1,96 @@
+"""
+Caso de Uso: Actualizar Presentación
+
+Aplica una versión revisada de la rutina a una presentación existente.
+"""
+
+import logging
+from typing import Optional
+
+from application.dtos.routine_dto import PresentationDTO, RoutineDTO
+from application.use_cases.generate_presentation import GeneratePresentationUseCase
+from domain.exceptions import PresentationError
+from domain.interfaces.presentation_cache import PresentationCacheInterface
+from domain.interfaces.presentation_generator import PresentationGeneratorInterface
+from domain.interfaces.presentation_ownership import PresentationOwnershipInterface
+
+logger = logging.getLogger(__name__)
+
+
+class UpdatePresentationUseCase:
+    """
+    Caso de uso para actualizar presentaciones.
+
+    Solo se modifica en sitio una presentación que generó el propio
+    cliente y que la caché no ha entregado a nadie más; en otro caso se
+    genera una presentación nueva y la original queda intacta.
+
+    El generador decide cómo aplicar la revisión (parche incremental o
+    presentación nueva). Si hay caché, se olvidan las entradas que
+    apuntaban a la versión anterior y se registra la nueva.
+    """
+
+    def __init__(
+        self,
+        generator: PresentationGeneratorInterface,
+        cache: Optional[PresentationCacheInterface] = None,
+        owners: Optional[PresentationOwnershipInterface] = None,
+    ):
+        self.generator = generator
+        self.cache = cache
+        self.owners = owners
+
+    def execute(
+        self, presentation_id: str, routine: RoutineDTO, owner: Optional[str] = None
+    ) -> PresentationDTO:
+        """
+        Actualiza la presentación con la rutina revisada.
+
+        Args:
+            presentation_id: ID de la presentación a actualizar
+            routine: RoutineDTO con la versión revisada
+            owner: Cliente que pide el cambio (ej: "api:cliente")
+
+        Returns:
+            PresentationDTO con el ID y URL resultantes (otro ID si no se
+            pudo modificar en sitio)
+
+        Raises:
+            PresentationError: Si falla la actualización
+        """
+        if not routine.days:
+            raise PresentationError("La rutina no tiene días para generar")
+
+        if not self._can_modify(presentation_id, owner):
+            logger.info(
+                f"Presentación {presentation_id} ajena o compartida: "
+                "se genera una nueva"
+            )
+            return GeneratePresentationUseCase(
+                self.generator, self.cache, self.owners
+            ).execute(routine, owner)
+
+        logger.info(f"Actualizando presentación {presentation_id}")
+
+        try:
+            result_id = self.generator.update(presentation_id, routine.to_entities())
+            url = self.generator.get_url(result_id)
+        except Exception as e:
+            logger.error(f"Error actualizando presentación: {e}")
+            raise PresentationError(f"Error al actualizar la presentación: {str(e)}")
+
+        if result_id != presentation_id and self.owners:
+            self.owners.record(result_id, owner)
+        if self.cache:
+            self.cache.discard_presentation(presentation_id)
+            self.cache.put(routine.content_hash(), result_id, url)
+
+        return PresentationDTO(
+            id=result_id, url=url, file_path=self.generator.local_path(result_id)
+        )
+
+    def _can_modify(self, presentation_id: str, owner: Optional[str]) -> bool:
+        """Sin registro de propietarios no se puede comprobar: nunca en sitio."""
+        if self.owners is None or owner is None:
+            return False
+        return self.owners.can_modify(presentation_id, owner)
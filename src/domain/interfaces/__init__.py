@@ -1,7 +1,14 @@
 # src/domain/interfaces/__init__.py
 """Interfaces (contratos) del dominio."""
 
+from .presentation_cache import PresentationCacheInterface
 from .presentation_generator import PresentationGeneratorInterface
+from .presentation_ownership import PresentationOwnershipInterface
 from .routine_parser import RoutineParserInterface
 
-__all__ = ["RoutineParserInterface", "PresentationGeneratorInterface"]
+__all__ = [
+    "RoutineParserInterface",
+    "PresentationGeneratorInterface",
+    "PresentationCacheInterface",
+    "PresentationOwnershipInterface",
+]
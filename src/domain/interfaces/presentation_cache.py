@@ -0,0 +1,63 @@
+"""
+Interface: PresentationCacheInterface
+
+Define el contrato para recordar presentaciones ya generadas a partir de
+una clave de contenido, de modo que una rutina idéntica reutilice la
+presentación existente en lugar de crear otra.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+
+class PresentationCacheInterface(ABC):
+    """
+    Interface abstracta para la caché de presentaciones.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """
+        Busca una presentación por clave.
+
+        Args:
+            key: Hash canónico del contenido de la rutina
+
+        Returns:
+            (ID, URL) de la presentación, o None si no hay entrada vigente
+        """
+        pass
+
+    @abstractmethod
+    def put(self, key: str, presentation_id: str, url: str) -> None:
+        """
+        Guarda la presentación generada para una clave.
+
+        Args:
+            key: Hash canónico del contenido de la rutina
+            presentation_id: ID de la presentación
+            url: URL de la presentación
+        """
+        pass
+
+    @abstractmethod
+    def discard(self, key: str) -> None:
+        """
+        Elimina la entrada de una clave (ej: si la presentación ya no existe).
+
+        Args:
+            key: Hash canónico del contenido de la rutina
+        """
+        pass
+
+    @abstractmethod
+    def discard_presentation(self, presentation_id: str) -> None:
+        """
+        Elimina todas las entradas que apuntan a una presentación.
+
+        Se usa cuando la presentación cambia de contenido o se borra.
+
+        Args:
+            presentation_id: ID de la presentación
+        """
+        pass
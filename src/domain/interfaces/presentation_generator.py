@@ -6,7 +6,7 @@ Permite cambiar de Google Slides a PowerPoint u otro sin modificar la lógica.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 from domain.entities.routine import Routine
 
@@ -41,3 +41,74 @@ class PresentationGeneratorInterface(ABC):
             presentation_id: ID de la presentación
         """
         pass
+
+    def exists(self, presentation_id: str) -> bool:
+        """
+        Indica si la presentación sigue existiendo y se puede reutilizar.
+
+        Por defecto devuelve False (no se puede verificar, no se reutiliza).
+
+        Args:
+            presentation_id: ID de la presentación
+        """
+        return False
+
+    def get_url(self, presentation_id: str) -> str:
+        """
+        Devuelve la URL con la que el usuario abre la presentación.
+
+        Por defecto devuelve el propio ID (para generadores que ya devuelven
+        una URL en `create`).
+
+        Args:
+            presentation_id: ID de la presentación
+        """
+        return presentation_id
+
+    def local_path(self, presentation_id: str) -> Optional[str]:
+        """
+        Ruta del fichero de la presentación si se generó en local.
+
+        Por defecto devuelve None (la presentación vive en un servicio remoto).
+
+        Args:
+            presentation_id: ID de la presentación
+        """
+        return None
+
+    def update(self, presentation_id: str, routines: List[Routine]) -> str:
+        """
+        Actualiza una presentación ya generada con una versión revisada.
+
+        Por defecto no hay actualización incremental: se genera una
+        presentación nueva y se devuelve su ID.
+
+        Args:
+            presentation_id: ID de la presentación a actualizar
+            routines: Rutinas revisadas
+
+        Returns:
+            ID de la presentación resultante (la misma si se actualizó en sitio)
+        """
+        return self.create_and_share(routines)
+
+    def create_and_share(self, routines: List[Routine]) -> str:
+        """
+        Crea la presentación y configura sus permisos.
+
+        Por defecto ejecuta `create` y después `set_permissions`. Las
+        implementaciones pueden solaparlos (los permisos solo necesitan el
+        ID del fichero) siempre que devuelvan cuando ambos hayan terminado.
+
+        Args:
+            routines: Lista de rutinas a incluir en la presentación
+
+        Returns:
+            ID de la presentación generada
+
+        Raises:
+            PresentationError: Si falla la creación o los permisos
+        """
+        presentation_id = self.create(routines)
+        self.set_permissions(presentation_id)
+        return presentation_id
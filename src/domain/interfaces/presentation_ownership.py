@@ -0,0 +1,62 @@
+"""
+Interface: PresentationOwnershipInterface
+
+Define el contrato para recordar quién generó cada presentación y si la
+caché de contenido ya se la ha entregado a otros. Una presentación solo
+se modifica en sitio si es exclusiva de quien la pide.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class PresentationOwnershipInterface(ABC):
+    """
+    Interface abstracta para el registro de propietarios de presentaciones.
+    """
+
+    @abstractmethod
+    def record(self, presentation_id: str, owner: str) -> None:
+        """
+        Registra al cliente que generó una presentación nueva.
+
+        Args:
+            presentation_id: ID de la presentación
+            owner: Identificador del cliente (ej: "chat:123", "api:cliente")
+        """
+        pass
+
+    @abstractmethod
+    def share(self, presentation_id: str, owner: str) -> None:
+        """
+        Registra que la presentación se entregó (desde caché) a un cliente.
+
+        Si no es su propietario, la presentación pasa a estar compartida.
+
+        Args:
+            presentation_id: ID de la presentación
+            owner: Cliente al que se entregó
+        """
+        pass
+
+    @abstractmethod
+    def can_modify(self, presentation_id: str, owner: str) -> bool:
+        """
+        Indica si `owner` puede modificar la presentación en sitio.
+
+        Solo si la generó él y nadie más la ha recibido.
+
+        Args:
+            presentation_id: ID de la presentación
+            owner: Cliente que pide el cambio
+        """
+        pass
+
+    @abstractmethod
+    def forget(self, presentation_id: str) -> None:
+        """
+        Olvida una presentación (ej: tras borrarla).
+
+        Args:
+            presentation_id: ID de la presentación
+        """
+        pass
@@ -0,0 +1,261 @@
+"""
+Parser compuesto con failover entre varios proveedores.
+
+Implementa RoutineParserInterface del dominio delegando en una lista
+ordenada de parsers (Gemini, otro LLM, parser local por reglas...).
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from domain.entities.routine import Routine
+from domain.exceptions import ParsingError
+from domain.interfaces.routine_parser import RoutineParserInterface
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ParserBackend:
+    """
+    Un proveedor de parsing con su estado de salud.
+
+    Attributes:
+        name: Nombre para logs y métricas (ej: "gemini")
+        parser: Implementación de RoutineParserInterface
+        timeout: Tiempo máximo por intento en segundos (None = sin límite propio)
+        inline: Ejecutar en el hilo que llama, sin timeout (parsers locales
+            y rápidos, que así no dependen de ningún pool)
+        max_concurrency: Hilos propios del backend; con todos ocupados por
+            llamadas colgadas el backend se salta en vez de encolar
+    """
+
+    name: str
+    parser: RoutineParserInterface
+    timeout: Optional[float] = None
+    inline: bool = False
+    max_concurrency: int = 4
+
+    success_rate: float = 1.0
+    latency: float = 0.0
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+    calls: int = 0
+    failures: int = 0
+    in_flight: int = 0
+    last_call: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class FailoverParser(RoutineParserInterface):
+    """
+    Parser que enruta entre varios backends según su salud y latencia.
+
+    Cada backend tiene una puntuación: su tasa de éxito, reducida cuando su
+    latencia media pasa de la mitad de lo que queda del deadline, menos
+    `preference_margin` por cada puesto en la lista de preferencia. Así un
+    backend menos preferido solo adelanta a otro si este está claramente
+    peor. La tasa de éxito de un backend sin llamadas vuelve poco a poco a
+    1 en `cooldown` segundos, para que uno relegado se vuelva a probar.
+
+    Se saltan los backends con el circuito abierto (demasiados fallos
+    seguidos) y los que tienen todos sus hilos ocupados. Si un intento
+    falla o se pasa de tiempo, se prueba el siguiente sin salir del
+    deadline de la petición.
+
+    Cada backend remoto tiene su propio pool de hilos: una llamada que se
+    pasa de tiempo no se puede interrumpir y sigue ocupando su hilo, pero
+    no quita hilos a los demás. Los backends `inline` no usan pool.
+    """
+
+    def __init__(
+        self,
+        backends: List[ParserBackend],
+        deadline: float = 25.0,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        smoothing: float = 0.3,
+        preference_margin: float = 0.35,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Inicializa el parser compuesto.
+
+        Args:
+            backends: Backends en orden de preferencia
+            deadline: Tiempo total máximo por petición en segundos
+            failure_threshold: Fallos seguidos para abrir el circuito
+            cooldown: Segundos que un circuito abierto queda fuera de rotación
+            smoothing: Peso de la última observación en las medias móviles
+            preference_margin: Puntuación que cuesta cada puesto de preferencia
+            clock: Reloj monotónico (inyectable para tests)
+        """
+        if not backends:
+            raise ValueError("FailoverParser necesita al menos un backend")
+
+        self.backends = backends
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self.preference_margin = preference_margin
+        self._clock = clock
+        self._executors = {
+            b.name: ThreadPoolExecutor(
+                max_workers=b.max_concurrency, thread_name_prefix=f"parser-{b.name}"
+            )
+            for b in backends
+            if not b.inline
+        }
+
+        names = ", ".join(b.name for b in backends)
+        logger.info(f"FailoverParser inicializado con backends: {names}")
+
+    def parse(self, text: str) -> List[Routine]:
+        """
+        Parsea texto probando los backends en orden hasta que uno responda.
+
+        Args:
+            text: Texto crudo con la rutina
+
+        Returns:
+            Lista de Routine del primer backend que responde a tiempo
+
+        Raises:
+            ParsingError: Si todos los backends fallan o se agota el deadline
+        """
+        started = self._clock()
+        errors: List[str] = []
+
+        for backend in self._route(started):
+            remaining = self.deadline - (self._clock() - started)
+            if remaining <= 0:
+                break
+
+            timeout = remaining
+            if backend.timeout is not None:
+                timeout = min(timeout, backend.timeout)
+
+            try:
+                result = self._attempt(backend, text, timeout)
+            except Exception as e:
+                errors.append(f"{backend.name}: {e}")
+                logger.warning(f"Parser '{backend.name}' falló: {e}")
+                continue
+
+            if errors:
+                logger.info(f"Failover: rutina parseada con '{backend.name}'")
+            return result
+
+        detail = "; ".join(errors) or "deadline agotado"
+        raise ParsingError(f"Ningún parser pudo procesar la rutina ({detail})")
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Devuelve el estado de salud de cada backend."""
+        now = self._clock()
+        return {
+            b.name: {
+                "success_rate": round(b.success_rate, 3),
+                "latency": round(b.latency, 3),
+                "calls": b.calls,
+                "failures": b.failures,
+                "in_flight": b.in_flight,
+                "circuit_open": b.open_until > now,
+            }
+            for b in self.backends
+        }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _route(self, started: float) -> List[ParserBackend]:
+        """Ordena los backends disponibles por puntuación."""
+        now = self._clock()
+        remaining = max(self.deadline - (now - started), 1e-3)
+        scored = []
+
+        for position, backend in enumerate(self.backends):
+            if backend.open_until > now:
+                continue
+            if not backend.inline and backend.in_flight >= backend.max_concurrency:
+                continue
+            # La latencia penaliza a partir de la mitad del tiempo restante
+            fit = min(1.0, max(0.0, 2 * (1 - backend.latency / remaining)))
+            idle = min(1.0, (now - backend.last_call) / self.cooldown)
+            rate = backend.success_rate + (1 - backend.success_rate) * idle
+            score = rate * fit - position * self.preference_margin
+            scored.append((-score, position, backend))
+
+        # Si todo está caído, se prueba igualmente en orden de preferencia
+        scored.sort(key=lambda item: item[:2])
+        return [backend for _, _, backend in scored] or list(self.backends)
+
+    def _attempt(
+        self, backend: ParserBackend, text: str, timeout: float
+    ) -> List[Routine]:
+        """Ejecuta un intento con timeout y actualiza la salud del backend."""
+        started = self._clock()
+        try:
+            if backend.inline:
+                result = backend.parser.parse(text)
+            else:
+                result = self._submit(backend, text).result(timeout=timeout)
+            if not result:
+                raise ParsingError("respuesta vacía")
+        except FutureTimeoutError:
+            self._record(backend, self._clock() - started, ok=False)
+            raise ParsingError(f"timeout tras {timeout:.1f}s")
+        except Exception:
+            self._record(backend, self._clock() - started, ok=False)
+            raise
+
+        self._record(backend, self._clock() - started, ok=True)
+        return result
+
+    def _submit(self, backend: ParserBackend, text: str) -> Future:
+        """Lanza la llamada en el pool del backend y cuenta los hilos ocupados."""
+        with backend._lock:
+            backend.in_flight += 1
+        future = self._executors[backend.name].submit(backend.parser.parse, text)
+
+        def release(_: Future) -> None:
+            # Tras un timeout la llamada sigue en curso: el hilo se libera aquí
+            with backend._lock:
+                backend.in_flight -= 1
+
+        future.add_done_callback(release)
+        return future
+
+    def _record(self, backend: ParserBackend, elapsed: float, ok: bool) -> None:
+        """Actualiza medias móviles y el circuit breaker del backend."""
+        alpha = self.smoothing
+        with backend._lock:
+            backend.calls += 1
+            backend.last_call = self._clock()
+            backend.success_rate = (1 - alpha) * backend.success_rate + alpha * (
+                1.0 if ok else 0.0
+            )
+            backend.latency = (
+                elapsed
+                if backend.calls == 1
+                else (1 - alpha) * backend.latency + alpha * elapsed
+            )
+
+            if ok:
+                backend.consecutive_failures = 0
+                backend.open_until = 0.0
+                return
+
+            backend.failures += 1
+            backend.consecutive_failures += 1
+            if backend.consecutive_failures >= self.failure_threshold:
+                backend.open_until = self._clock() + self.cooldown
+                logger.warning(
+                    f"Circuito abierto para '{backend.name}' durante {self.cooldown}s"
+                )
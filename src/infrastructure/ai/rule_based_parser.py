@@ -0,0 +1,105 @@
+"""
+Parser de rutinas basado en reglas (sin IA).
+
+Implementa RoutineParserInterface del dominio con expresiones regulares.
+Es menos preciso que Gemini pero no depende de ningún servicio externo,
+por lo que sirve como último recurso cuando los proveedores de IA fallan.
+"""
+
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from domain.entities.routine import Exercise, Routine
+from domain.exceptions import ParsingError
+from domain.interfaces.routine_parser import RoutineParserInterface
+
+logger = logging.getLogger(__name__)
+
+# "4x10", "4 x 10"
+_SETS_X_REPS = re.compile(r"\b(\d+)\s*[xX×]\s*(\d+)\b")
+# "4 series", "4series", "3 sets"
+_SETS = re.compile(r"\b(\d+)\s*(?:series|serie|sets|set)\b", re.IGNORECASE)
+# "10 reps", "5,6,7,8 reps", "de 10 repeticiones"
+_REPS = re.compile(
+    r"(?:\bde\s+)?(\d+(?:\s*[,/-]\s*\d+)*)\s*(?:reps|rep|repeticiones)\b",
+    re.IGNORECASE,
+)
+# Conectores que quedan colgando al quitar series/reps
+_TRAILING = re.compile(r"[\s,;:\-]*(?:\bde\b|\by\b)?[\s,;:\-]*$", re.IGNORECASE)
+
+
+class RuleBasedParser(RoutineParserInterface):
+    """
+    Parser local basado en reglas.
+
+    Cada bloque separado por líneas en blanco es un día y cada línea no vacía
+    es un ejercicio. Extrae series y repeticiones con patrones comunes
+    ("4 series", "4x10", "10 reps", "5,6,7,8 reps").
+    """
+
+    def parse(self, text: str) -> List[Routine]:
+        """
+        Parsea texto de rutina y devuelve lista de Routine.
+
+        Args:
+            text: Texto crudo con la rutina
+
+        Returns:
+            Lista de Routine, una por cada bloque/día
+
+        Raises:
+            ParsingError: Si no se detecta ningún ejercicio
+        """
+        blocks = [b.strip() for b in re.split(r"\n{2,}", text.strip()) if b.strip()]
+        result = []
+
+        for block in blocks:
+            exercises = [
+                exercise
+                for exercise in (self._parse_line(line) for line in block.splitlines())
+                if exercise is not None
+            ]
+            if exercises:
+                result.append(Routine(day_number=len(result) + 1, exercises=exercises))
+
+        if not result:
+            raise ParsingError("No se detectaron ejercicios en la rutina")
+
+        return result
+
+    def _parse_line(self, line: str) -> Optional[Exercise]:
+        """Convierte una línea en un ejercicio (o None si está vacía)."""
+        line = line.strip().lstrip("-•*·").strip()
+        if not line:
+            return None
+
+        sets, reps, name = self._extract(line)
+        if not name:
+            return None
+
+        return Exercise(name=name, sets=sets or "1", reps=reps or ["N/A"])
+
+    def _extract(self, line: str) -> Tuple[Optional[str], List[str], str]:
+        """Extrae (series, repeticiones, nombre) de una línea."""
+        sets: Optional[str] = None
+        reps: List[str] = []
+        remaining = line
+
+        match = _SETS_X_REPS.search(remaining)
+        if match:
+            sets, reps = match.group(1), [match.group(2)]
+            remaining = remaining[: match.start()] + remaining[match.end() :]
+
+        match = _SETS.search(remaining)
+        if match:
+            sets = sets or match.group(1)
+            remaining = remaining[: match.start()] + remaining[match.end() :]
+
+        match = _REPS.search(remaining)
+        if match:
+            reps = reps or [r.strip() for r in re.split(r"[,/-]", match.group(1))]
+            remaining = remaining[: match.start()] + remaining[match.end() :]
+
+        name = _TRAILING.sub("", re.sub(r"\s{2,}", " ", remaining)).strip(" ,;:-")
+        return sets, reps, name
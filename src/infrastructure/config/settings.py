@@ -26,6 +26,64 @@ class Settings(BaseSettings):
         ..., alias="TELEGRAM_BOT_TOKEN", description="Token del bot de Telegram"
     )
     webhook_url: str = Field(..., description="URL del webhook para Telegram")
+    telegram_api_url: str = Field(
+        default="https://api.telegram.org",
+        description="URL de la Bot API (ej: servidor local o Bot API falsa)",
+    )
+    telegram_ingestion_mode: str = Field(
+        default="webhook",
+        description="Recepción de updates: 'webhook' o 'polling' (getUpdates)",
+    )
+    telegram_poll_timeout_seconds: int = Field(
+        default=30, description="Segundos de espera de cada llamada a getUpdates"
+    )
+    telegram_poll_batch_size: int = Field(
+        default=100, description="Updates por llamada a getUpdates (máximo 100)"
+    )
+    telegram_timeout_seconds: float = Field(
+        default=10.0, description="Timeout de cada llamada a la Bot API"
+    )
+    telegram_max_connections: int = Field(
+        default=20, description="Conexiones simultáneas con la Bot API"
+    )
+    telegram_global_per_second: float = Field(
+        default=30.0, description="Mensajes por segundo del bot en total"
+    )
+    telegram_chat_per_second: float = Field(
+        default=1.0, description="Mensajes por segundo a un mismo chat"
+    )
+    telegram_group_per_minute: float = Field(
+        default=20.0, description="Mensajes por minuto a un mismo grupo"
+    )
+    telegram_max_retries: int = Field(
+        default=3, description="Reintentos de un envío tras un 429"
+    )
+    inbox_workers: int = Field(
+        default=4, description="Updates de Telegram procesados a la vez"
+    )
+    inbox_retention_seconds: float = Field(
+        default=24 * 3600, description="Segundos que se conservan los procesados"
+    )
+    dedup_capacity: int = Field(
+        default=10_000, description="update_id recordados en memoria para descartar"
+    )
+    dedup_shared: bool = Field(
+        default=False,
+        description="Compartir los update_id vistos entre workers (SQLite)",
+    )
+    state_backend: str = Field(
+        default="memory",
+        description="Estado de conversación: 'memory', 'sqlite' o 'redis'",
+    )
+    state_ttl_seconds: float = Field(
+        default=24 * 3600, description="Segundos que se guarda una rutina pendiente"
+    )
+    state_max_size: int = Field(
+        default=10_000, description="Rutinas pendientes en memoria como máximo"
+    )
+    redis_url: Optional[str] = Field(
+        default=None, description="URL de Redis (redis://host:6379/0)"
+    )
 
     # ─────────────────────────────────────────────────────────
     # Gemini AI
@@ -34,6 +92,23 @@ class Settings(BaseSettings):
     gemini_model: str = Field(
         default="gemini-2.5-flash", description="Modelo de Gemini a usar"
     )
+    gemini_fallback_model: Optional[str] = Field(
+        default=None,
+        description="Modelo de Gemini alternativo como segundo backend de parsing",
+    )
+
+    # ─────────────────────────────────────────────────────────
+    # Parsing (failover entre proveedores)
+    # ─────────────────────────────────────────────────────────
+    parser_deadline_seconds: float = Field(
+        default=25.0, description="Tiempo máximo total para parsear una rutina"
+    )
+    parser_backend_timeout_seconds: float = Field(
+        default=15.0, description="Tiempo máximo por intento de un backend de IA"
+    )
+    parser_rule_based_fallback: bool = Field(
+        default=True, description="Usar el parser local por reglas como último recurso"
+    )
 
     # ─────────────────────────────────────────────────────────
     # Google Services
@@ -45,6 +120,142 @@ class Settings(BaseSettings):
         ..., description="ID de la plantilla de Google Slides"
     )
     routine_layout_id: str = Field(..., description="ID del layout para rutinas")
+    slides_strategy: str = Field(
+        default="build",
+        description="Estrategia de generación: 'build' (desde cero) o 'placeholder'",
+    )
+    skeleton_slide_id: Optional[str] = Field(
+        default=None, description="ID de la slide esqueleto (estrategia placeholder)"
+    )
+    skeleton_title_id: Optional[str] = Field(
+        default=None, description="ID del título en la slide esqueleto"
+    )
+    skeleton_table_id: Optional[str] = Field(
+        default=None, description="ID de la tabla en la slide esqueleto"
+    )
+    slides_max_rows_per_slide: int = Field(
+        default=11,
+        description="Ejercicios máximos por tabla; el resto pasa a slides de continuación",
+    )
+    slides_max_batch_requests: int = Field(
+        default=500, description="Requests máximos por batchUpdate de Slides"
+    )
+    slides_max_batch_bytes: int = Field(
+        default=500_000, description="Tamaño máximo (bytes) de cada batchUpdate"
+    )
+    google_credentials_pool: Optional[str] = Field(
+        default=None,
+        description="Lista JSON de service accounts adicionales para repartir cuota",
+    )
+    google_writes_per_minute: int = Field(
+        default=60, description="Presupuesto de escrituras por minuto y cuenta"
+    )
+    google_quarantine_seconds: float = Field(
+        default=60.0,
+        description="Segundos fuera de rotación de una cuenta tras un 429",
+    )
+    google_api_timeout_seconds: float = Field(
+        default=30.0, description="Timeout por llamada a las APIs de Google"
+    )
+    template_cache_ttl_seconds: float = Field(
+        default=300.0,
+        description="Segundos entre revalidaciones de los metadatos de la plantilla",
+    )
+    copy_pool_enabled: bool = Field(
+        default=False, description="Mantener copias pre-calentadas de la plantilla"
+    )
+    copy_pool_low_watermark: int = Field(
+        default=2, description="Copias mínimas antes de reponer el pool"
+    )
+    copy_pool_high_watermark: int = Field(
+        default=5, description="Copias hasta las que se repone el pool"
+    )
+    copy_pool_max_age_seconds: float = Field(
+        default=3600.0, description="Edad máxima de una copia del pool"
+    )
+
+    # ─────────────────────────────────────────────────────────
+    # Almacenamiento local
+    # ─────────────────────────────────────────────────────────
+    data_dir: str = Field(
+        default="data", description="Directorio para los ficheros SQLite locales"
+    )
+    presentation_cache_enabled: bool = Field(
+        default=True, description="Reutilizar presentaciones de rutinas idénticas"
+    )
+    presentation_cache_ttl_seconds: float = Field(
+        default=7 * 24 * 3600,
+        description="Segundos que se reutiliza una presentación generada",
+    )
+    retention_enabled: bool = Field(
+        default=False, description="Borrar de Drive las presentaciones caducadas"
+    )
+    retention_max_age_seconds: float = Field(
+        default=30 * 24 * 3600, description="Segundos que se conserva cada presentación"
+    )
+    retention_sweep_interval_seconds: float = Field(
+        default=3600.0, description="Segundos entre pasadas del sweeper"
+    )
+    retention_batch_size: int = Field(
+        default=50, description="Presentaciones borradas por petición batch"
+    )
+    retention_deletes_per_minute: float = Field(
+        default=120.0, description="Presupuesto de borrados por minuto"
+    )
+
+    # ─────────────────────────────────────────────────────────
+    # Cola de trabajos
+    # ─────────────────────────────────────────────────────────
+    job_workers: int = Field(
+        default=2, description="Workers que generan presentaciones en segundo plano"
+    )
+    job_max_attempts: int = Field(
+        default=3, description="Intentos por trabajo antes de darlo por fallido"
+    )
+    job_backoff_seconds: float = Field(
+        default=2.0, description="Espera antes del primer reintento (se duplica)"
+    )
+    job_interactive_concurrency: int = Field(
+        default=2, description="Trabajos interactivos (Telegram) simultáneos"
+    )
+    job_bulk_concurrency: int = Field(
+        default=1, description="Trabajos masivos (API) simultáneos"
+    )
+    job_tenant_weights: Optional[str] = Field(
+        default=None,
+        description='Pesos JSON por cliente (ej: {"api:backoffice": 2})',
+    )
+    job_ttl_seconds: float = Field(
+        default=24 * 3600, description="Segundos que se conservan los terminados"
+    )
+
+    # ─────────────────────────────────────────────────────────
+    # Presentaciones locales (.pptx)
+    # ─────────────────────────────────────────────────────────
+    presentation_backend: str = Field(
+        default="google",
+        description="Generador de presentaciones: 'google' o 'pptx' (local)",
+    )
+    local_fallback_enabled: bool = Field(
+        default=False,
+        description="Generar en local si Google Slides falla o tarda demasiado",
+    )
+    local_fallback_after_seconds: Optional[float] = Field(
+        default=20.0, description="Espera máxima a Google Slides antes del respaldo"
+    )
+    pptx_template_path: Optional[str] = Field(
+        default=None, description="Plantilla .pptx (por defecto, la de python-pptx)"
+    )
+    pptx_layout_index: int = Field(
+        default=6, description="Índice del layout de las slides de rutina"
+    )
+    pptx_workers: int = Field(default=2, description="Procesos de renderizado .pptx")
+    public_base_url: str = Field(
+        default="", description="URL pública del servicio para enlaces de descarga"
+    )
+    viewer_cache_size: int = Field(
+        default=256, description="Documentos HTML/PDF renderizados en memoria"
+    )
 
     # ─────────────────────────────────────────────────────────
     # Chatwoot (Opcional - Para logging de conversaciones)
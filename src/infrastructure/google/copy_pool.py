@@ -0,0 +1,225 @@
+"""
+Pool de copias pre-calentadas de la plantilla.
+
+`files().copy` es el paso más lento de la generación. Un hilo en segundo
+plano mantiene copias listas (con permisos ya aplicados) para que `create`
+solo tenga que tomar una en lugar de copiar en línea.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledCopy:
+    """Una copia lista para usar."""
+
+    presentation_id: str
+    revision: str
+    created_at: float
+
+
+class TemplateCopyPool:
+    """
+    Pool de copias de la plantilla con reposición en segundo plano.
+
+    - Cuando el pool baja de `low_watermark`, se rellena hasta `high_watermark`.
+    - Las copias más antiguas que `max_age` o de una revisión anterior de la
+      plantilla se consideran caducadas y se borran.
+    - Se sirven primero las copias más antiguas para que no lleguen a caducar.
+    """
+
+    def __init__(
+        self,
+        make_copy: Callable[[], str],
+        delete_copy: Callable[[str], None],
+        revision: Callable[[], str],
+        low_watermark: int = 2,
+        high_watermark: int = 5,
+        max_age: float = 3600.0,
+        check_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            make_copy: Crea una copia con permisos y devuelve su ID (si falla
+                a medias, debe borrar la copia antes de propagar el error)
+            delete_copy: Borra una copia por ID
+            revision: Devuelve la revisión actual de la plantilla
+            low_watermark: Tamaño por debajo del cual se repone
+            high_watermark: Tamaño hasta el que se repone
+            max_age: Segundos tras los que una copia se descarta
+            check_interval: Segundos entre revisiones del hilo de reposición
+            clock: Reloj monotónico (inyectable para tests)
+        """
+        if not 0 <= low_watermark <= high_watermark:
+            raise ValueError("Se requiere 0 <= low_watermark <= high_watermark")
+
+        self._make_copy = make_copy
+        self._delete_copy = delete_copy
+        self._revision = revision
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self._clock = clock
+
+        self._copies: Deque[PooledCopy] = deque()
+        self._stale: List[str] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.created = 0
+        self.expired = 0
+        self.errors = 0
+
+    def acquire(self) -> Optional[str]:
+        """
+        Toma una copia vigente del pool.
+
+        Returns:
+            ID de la copia, o None si no hay ninguna disponible
+        """
+        revision = self._revision()
+        now = self._clock()
+
+        with self._lock:
+            while self._copies:
+                copy = self._copies.popleft()
+                if self._is_fresh(copy, revision, now):
+                    self.hits += 1
+                    result: Optional[str] = copy.presentation_id
+                    break
+                self._discard(copy)
+            else:
+                self.misses += 1
+                result = None
+
+            if len(self._copies) < self.low_watermark:
+                self._wakeup.set()
+
+        return result
+
+    def start(self) -> None:
+        """Arranca el hilo de reposición."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._wakeup.set()
+        self._thread = threading.Thread(
+            target=self._run, name="slides-copy-pool", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Pool de copias iniciado (low={self.low_watermark}, "
+            f"high={self.high_watermark})"
+        )
+
+    def stop(self, drain: bool = True) -> None:
+        """
+        Detiene el hilo de reposición.
+
+        Args:
+            drain: Si True, borra también las copias que quedan en el pool
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+        if drain:
+            with self._lock:
+                for copy in self._copies:
+                    self._stale.append(copy.presentation_id)
+                self._copies.clear()
+            self._delete_stale()
+
+    def stats(self) -> Dict[str, int]:
+        """Métricas del pool."""
+        with self._lock:
+            size = len(self._copies)
+        return {
+            "size": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "created": self.created,
+            "expired": self.expired,
+            "errors": self.errors,
+        }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _is_fresh(self, copy: PooledCopy, revision: str, now: float) -> bool:
+        return copy.revision == revision and now - copy.created_at < self.max_age
+
+    def _discard(self, copy: PooledCopy) -> None:
+        """Marca una copia caducada para borrarla (requiere el lock)."""
+        self.expired += 1
+        self._stale.append(copy.presentation_id)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(timeout=self.check_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self._prune()
+                self._delete_stale()
+                self._replenish()
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Error en el pool de copias: {e}")
+
+    def _prune(self) -> None:
+        """Retira las copias caducadas."""
+        revision = self._revision()
+        now = self._clock()
+        with self._lock:
+            fresh = deque()
+            for copy in self._copies:
+                if self._is_fresh(copy, revision, now):
+                    fresh.append(copy)
+                else:
+                    self._discard(copy)
+            self._copies = fresh
+
+    def _delete_stale(self) -> None:
+        with self._lock:
+            stale, self._stale = self._stale, []
+        for presentation_id in stale:
+            try:
+                self._delete_copy(presentation_id)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"No se pudo borrar la copia {presentation_id}: {e}")
+
+    def _replenish(self) -> None:
+        with self._lock:
+            if len(self._copies) >= self.low_watermark:
+                return
+            missing = self.high_watermark - len(self._copies)
+
+        for _ in range(missing):
+            if self._stopped.is_set():
+                return
+            revision = self._revision()
+            presentation_id = self._make_copy()
+            with self._lock:
+                self._copies.append(
+                    PooledCopy(presentation_id, revision, self._clock())
+                )
+                self.created += 1
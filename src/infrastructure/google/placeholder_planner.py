@@ -0,0 +1,280 @@
+"""
+Estrategia de generación por relleno de placeholders.
+
+En lugar de crear títulos y tablas desde cero, la plantilla incluye una
+slide esqueleto con el título y una tabla ya maquetados y con textos
+marcadores. Cada slide duplica el esqueleto, reemplaza los marcadores y
+solo ajusta el número de filas, así que apenas hacen falta requests de
+formato.
+"""
+
+from typing import Dict, List, Tuple
+
+from domain.entities.routine import Routine
+from infrastructure.google.request_planner import SlidePage, SlidesRequestPlanner
+
+# Marcadores que debe contener la slide esqueleto de la plantilla
+DAY_MARKER = "{{dia}}"
+ROW_MARKERS = ("{{ejercicio}}", "{{series}}", "{{repeticiones}}")
+
+
+class PlaceholderFillPlanner(SlidesRequestPlanner):
+    """
+    Planner que rellena una slide esqueleto de la plantilla.
+
+    La slide esqueleto debe ser la última de la plantilla y contener:
+    - Un cuadro de título con el texto `{{dia}}`
+    - Una tabla de 2 filas: encabezados y una fila de datos con
+      `{{ejercicio}}`, `{{series}}` y `{{repeticiones}}`
+
+    Las filas añadidas heredan el estilo de la fila de datos. Un día sin
+    ejercicios conserva esa fila en blanco, para que siempre haya una fila
+    de datos de la que heredar al actualizar.
+    """
+
+    name = "placeholder"
+
+    def __init__(
+        self,
+        layout_id: str,
+        skeleton_slide_id: str,
+        title_id: str,
+        table_id: str,
+        **kwargs,
+    ):
+        """
+        Args:
+            layout_id: ID del layout (para días nuevos en actualizaciones)
+            skeleton_slide_id: ID de la slide esqueleto en la plantilla
+            title_id: ID del cuadro de título dentro del esqueleto
+            table_id: ID de la tabla dentro del esqueleto
+            **kwargs: Límites de paginación y de lotes de SlidesRequestPlanner
+        """
+        super().__init__(layout_id, **kwargs)
+        self.skeleton_slide_id = skeleton_slide_id
+        self.skeleton_title_id = title_id
+        self.skeleton_table_id = table_id
+
+    def compile(self, routines: List[Routine], num_existing: int = 0) -> List[dict]:
+        """
+        Compila las rutinas duplicando y rellenando el esqueleto.
+
+        El duplicado se inserta justo después del original, así que se
+        duplica en orden inverso para que los días queden en orden; al
+        final se borra el esqueleto.
+        """
+        requests: List[dict] = []
+        pages = self.paginate(routines)
+
+        for i in reversed(range(len(pages))):
+            slide_id, title_id, table_id = self._ids(i, num_existing)
+            requests.append(
+                {
+                    "duplicateObject": {
+                        "objectId": self.skeleton_slide_id,
+                        "objectIds": {
+                            self.skeleton_slide_id: slide_id,
+                            self.skeleton_title_id: title_id,
+                            self.skeleton_table_id: table_id,
+                        },
+                    }
+                }
+            )
+
+        for i, page in enumerate(pages):
+            requests.extend(self._fill_slide(i, page, num_existing))
+
+        requests.append({"deleteObject": {"objectId": self.skeleton_slide_id}})
+        return requests
+
+    def diff(
+        self, previous: List[Routine], current: List[Routine], num_existing: int = 0
+    ) -> List[dict]:
+        """
+        Compila solo los cambios entre dos versiones de una presentación.
+
+        A diferencia del planner base, no aplica estilos ni reconstruye
+        tablas, para conservar la maquetación del esqueleto:
+
+        - Slides nuevas: el esqueleto ya no existe, así que se duplica una
+          slide de rutina y se reescribe como si fuera una slide existente.
+        - Slides sobrantes: se borran.
+        - Textos cambiados: se reescriben en su sitio (heredan el estilo).
+        - Distinto número de filas: se añaden filas bajo la última (heredan
+          su estilo) o se borran las que sobran.
+        """
+        previous_pages = self.paginate(previous)
+        current_pages = self.paginate(current)
+        if not previous_pages:
+            return self.compile(current, num_existing)
+
+        # Origen de las slides nuevas: todas conservan la fila de datos del
+        # esqueleto, así que vale la primera
+        source = 0
+        source_ids = self._ids(source, num_existing)
+
+        requests: List[dict] = []
+        added: List[str] = []
+        for i in range(len(previous_pages), len(current_pages)):
+            ids = self._ids(i, num_existing)
+            requests.append(
+                {
+                    "duplicateObject": {
+                        "objectId": source_ids[0],
+                        "objectIds": dict(zip(source_ids, ids)),
+                    }
+                }
+            )
+            added.append(ids[0])
+        if added:
+            # Al final: plantilla sin esqueleto + slides previas + duplicados
+            end = num_existing - 1 + len(previous_pages) + len(added)
+            requests.append(
+                {
+                    "updateSlidesPosition": {
+                        "slideObjectIds": added,
+                        "insertionIndex": end,
+                    }
+                }
+            )
+
+        for i, new in enumerate(current_pages):
+            # Los duplicados parten del contenido de la slide origen
+            old = previous_pages[i if i < len(previous_pages) else source]
+            requests.extend(self._patch_slide(i, old, new, num_existing))
+
+        for i in range(len(current_pages), len(previous_pages)):
+            slide_id, _, _ = self._ids(i, num_existing)
+            requests.append({"deleteObject": {"objectId": slide_id}})
+
+        return requests
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _ids(self, index: int, num_existing: int) -> Tuple[str, str, str]:
+        return f"slide_{index + num_existing}", f"title_{index}", f"table_{index}"
+
+    def _insertion_index(self, index: int, num_existing: int) -> int:
+        # El esqueleto se borra tras generar, así que hay una slide menos
+        return index + num_existing - 1
+
+    def _fill_slide(
+        self, index: int, page: SlidePage, num_existing: int
+    ) -> List[dict]:
+        slide_id, _, table_id = self._ids(index, num_existing)
+        requests = [self._replace_marker(slide_id, DAY_MARKER, page.title)]
+
+        # Primera fila: reemplazar marcadores del esqueleto (en blanco si
+        # el día no tiene ejercicios)
+        first, *rest = self._table_rows(page)
+        for marker, text in zip(ROW_MARKERS, first):
+            requests.append(self._replace_marker(slide_id, marker, text))
+
+        if not rest:
+            return requests
+
+        # Resto de filas: añadirlas (heredan estilo) y escribir su texto
+        requests.append(
+            {
+                "insertTableRows": {
+                    "tableObjectId": table_id,
+                    "cellLocation": {"rowIndex": 1, "columnIndex": 0},
+                    "insertBelow": True,
+                    "number": len(rest),
+                }
+            }
+        )
+        for row, texts in enumerate(rest, start=2):
+            for col, text in enumerate(texts):
+                requests.append(
+                    {
+                        "insertText": {
+                            "objectId": table_id,
+                            "cellLocation": {"rowIndex": row, "columnIndex": col},
+                            "text": text,
+                        }
+                    }
+                )
+
+        return requests
+
+    def _patch_slide(
+        self, index: int, old: SlidePage, new: SlidePage, num_existing: int
+    ) -> List[dict]:
+        """Reescribe título y tabla de una slide sin tocar su estilo."""
+        _, title_id, table_id = self._ids(index, num_existing)
+        requests: List[dict] = []
+        if old.title != new.title:
+            requests.extend(self._replace_text(title_id, new.title))
+
+        # Siempre hay al menos una fila de datos, así que las nuevas se
+        # anclan en una fila de datos y nunca en los encabezados
+        old_rows = self._table_rows(old)
+        new_rows = self._table_rows(new)
+        common = min(len(old_rows), len(new_rows))
+        for row in range(1, common + 1):
+            pairs = zip(old_rows[row - 1], new_rows[row - 1])
+            for col, (old_text, new_text) in enumerate(pairs):
+                if old_text != new_text:
+                    cell = {"rowIndex": row, "columnIndex": col}
+                    requests.extend(self._rewrite_cell(table_id, cell, new_text))
+
+        if len(new_rows) > common:
+            requests.append(
+                {
+                    "insertTableRows": {
+                        "tableObjectId": table_id,
+                        "cellLocation": {"rowIndex": common, "columnIndex": 0},
+                        "insertBelow": True,
+                        "number": len(new_rows) - common,
+                    }
+                }
+            )
+            for row in range(common + 1, len(new_rows) + 1):
+                for col, text in enumerate(new_rows[row - 1]):
+                    if not text:
+                        continue
+                    requests.append(
+                        {
+                            "insertText": {
+                                "objectId": table_id,
+                                "cellLocation": {"rowIndex": row, "columnIndex": col},
+                                "text": text,
+                            }
+                        }
+                    )
+
+        # De abajo arriba, para que los índices no se desplacen
+        for row in range(len(old_rows), common, -1):
+            requests.append(
+                {
+                    "deleteTableRow": {
+                        "tableObjectId": table_id,
+                        "cellLocation": {"rowIndex": row, "columnIndex": 0},
+                    }
+                }
+            )
+
+        return requests
+
+    def _table_rows(self, page: SlidePage) -> List[Tuple[str, str, str]]:
+        """Textos de las filas de datos de la tabla (una en blanco si no hay)."""
+        return [self._row_texts(ex) for ex in page.exercises] or [("", "", "")]
+
+    def _rewrite_cell(
+        self, table_id: str, cell: Dict[str, int], text: str
+    ) -> List[dict]:
+        """Sustituye el texto de una celda (solo se borra si queda vacía)."""
+        requests = self._replace_text(table_id, text, cell)
+        return requests if text else requests[:1]
+
+    def _replace_marker(self, slide_id: str, marker: str, text: str) -> dict:
+        return {
+            "replaceAllText": {
+                "containsText": {"text": marker, "matchCase": True},
+                "replaceText": text,
+                "pageObjectIds": [slide_id],
+            }
+        }
@@ -0,0 +1,596 @@
+"""
+Planificador de requests para Google Slides.
+
+Compila una lista de Routine en el conjunto mínimo y ordenado de
+operaciones contra las APIs de Drive y Slides. No hace llamadas de red,
+por lo que sirve también como dry-run para inspección y benchmarks.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from domain.entities.routine import Exercise, Routine
+
+PRESENTATION_NAME = "Rutina de Entrenamiento"
+
+# Geometría de la tabla (en puntos)
+TABLE_MIN_HEIGHT_PT = 250
+TABLE_MAX_HEIGHT_PT = 300
+ROW_HEIGHT_PT = 25
+
+# ─────────────────────────────────────────────────────────
+# Estilos (se construyen una vez y se comparten entre requests)
+# ─────────────────────────────────────────────────────────
+
+_WHITE = {"opaqueColor": {"rgbColor": {"red": 1, "green": 1, "blue": 1}}}
+
+_HEADER_TEXT_STYLE = {
+    "style": {"bold": True, "foregroundColor": _WHITE},
+    "fields": "bold,foregroundColor",
+}
+
+_DATA_TEXT_STYLE = {
+    "style": {"foregroundColor": _WHITE},
+    "fields": "foregroundColor",
+}
+
+
+def _cell_fill(rgb: Dict[str, float]) -> Dict[str, Any]:
+    return {
+        "tableCellProperties": {
+            "tableCellBackgroundFill": {"solidFill": {"color": {"rgbColor": rgb}}}
+        },
+        "fields": "tableCellBackgroundFill.solidFill.color",
+    }
+
+
+_BG_ODD = _cell_fill({"red": 0.27, "green": 0.27, "blue": 0.27})
+_BG_EVEN = _cell_fill({"red": 0.2, "green": 0.2, "blue": 0.2})
+
+
+@dataclass
+class SlidesOperation:
+    """
+    Una llamada (round trip) a la API de Google.
+
+    Attributes:
+        api: Servicio y método (ej: "drive.files.copy", "slides.batchUpdate")
+        params: Parámetros de la llamada (fileId, body...)
+    """
+
+    api: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SlidePage:
+    """
+    Una slide de la presentación: un día o una continuación de un día.
+
+    Attributes:
+        title: Título de la slide (ej: "Día 1", "Día 1 (cont.)")
+        exercises: Ejercicios que caben en la tabla de esta slide
+    """
+
+    title: str
+    exercises: List[Exercise] = field(default_factory=list)
+
+
+def paginate(routines: List[Routine], max_rows_per_slide: int) -> List[SlidePage]:
+    """
+    Reparte cada día en slides de como mucho `max_rows_per_slide` ejercicios.
+
+    La primera slide de un día se titula "Día N" y las siguientes
+    "Día N (cont.)". Un día sin ejercicios ocupa igualmente una slide.
+    """
+    pages = []
+    step = max_rows_per_slide
+    for routine in routines:
+        title = f"Día {routine.day_number}"
+        chunks = [
+            routine.exercises[start : start + step]
+            for start in range(0, len(routine.exercises), step)
+        ] or [[]]
+        for n, exercises in enumerate(chunks):
+            pages.append(SlidePage(title if n == 0 else f"{title} (cont.)", exercises))
+    return pages
+
+
+@dataclass
+class SlidesPlan:
+    """Plan compilado: operaciones en el orden en que se ejecutan."""
+
+    operations: List[SlidesOperation] = field(default_factory=list)
+
+    @property
+    def round_trips(self) -> int:
+        """Número de llamadas HTTP que requiere el plan."""
+        return len(self.operations)
+
+    @property
+    def batch_requests(self) -> List[dict]:
+        """Requests de todos los batchUpdate del plan, en orden."""
+        requests: List[dict] = []
+        for op in self.operations:
+            if op.api == "slides.batchUpdate":
+                requests.extend(op.params["body"]["requests"])
+        return requests
+
+    @property
+    def payload_bytes(self) -> int:
+        """Tamaño en bytes del JSON de los batchUpdate."""
+        return sum(
+            len(json.dumps(op.params["body"]).encode("utf-8"))
+            for op in self.operations
+            if op.api == "slides.batchUpdate"
+        )
+
+
+class SlidesRequestPlanner:
+    """
+    Compila rutinas en requests de la API de Slides.
+
+    El contenido y el formato van en el mismo batchUpdate: la API aplica
+    los requests en orden, así que el formato siempre llega después del
+    texto al que afecta. Los días con más ejercicios de los que caben en
+    una tabla se reparten en slides de continuación, y los batchUpdate
+    demasiado grandes se trocean en varios consecutivos.
+    """
+
+    name = "build"
+
+    def __init__(
+        self,
+        layout_id: str,
+        max_rows_per_slide: int = (TABLE_MAX_HEIGHT_PT // ROW_HEIGHT_PT) - 1,
+        max_batch_requests: int = 500,
+        max_batch_bytes: int = 500_000,
+    ):
+        """
+        Args:
+            layout_id: ID del layout para las slides de rutina
+            max_rows_per_slide: Ejercicios máximos por tabla
+            max_batch_requests: Requests máximos por batchUpdate
+            max_batch_bytes: Bytes máximos (JSON) por batchUpdate
+        """
+        if max_rows_per_slide < 1:
+            raise ValueError("max_rows_per_slide debe ser al menos 1")
+        self.layout_id = layout_id
+        self.max_rows_per_slide = max_rows_per_slide
+        self.max_batch_requests = max_batch_requests
+        self.max_batch_bytes = max_batch_bytes
+
+    def plan(
+        self, routines: List[Routine], template_id: str, num_existing: int = 0
+    ) -> SlidesPlan:
+        """
+        Compila el plan completo de generación (dry-run).
+
+        Args:
+            routines: Lista de rutinas (una por día)
+            template_id: ID de la plantilla a copiar
+            num_existing: Slides que ya tiene la plantilla
+
+        Returns:
+            SlidesPlan con las operaciones en orden de ejecución
+        """
+        operations = [
+            SlidesOperation(
+                "drive.files.copy",
+                {
+                    "fileId": template_id,
+                    "body": {"name": PRESENTATION_NAME},
+                    "fields": "id",
+                },
+            ),
+        ]
+
+        for batch in self.chunk(self.compile(routines, num_existing)):
+            operations.append(
+                SlidesOperation("slides.batchUpdate", {"body": {"requests": batch}})
+            )
+
+        operations.append(
+            SlidesOperation(
+                "drive.permissions.create",
+                {"body": {"type": "anyone", "role": "writer"}, "fields": "id"},
+            )
+        )
+        return SlidesPlan(operations)
+
+    def compile(self, routines: List[Routine], num_existing: int = 0) -> List[dict]:
+        """
+        Compila las rutinas en la lista de requests del batchUpdate.
+
+        Args:
+            routines: Lista de rutinas (una por día)
+            num_existing: Slides que ya tiene la presentación
+
+        Returns:
+            Requests de contenido seguidos de los de formato
+        """
+        requests_content = []
+        requests_format = []
+
+        for i, page in enumerate(self.paginate(routines)):
+            content, format_ = self._build_slide(i, page, num_existing)
+            requests_content.extend(content)
+            requests_format.extend(format_)
+
+        return requests_content + requests_format
+
+    def paginate(self, routines: List[Routine]) -> List[SlidePage]:
+        """Reparte los ejercicios de cada día en slides según las filas que caben."""
+        return paginate(routines, self.max_rows_per_slide)
+
+    def chunk(self, requests: List[dict]) -> List[List[dict]]:
+        """
+        Trocea los requests en batchUpdate consecutivos.
+
+        Se respeta el orden, así que un request que usa un objeto creado en
+        un lote anterior sigue siendo válido.
+        """
+        batches: List[List[dict]] = []
+        current: List[dict] = []
+        size = 0
+
+        for request in requests:
+            request_size = len(json.dumps(request).encode("utf-8"))
+            if current and (
+                len(current) >= self.max_batch_requests
+                or size + request_size > self.max_batch_bytes
+            ):
+                batches.append(current)
+                current, size = [], 0
+            current.append(request)
+            size += request_size
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def diff(
+        self, previous: List[Routine], current: List[Routine], num_existing: int = 0
+    ) -> List[dict]:
+        """
+        Compila solo los cambios entre dos versiones de una presentación.
+
+        Se compara slide a slide (tras paginar ambas versiones):
+
+        - Slides nuevas: se crean.
+        - Slides sobrantes: se borran.
+        - Mismo número de filas: se reescriben solo las celdas cambiadas.
+        - Distinto número de filas: se reconstruye solo la tabla de esa slide.
+
+        Args:
+            previous: Rutinas con las que se generó la presentación
+            current: Rutinas revisadas
+            num_existing: Slides que tenía la plantilla al generarla
+
+        Returns:
+            Requests del batchUpdate (vacío si no hay cambios)
+        """
+        requests_content: List[dict] = []
+        requests_format: List[dict] = []
+        previous_pages = self.paginate(previous)
+        current_pages = self.paginate(current)
+
+        for i in range(max(len(previous_pages), len(current_pages))):
+            slide_id = f"slide_{i + num_existing}"
+            title_id = f"title_{i}"
+            table_id = f"table_{i}"
+
+            if i >= len(current_pages):
+                requests_content.append({"deleteObject": {"objectId": slide_id}})
+                continue
+
+            new = current_pages[i]
+            if i >= len(previous_pages):
+                content, format_ = self._build_slide(i, new, num_existing)
+                requests_content.extend(content)
+                requests_format.extend(format_)
+                continue
+
+            old = previous_pages[i]
+            if old.title != new.title:
+                requests_content.extend(self._replace_text(title_id, new.title))
+                requests_format.append(self._title_text_style(title_id))
+
+            if old.exercises == new.exercises:
+                continue
+
+            if len(old.exercises) != len(new.exercises):
+                requests_content.append({"deleteObject": {"objectId": table_id}})
+                requests_content.extend(
+                    self._create_table(slide_id, table_id, new.exercises)
+                )
+                requests_format.extend(self._format_table(table_id, new.exercises))
+                continue
+
+            for row, (old_ex, new_ex) in enumerate(
+                zip(old.exercises, new.exercises), start=1
+            ):
+                for col, (old_text, new_text) in enumerate(
+                    zip(self._row_texts(old_ex), self._row_texts(new_ex))
+                ):
+                    if old_text == new_text:
+                        continue
+                    cell = {"rowIndex": row, "columnIndex": col}
+                    requests_content.extend(
+                        self._replace_text(table_id, new_text, cell)
+                    )
+                    requests_format.append(
+                        self._cell_text_style(table_id, row, col, _DATA_TEXT_STYLE)
+                    )
+
+        return requests_content + requests_format
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados para construir slides
+    # ─────────────────────────────────────────────────────────
+
+    def _build_slide(
+        self, index: int, page: SlidePage, num_existing: int
+    ) -> Tuple[List[dict], List[dict]]:
+        """Requests (contenido, formato) de una slide."""
+        slide_id = f"slide_{index + num_existing}"
+        title_id = f"title_{index}"
+        table_id = f"table_{index}"
+
+        content = [
+            {
+                "createSlide": {
+                    "objectId": slide_id,
+                    "insertionIndex": str(self._insertion_index(index, num_existing)),
+                    "slideLayoutReference": {"layoutId": self.layout_id},
+                }
+            }
+        ]
+        content.extend(self._create_title(slide_id, title_id, page.title))
+        content.extend(self._create_table(slide_id, table_id, page.exercises))
+
+        format_ = self._format_title(title_id)
+        format_.extend(self._format_table(table_id, page.exercises))
+
+        return content, format_
+
+    def _insertion_index(self, index: int, num_existing: int) -> int:
+        """Posición de la slide `index` en la presentación."""
+        return index + num_existing
+
+    @staticmethod
+    def _row_texts(exercise: Exercise) -> Tuple[str, str, str]:
+        return exercise.name, exercise.sets, ", ".join(exercise.reps)
+
+    def _replace_text(
+        self, object_id: str, text: str, cell: Optional[Dict[str, int]] = None
+    ) -> List[dict]:
+        """Borra todo el texto de una forma (o celda) e inserta el nuevo."""
+        location = {"cellLocation": cell} if cell else {}
+        return [
+            {
+                "deleteText": {
+                    "objectId": object_id,
+                    **location,
+                    "textRange": {"type": "ALL"},
+                }
+            },
+            {"insertText": {"objectId": object_id, **location, "text": text}},
+        ]
+
+    def _create_title(self, slide_id: str, title_id: str, text: str) -> List[dict]:
+        return [
+            {
+                "createShape": {
+                    "objectId": title_id,
+                    "shapeType": "TEXT_BOX",
+                    "elementProperties": {
+                        "pageObjectId": slide_id,
+                        "size": {
+                            "height": {"magnitude": 50, "unit": "PT"},
+                            "width": {"magnitude": 600, "unit": "PT"},
+                        },
+                        "transform": {
+                            "scaleX": 1,
+                            "scaleY": 1,
+                            "translateX": 50,
+                            "translateY": 10,
+                            "unit": "PT",
+                        },
+                    },
+                }
+            },
+            {"insertText": {"objectId": title_id, "text": text}},
+        ]
+
+    def _title_text_style(self, title_id: str) -> dict:
+        return {
+            "updateTextStyle": {
+                "objectId": title_id,
+                "style": {
+                    "bold": True,
+                    "fontSize": {"magnitude": 24, "unit": "PT"},
+                    "foregroundColor": _WHITE,
+                },
+                "fields": "bold,fontSize,foregroundColor",
+            }
+        }
+
+    def _format_title(self, title_id: str) -> List[dict]:
+        return [
+            self._title_text_style(title_id),
+            {
+                "updateShapeProperties": {
+                    "objectId": title_id,
+                    "shapeProperties": {
+                        "shapeBackgroundFill": {
+                            "solidFill": {
+                                "color": {
+                                    "rgbColor": {"red": 0.0, "green": 0.2, "blue": 0.8}
+                                }
+                            }
+                        }
+                    },
+                    "fields": "shapeBackgroundFill.solidFill.color",
+                }
+            },
+        ]
+
+    def _create_table(
+        self, slide_id: str, table_id: str, exercises: List[Exercise]
+    ) -> List[dict]:
+        num_rows = len(exercises) + 1
+        height = min(
+            TABLE_MAX_HEIGHT_PT, max(TABLE_MIN_HEIGHT_PT, num_rows * ROW_HEIGHT_PT)
+        )
+        requests = [
+            {
+                "createTable": {
+                    "objectId": table_id,
+                    "rows": num_rows,
+                    "columns": 3,
+                    "elementProperties": {
+                        "pageObjectId": slide_id,
+                        "size": {
+                            "height": {"magnitude": height, "unit": "PT"},
+                            "width": {"magnitude": 600, "unit": "PT"},
+                        },
+                        "transform": {
+                            "scaleX": 1,
+                            "scaleY": 1,
+                            "translateX": 50,
+                            "translateY": 80,
+                            "unit": "PT",
+                        },
+                    },
+                }
+            }
+        ]
+
+        # Encabezados
+        headers = ["Ejercicio", "Series", "Repeticiones"]
+        for col, text in enumerate(headers):
+            requests.append(
+                {
+                    "insertText": {
+                        "objectId": table_id,
+                        "cellLocation": {"rowIndex": 0, "columnIndex": col},
+                        "text": text,
+                    }
+                }
+            )
+
+        # Datos
+        for row, ex in enumerate(exercises, start=1):
+            requests.append(
+                {
+                    "insertText": {
+                        "objectId": table_id,
+                        "cellLocation": {"rowIndex": row, "columnIndex": 0},
+                        "text": ex.name,
+                    }
+                }
+            )
+            requests.append(
+                {
+                    "insertText": {
+                        "objectId": table_id,
+                        "cellLocation": {"rowIndex": row, "columnIndex": 1},
+                        "text": ex.sets,
+                    }
+                }
+            )
+            requests.append(
+                {
+                    "insertText": {
+                        "objectId": table_id,
+                        "cellLocation": {"rowIndex": row, "columnIndex": 2},
+                        "text": ", ".join(ex.reps),
+                    }
+                }
+            )
+
+        return requests
+
+    def _format_table(self, table_id: str, exercises: List[Exercise]) -> List[dict]:
+        num_rows = len(exercises)
+
+        # Texto: la API solo admite una celda por updateTextStyle, así que
+        # se reutiliza el mismo estilo ya construido para todas las celdas
+        requests = [
+            self._cell_text_style(table_id, 0, col, _HEADER_TEXT_STYLE)
+            for col in range(3)
+        ]
+        requests.extend(
+            self._cell_text_style(table_id, row, col, _DATA_TEXT_STYLE)
+            for row in range(1, num_rows + 1)
+            for col in range(3)
+        )
+
+        if not num_rows:
+            return requests
+
+        # Fondo: un rango para todas las filas de datos y otro por cada fila par
+        requests.append(self._range_fill(table_id, 1, num_rows, _BG_ODD))
+        requests.extend(
+            self._range_fill(table_id, row, 1, _BG_EVEN)
+            for row in range(2, num_rows + 1, 2)
+        )
+
+        return requests
+
+    def _cell_text_style(
+        self, table_id: str, row: int, col: int, style: Dict[str, Any]
+    ) -> dict:
+        return {
+            "updateTextStyle": {
+                "objectId": table_id,
+                "cellLocation": {"rowIndex": row, "columnIndex": col},
+                **style,
+            }
+        }
+
+    def _range_fill(
+        self, table_id: str, row: int, row_span: int, fill: Dict[str, Any]
+    ) -> dict:
+        return {
+            "updateTableCellProperties": {
+                "objectId": table_id,
+                "tableRange": {
+                    "location": {"rowIndex": row, "columnIndex": 0},
+                    "rowSpan": row_span,
+                    "columnSpan": 3,
+                },
+                **fill,
+            }
+        }
+
+
+def compare_strategies(
+    planners: List[SlidesRequestPlanner],
+    routines: List[Routine],
+    template_id: str,
+    num_existing: int = 0,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Dry-run comparativo: requests, bytes y round trips de cada estrategia.
+
+    Args:
+        planners: Estrategias a comparar
+        routines: Rutinas de ejemplo
+        template_id: ID de la plantilla
+        num_existing: Slides de la plantilla
+
+    Returns:
+        Nombre de la estrategia -> métricas del plan
+    """
+    result = {}
+    for planner in planners:
+        plan = planner.plan(routines, template_id, num_existing)
+        result[planner.name] = {
+            "requests": len(plan.batch_requests),
+            "bytes": plan.payload_bytes,
+            "round_trips": plan.round_trips,
+        }
+    return result
@@ -0,0 +1,198 @@
+"""
+Borrado en segundo plano de presentaciones caducadas.
+
+Cada confirmación crea un fichero en el Drive de la service account (o un
+.pptx en disco con el generador local). Sin limpieza, el número de
+ficheros crece sin límite: listar y copiar se vuelve más lento y acaba
+agotándose la cuota de almacenamiento.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from infrastructure.google.sharded_generator import TokenBucket
+from infrastructure.persistence.sqlite_retention_store import SQLiteRetentionStore
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionSweeper:
+    """
+    Hilo que borra las presentaciones más antiguas que `max_age`.
+
+    - Los borrados van en lotes (una petición batch de Drive por lote).
+    - Un token bucket limita los borrados por minuto para no competir con
+      la generación por la cuota de escritura.
+    - Los IDs que no se pudieron borrar se aplazan con espera exponencial
+      en el registro, así que no bloquean los lotes siguientes; tras
+      `max_attempts` fallos se abandonan.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteRetentionStore,
+        delete_many: Callable[[List[str]], Tuple[List[str], int]],
+        max_age: float,
+        interval: float = 3600.0,
+        batch_size: int = 50,
+        deletes_per_minute: float = 120.0,
+        on_deleted: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Args:
+            store: Registro de presentaciones creadas
+            delete_many: Borra un lote y devuelve (IDs borrados, bytes liberados)
+            max_age: Segundos que se conserva cada presentación
+            interval: Segundos entre pasadas
+            batch_size: Presentaciones por lote (máximo 100 en Drive)
+            deletes_per_minute: Presupuesto de borrados por minuto
+            on_deleted: Se llama con cada ID borrado (ej: limpiar cachés)
+        """
+        self.store = store
+        self._delete_many = delete_many
+        self.max_age = max_age
+        self.interval = interval
+        self.batch_size = min(batch_size, 100)
+        self._bucket = TokenBucket(deletes_per_minute, capacity=self.batch_size)
+        self._on_deleted = on_deleted
+
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.deleted = 0
+        self.bytes_reclaimed = 0
+        self.errors = 0
+        self.abandoned = 0
+        self.sweeps = 0
+        self.last_sweep_seconds = 0.0
+
+    def start(self) -> None:
+        """Arranca el hilo de barrido."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="retention-sweeper", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Sweeper de retención iniciado (max_age={self.max_age}s, "
+            f"interval={self.interval}s)"
+        )
+
+    def stop(self) -> None:
+        """Detiene el hilo de barrido (termina el lote en curso)."""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def sweep(self) -> int:
+        """
+        Ejecuta una pasada completa.
+
+        Returns:
+            Número de presentaciones borradas
+        """
+        started = time.monotonic()
+        total = 0
+
+        while not self._stopped.is_set():
+            ids = self.store.expired(self.max_age, self.batch_size)
+            if not ids:
+                break
+
+            # Esperar presupuesto sin bloquear el apagado
+            with self._lock:
+                wait = self._bucket.wait_time(len(ids))
+            if wait and self._stopped.wait(wait):
+                break
+            with self._lock:
+                self._bucket.take(len(ids))
+
+            try:
+                deleted, reclaimed = self._delete_many(ids)
+            except Exception as e:
+                # Fallo del lote entero (ej: Drive caído): aplazarlo y
+                # dejar el resto para la próxima pasada
+                with self._lock:
+                    self.errors += 1
+                logger.warning(f"Error borrando presentaciones caducadas: {e}")
+                self._defer(ids, str(e))
+                break
+
+            self.store.remove(deleted)
+            for presentation_id in deleted:
+                self._notify(presentation_id)
+
+            done = set(deleted)
+            failed = [pid for pid in ids if pid not in done]
+            with self._lock:
+                self.deleted += len(deleted)
+                self.bytes_reclaimed += reclaimed
+                self.errors += len(failed)
+            total += len(deleted)
+
+            # Los fallidos se aplazan: el siguiente lote ya no los incluye
+            if failed:
+                self._defer(failed, "no se pudo borrar")
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.sweeps += 1
+            self.last_sweep_seconds = elapsed
+        if total:
+            logger.info(f"Retención: {total} presentaciones borradas en {elapsed:.1f}s")
+        return total
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del sweeper."""
+        files = self.store.count()
+        failing = self.store.failing()
+        with self._lock:
+            return {
+                "files": files,
+                "failing": failing,
+                "deleted": self.deleted,
+                "bytes_reclaimed": self.bytes_reclaimed,
+                "errors": self.errors,
+                "abandoned": self.abandoned,
+                "sweeps": self.sweeps,
+                "last_sweep_seconds": round(self.last_sweep_seconds, 3),
+            }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                logger.warning(f"Error en el sweeper de retención: {e}")
+            self._stopped.wait(self.interval)
+
+    def _defer(self, presentation_ids: List[str], error: str) -> None:
+        abandoned = self.store.fail(presentation_ids, error)
+        if not abandoned:
+            return
+        with self._lock:
+            self.abandoned += len(abandoned)
+        logger.error(
+            f"Retención: se abandonan {len(abandoned)} presentaciones tras "
+            f"{self.store.max_attempts} intentos: {', '.join(abandoned[:10])}"
+        )
+
+    def _notify(self, presentation_id: str) -> None:
+        if not self._on_deleted:
+            return
+        try:
+            self._on_deleted(presentation_id)
+        except Exception as e:
+            logger.warning(f"Error limpiando {presentation_id} tras borrarla: {e}")
@@ -0,0 +1,379 @@
+"""
+Reparto de la generación entre varias service accounts de Google.
+
+La cuota de escritura de Slides y Drive es por usuario (service account),
+así que con una sola cuenta todo el tráfico compite por el mismo cupo.
+Este generador mantiene un GoogleSlidesGenerator por cuenta, cada uno con
+su propio cliente y su propio presupuesto de escrituras por minuto, y
+envía cada presentación a la cuenta menos cargada.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from googleapiclient.errors import HttpError
+
+from domain.entities.routine import Routine
+from domain.exceptions import PresentationError
+from domain.interfaces.presentation_generator import PresentationGeneratorInterface
+from infrastructure.google.request_planner import SlidesPlan
+from infrastructure.google.slides_generator import GoogleSlidesGenerator
+from infrastructure.persistence.sqlite_snapshot_store import SQLiteRoutineSnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# Motivos de 403 que en realidad son límites de cuota
+_RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
+
+
+class TokenBucket:
+    """
+    Token bucket local: `rate` tokens por minuto con ráfagas de hasta `capacity`.
+
+    No es seguro entre hilos por sí solo; ShardedSlidesGenerator lo usa
+    siempre bajo su lock.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def take(self, amount: float) -> bool:
+        """Consume `amount` tokens si los hay (como mucho, la capacidad)."""
+        amount = min(amount, self.capacity)
+        self._refill()
+        if self._tokens < amount:
+            return False
+        self._tokens -= amount
+        return True
+
+    def wait_time(self, amount: float) -> float:
+        """Segundos hasta que haya `amount` tokens."""
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate) if self.rate else float("inf")
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+
+@dataclass
+class AccountShard:
+    """
+    Una service account con su generador y su presupuesto.
+
+    Attributes:
+        name: client_email de la cuenta (identifica al propietario en Drive)
+        generator: Generador con el cliente de esta cuenta
+        bucket: Presupuesto de escrituras por minuto
+    """
+
+    name: str
+    generator: GoogleSlidesGenerator
+    bucket: TokenBucket
+    in_flight: int = 0
+    quarantined_until: float = 0.0
+    created: int = 0
+    throttled: int = 0
+
+
+class ShardedSlidesGenerator(PresentationGeneratorInterface):
+    """
+    Generador que reparte las presentaciones entre varias cuentas.
+
+    - Cada `create` va a la cuenta disponible con menos peticiones en curso
+      y más presupuesto restante; consume tantos tokens como escrituras
+      tiene su plan.
+    - Si una cuenta devuelve 429 queda en cuarentena (el tiempo que indique
+      Retry-After o `quarantine`) y la presentación se reintenta en otra.
+    - Cada presentación queda asociada a la cuenta que la creó, que es la
+      única con permisos de escritura sobre ella. La asociación se guarda
+      en `accounts` para sobrevivir a reinicios; si no consta, se pregunta
+      a Drive por el propietario del fichero (no basta con que una cuenta
+      lo vea: las presentaciones públicas las ven todas).
+    """
+
+    def __init__(
+        self,
+        shards: List[AccountShard],
+        accounts: Optional[SQLiteRoutineSnapshotStore] = None,
+        quarantine: float = 60.0,
+        max_wait: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            shards: Cuentas disponibles
+            accounts: Dónde se guarda qué cuenta creó cada presentación
+            quarantine: Segundos fuera de rotación tras un 429
+            max_wait: Espera máxima por presupuesto antes de fallar
+            clock: Reloj monotónico (inyectable para tests)
+            sleep: Función de espera (inyectable para tests)
+        """
+        if not shards:
+            raise ValueError("ShardedSlidesGenerator necesita al menos una cuenta")
+
+        self.shards = shards
+        self.quarantine = quarantine
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._accounts = accounts
+        self._by_name = {shard.name: shard for shard in shards}
+
+        names = ", ".join(s.name for s in shards)
+        logger.info(f"ShardedSlidesGenerator inicializado con cuentas: {names}")
+
+    def create(self, routines: List[Routine]) -> str:
+        return self._route(routines, lambda g: g.create(routines))
+
+    def create_and_share(self, routines: List[Routine]) -> str:
+        return self._route(routines, lambda g: g.create_and_share(routines))
+
+    def update(self, presentation_id: str, routines: List[Routine]) -> str:
+        shard = self._owner(presentation_id)
+        if shard is None:
+            return self.create_and_share(routines)
+        return shard.generator.update(presentation_id, routines)
+
+    def set_permissions(self, presentation_id: str) -> None:
+        shard = self._owner(presentation_id) or self.shards[0]
+        shard.generator.set_permissions(presentation_id)
+
+    def exists(self, presentation_id: str) -> bool:
+        shard = self._owner(presentation_id)
+        return shard is not None and shard.generator.exists(presentation_id)
+
+    def get_url(self, presentation_id: str) -> str:
+        return self.shards[0].generator.get_url(presentation_id)
+
+    def delete_many(self, presentation_ids: List[str]) -> Tuple[List[str], int]:
+        """Borra cada presentación con la cuenta propietaria."""
+        groups: Dict[str, List[str]] = {}
+        deleted: List[str] = []
+        for presentation_id in presentation_ids:
+            try:
+                shard, gone = self._locate(presentation_id)
+            except Exception as e:
+                # Error transitorio: no se da por borrada, el sweeper la
+                # reintentará más tarde
+                logger.warning(f"No se pudo localizar {presentation_id}: {e}")
+                continue
+            if shard is not None:
+                groups.setdefault(shard.name, []).append(presentation_id)
+            elif gone:
+                # Ninguna cuenta la ve (no existe o está en la papelera)
+                deleted.append(presentation_id)
+            else:
+                logger.warning(f"{presentation_id} es de una cuenta no configurada")
+
+        reclaimed = 0
+        for shard in self.shards:
+            if shard.name in groups:
+                ids, size = shard.generator.delete_many(groups[shard.name])
+                deleted.extend(ids)
+                reclaimed += size
+        return deleted, reclaimed
+
+    def plan(
+        self, routines: List[Routine], num_existing: Optional[int] = None
+    ) -> SlidesPlan:
+        """Dry-run (todas las cuentas comparten plantilla y planner)."""
+        return self.shards[0].generator.plan(routines, num_existing)
+
+    def warm_up(self) -> None:
+        for shard in self.shards:
+            shard.generator.warm_up()
+
+    def start(self) -> None:
+        for shard in self.shards:
+            shard.generator.start()
+
+    def stop(self) -> None:
+        for shard in self.shards:
+            shard.generator.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas por cuenta."""
+        now = self._clock()
+        with self._lock:
+            return {
+                "accounts": {
+                    shard.name: {
+                        "tokens": round(shard.bucket.tokens, 1),
+                        "in_flight": shard.in_flight,
+                        "quarantined": shard.quarantined_until > now,
+                        "created": shard.created,
+                        "throttled": shard.throttled,
+                        **shard.generator.stats(),
+                    }
+                    for shard in self.shards
+                }
+            }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _route(
+        self, routines: List[Routine], call: Callable[[GoogleSlidesGenerator], str]
+    ) -> str:
+        """Ejecuta la creación en la cuenta menos cargada, con reintento tras 429."""
+        cost = self.shards[0].generator.plan(routines).round_trips
+        tried: set = set()
+
+        while True:
+            shard = self._acquire(cost, exclude=tried)
+            try:
+                presentation_id = call(shard.generator)
+            except HttpError as e:
+                if not self._is_rate_limited(e):
+                    raise
+                self._quarantine(shard, e)
+                tried.add(shard.name)
+                if len(tried) == len(self.shards):
+                    raise PresentationError(
+                        "Todas las cuentas de Google han agotado su cuota"
+                    )
+                continue
+            finally:
+                with self._lock:
+                    shard.in_flight -= 1
+
+            with self._lock:
+                shard.created += 1
+            self._remember(presentation_id, shard)
+            return presentation_id
+
+    def _acquire(self, cost: int, exclude: set) -> AccountShard:
+        """Reserva presupuesto en la mejor cuenta, esperando si hace falta."""
+        deadline = self._clock() + self.max_wait
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                candidates = [
+                    s
+                    for s in self.shards
+                    if s.name not in exclude and s.quarantined_until <= now
+                ]
+                candidates.sort(key=lambda s: (s.in_flight, -s.bucket.tokens))
+                for shard in candidates:
+                    if shard.bucket.take(cost):
+                        shard.in_flight += 1
+                        return shard
+
+                if candidates:
+                    wait = min(s.bucket.wait_time(cost) for s in candidates)
+                else:
+                    pending = [s for s in self.shards if s.name not in exclude]
+                    wait = min(
+                        (s.quarantined_until - now for s in pending), default=0
+                    )
+
+            if now + wait > deadline:
+                raise PresentationError(
+                    "No hay cuota de Google disponible, intenta de nuevo en un momento"
+                )
+            self._sleep(max(wait, 0.05))
+
+    def _quarantine(self, shard: AccountShard, error: HttpError) -> None:
+        retry_after = error.resp.get("retry-after") if error.resp else None
+        try:
+            seconds = float(retry_after) if retry_after else self.quarantine
+        except ValueError:
+            seconds = self.quarantine
+
+        with self._lock:
+            shard.throttled += 1
+            shard.quarantined_until = self._clock() + seconds
+        logger.warning(
+            f"Cuenta '{shard.name}' limitada (429), en cuarentena {seconds}s"
+        )
+
+    @staticmethod
+    def _is_rate_limited(error: HttpError) -> bool:
+        status = error.resp.status if error.resp else None
+        if status == 429:
+            return True
+        return status == 403 and any(
+            reason in str(error) for reason in _RATE_LIMIT_REASONS
+        )
+
+    def _owner(self, presentation_id: str) -> Optional[AccountShard]:
+        """Cuenta propietaria de la presentación, o None si no es nuestra."""
+        shard, _ = self._locate(presentation_id)
+        return shard
+
+    def _locate(self, presentation_id: str) -> Tuple[Optional[AccountShard], bool]:
+        """
+        Busca la cuenta propietaria de la presentación.
+
+        Se busca primero en `accounts`; si no consta, se pregunta a Drive
+        quién es el propietario y se guarda para la próxima vez.
+
+        Returns:
+            (cuenta propietaria o None, True si ninguna cuenta ve el fichero)
+
+        Raises:
+            Exception: El último error si alguna consulta falló (5xx, 429,
+                timeout...) y ninguna otra encontró al propietario
+        """
+        if self._accounts is not None:
+            name = self._accounts.account(presentation_id)
+            if name in self._by_name:
+                return self._by_name[name], False
+            if name is not None:
+                logger.warning(
+                    f"La cuenta '{name}' de {presentation_id} ya no está configurada"
+                )
+
+        error: Optional[Exception] = None
+        for candidate in self.shards:
+            try:
+                email = candidate.generator.owner_email(presentation_id)
+            except Exception as e:
+                logger.debug(f"'{candidate.name}' falló con {presentation_id}: {e}")
+                error = e
+                continue
+            if email is None:
+                continue
+            # Todas las cuentas que lo ven reciben el mismo propietario
+            shard = self._by_name.get(email)
+            if shard is not None:
+                self._remember(presentation_id, shard)
+            return shard, False
+
+        # Solo es "no existe" si todas las cuentas respondieron 403/404
+        if error is not None:
+            raise error
+        return None, True
+
+    def _remember(self, presentation_id: str, shard: AccountShard) -> None:
+        if self._accounts is None:
+            return
+        try:
+            self._accounts.set_account(presentation_id, shard.name)
+        except Exception as e:
+            logger.warning(f"No se pudo guardar la cuenta de {presentation_id}: {e}")
@@ -6,13 +6,24 @@ Implementa PresentationGeneratorInterface del dominio.
 
 import json
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 from domain.entities.routine import Routine
 from domain.interfaces.presentation_generator import PresentationGeneratorInterface
+from infrastructure.google.copy_pool import TemplateCopyPool
+from infrastructure.google.request_planner import (
+    PRESENTATION_NAME,
+    SlidesPlan,
+    SlidesRequestPlanner,
+)
+from infrastructure.google.template_cache import TemplateMetadataCache
+from infrastructure.google.transport import GoogleTransport
+from infrastructure.persistence.sqlite_retention_store import SQLiteRetentionStore
+from infrastructure.persistence.sqlite_snapshot_store import SQLiteRoutineSnapshotStore
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +40,18 @@ class GoogleSlidesGenerator(PresentationGeneratorInterface):
     Implementa PresentationGeneratorInterface del dominio.
     """
 
-    def __init__(self, credentials_json: str, template_id: str, layout_id: str):
+    def __init__(
+        self,
+        credentials_json: str,
+        template_id: str,
+        layout_id: str,
+        template_cache_ttl: float = 300.0,
+        timeout: float = 30.0,
+        transport: Optional[GoogleTransport] = None,
+        snapshots: Optional[SQLiteRoutineSnapshotStore] = None,
+        planner: Optional[SlidesRequestPlanner] = None,
+        retention: Optional[SQLiteRetentionStore] = None,
+    ):
         """
         Inicializa el generador con credenciales.
 
@@ -37,7 +59,38 @@ class GoogleSlidesGenerator(PresentationGeneratorInterface):
             credentials_json: JSON string con las credenciales de service account
             template_id: ID de la plantilla de presentación
             layout_id: ID del layout para rutinas
+            template_cache_ttl: Segundos entre revalidaciones de la plantilla
+            timeout: Timeout por llamada a la API en segundos
+            transport: Transporte a usar (por defecto, uno por hilo con estas credenciales)
+            snapshots: Almacén de versiones para actualizaciones incrementales
+            planner: Estrategia de generación (por defecto, construir desde cero)
+            retention: Registro de presentaciones creadas (para borrarlas al caducar)
         """
+        self.transport = transport or GoogleTransport(
+            self._load_credentials(credentials_json), timeout=timeout
+        )
+        self.template_id = template_id
+        self.layout_id = layout_id
+        self.planner = planner or SlidesRequestPlanner(layout_id)
+        self.template_cache = TemplateMetadataCache(
+            slides_service=lambda: self.slides_service,
+            drive_service=lambda: self.drive_service,
+            template_id=template_id,
+            revalidate_interval=template_cache_ttl,
+        )
+        self.snapshots = snapshots
+        self.retention = retention
+        self.copy_pool: Optional[TemplateCopyPool] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="slides"
+        )
+        self._shared_ids: Set[str] = set()
+
+        logger.info("GoogleSlidesGenerator inicializado")
+
+    @staticmethod
+    def _load_credentials(credentials_json: str) -> Any:
+        """Construye las credenciales de service account desde el JSON."""
         # Manejar caracteres de escape en el JSON (común en vars de entorno)
         try:
             credentials_info = json.loads(credentials_json)
@@ -46,16 +99,48 @@ class GoogleSlidesGenerator(PresentationGeneratorInterface):
             fixed_json = credentials_json.replace("\\n", "\n")
             credentials_info = json.loads(fixed_json)
 
-        credentials = service_account.Credentials.from_service_account_info(
+        return service_account.Credentials.from_service_account_info(
             credentials_info, scopes=SCOPES
         )
 
-        self.slides_service = build("slides", "v1", credentials=credentials)
-        self.drive_service = build("drive", "v3", credentials=credentials)
-        self.template_id = template_id
-        self.layout_id = layout_id
+    @property
+    def slides_service(self) -> Any:
+        """Servicio de Slides (se construye la primera vez que se usa)."""
+        return self.transport.slides()
+
+    @property
+    def drive_service(self) -> Any:
+        """Servicio de Drive (se construye la primera vez que se usa)."""
+        return self.transport.drive()
+
+    def enable_copy_pool(
+        self, low_watermark: int, high_watermark: int, max_age: float
+    ) -> TemplateCopyPool:
+        """Activa el pool de copias pre-calentadas de la plantilla."""
+        self.copy_pool = TemplateCopyPool(
+            make_copy=lambda: self._copy_template(self.drive_service, share=True),
+            delete_copy=lambda pid: self._delete_copy(self.drive_service, pid),
+            revision=self._template_revision,
+            low_watermark=low_watermark,
+            high_watermark=high_watermark,
+            max_age=max_age,
+        )
+        return self.copy_pool
 
-        logger.info("GoogleSlidesGenerator inicializado")
+    def start(self) -> None:
+        """Arranca las tareas en segundo plano (pool de copias)."""
+        if self.copy_pool:
+            self.copy_pool.start()
+
+    def stop(self) -> None:
+        """Detiene las tareas en segundo plano y limpia las copias sin usar."""
+        if self.copy_pool:
+            self.copy_pool.stop(drain=True)
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del generador."""
+        return {"copy_pool": self.copy_pool.stats() if self.copy_pool else None}
 
     def create(self, routines: List[Routine]) -> str:
         """
@@ -67,278 +152,265 @@ class GoogleSlidesGenerator(PresentationGeneratorInterface):
         Returns:
             ID de la presentación creada
         """
-        # Copiar plantilla
-        copy = (
-            self.drive_service.files()
-            .copy(fileId=self.template_id, body={"name": "Rutina de Entrenamiento"})
-            .execute()
-        )
-        presentation_id = copy["id"]
-        logger.info(f"Presentación copiada: {presentation_id}")
+        num_existing = self.template_cache.get().slide_count
+        presentation_id = self._acquire_copy()
+        self._fill(presentation_id, routines, num_existing)
+        return presentation_id
 
-        # Obtener slides existentes
-        presentation = (
-            self.slides_service.presentations()
-            .get(presentationId=presentation_id)
-            .execute()
-        )
-        num_existing = len(presentation.get("slides", []))
-
-        # Generar requests
-        requests_content = []
-        requests_format = []
-
-        for i, routine in enumerate(routines):
-            slide_id = f"slide_{i + num_existing}"
-
-            # Crear slide
-            requests_content.append(
-                {
-                    "createSlide": {
-                        "objectId": slide_id,
-                        "insertionIndex": str(i + num_existing),
-                        "slideLayoutReference": {"layoutId": self.layout_id},
-                    }
-                }
-            )
+    def create_and_share(self, routines: List[Routine]) -> str:
+        """
+        Crea la presentación y aplica los permisos en paralelo al batchUpdate.
 
-            # Crear título
-            title_id = f"title_{i}"
-            requests_content.extend(
-                self._create_title(slide_id, title_id, routine.day_number)
-            )
-            requests_format.extend(self._format_title(title_id))
+        Los permisos solo necesitan el ID de la copia, así que se lanzan en
+        otro hilo justo después de copiar y se esperan junto al contenido.
+        """
+        num_existing = self.template_cache.get().slide_count
+        presentation_id = self._acquire_copy()
 
-            # Crear tabla
-            table_id = f"table_{i}"
-            requests_content.extend(self._create_table(slide_id, table_id, routine))
-            requests_format.extend(self._format_table(table_id, routine))
+        sharing = self._executor.submit(self.set_permissions, presentation_id)
+        try:
+            self._fill(presentation_id, routines, num_existing)
+        finally:
+            # Esperar siempre a los permisos para no dejar llamadas sueltas
+            sharing.result()
 
-        # Ejecutar requests
-        if requests_content:
-            self.slides_service.presentations().batchUpdate(
-                presentationId=presentation_id, body={"requests": requests_content}
-            ).execute()
-            logger.info("Contenido insertado")
+        return presentation_id
 
-        if requests_format:
-            self.slides_service.presentations().batchUpdate(
-                presentationId=presentation_id, body={"requests": requests_format}
-            ).execute()
-            logger.info("Formato aplicado")
+    def update(self, presentation_id: str, routines: List[Routine]) -> str:
+        """
+        Aplica a una presentación existente solo los cambios de la revisión.
+
+        Compara con la versión guardada y envía un único batchUpdate con
+        las slides, filas o celdas que cambiaron. Si no hay versión previa
+        guardada, genera una presentación nueva.
 
+        Args:
+            presentation_id: ID de la presentación a actualizar
+            routines: Rutinas revisadas
+
+        Returns:
+            ID de la presentación actualizada (o de la nueva)
+        """
+        snapshot = self.snapshots.get(presentation_id) if self.snapshots else None
+        if snapshot is None:
+            logger.info(f"Sin versión previa de {presentation_id}, se regenera")
+            return self.create_and_share(routines)
+
+        num_existing, previous = snapshot
+        requests = self.planner.diff(previous, routines, num_existing)
+        if requests:
+            self._batch_update(presentation_id, requests)
+            logger.info(
+                f"Presentación {presentation_id} actualizada ({len(requests)} requests)"
+            )
+        self.snapshots.put(presentation_id, num_existing, routines)
         return presentation_id
 
+    def plan(
+        self, routines: List[Routine], num_existing: Optional[int] = None
+    ) -> SlidesPlan:
+        """
+        Dry-run: devuelve las operaciones que haría `create` sin ejecutarlas.
+
+        Args:
+            routines: Lista de rutinas (una por día)
+            num_existing: Slides que tiene la plantilla (None = usar la caché)
+
+        Returns:
+            SlidesPlan con las operaciones y requests compilados
+        """
+        if num_existing is None:
+            num_existing = self.template_cache.get().slide_count
+        return self.planner.plan(routines, self.template_id, num_existing)
+
+    def warm_up(self) -> None:
+        """Carga los metadatos de la plantilla antes de la primera petición."""
+        self.template_cache.get()
+
     def set_permissions(self, presentation_id: str) -> None:
-        """Configura permisos públicos."""
-        self.drive_service.permissions().create(
-            fileId=presentation_id, body={"type": "anyone", "role": "writer"}
-        ).execute()
+        """Configura permisos públicos (las copias del pool ya los traen)."""
+        if presentation_id in self._shared_ids:
+            self._shared_ids.discard(presentation_id)
+            return
+        self._share(self.drive_service, presentation_id)
         logger.info("Permisos configurados")
 
-    # ─────────────────────────────────────────────────────────
-    # Métodos privados para construir slides
-    # ─────────────────────────────────────────────────────────
+    def get_url(self, presentation_id: str) -> str:
+        """URL de la presentación en Google Slides."""
+        return f"https://docs.google.com/presentation/d/{presentation_id}"
 
-    def _create_title(self, slide_id: str, title_id: str, day: int) -> List[dict]:
-        return [
-            {
-                "createShape": {
-                    "objectId": title_id,
-                    "shapeType": "TEXT_BOX",
-                    "elementProperties": {
-                        "pageObjectId": slide_id,
-                        "size": {
-                            "height": {"magnitude": 50, "unit": "PT"},
-                            "width": {"magnitude": 600, "unit": "PT"},
-                        },
-                        "transform": {
-                            "scaleX": 1,
-                            "scaleY": 1,
-                            "translateX": 50,
-                            "translateY": 10,
-                            "unit": "PT",
-                        },
-                    },
-                }
-            },
-            {"insertText": {"objectId": title_id, "text": f"Día {day}"}},
-        ]
-
-    def _format_title(self, title_id: str) -> List[dict]:
-        return [
-            {
-                "updateTextStyle": {
-                    "objectId": title_id,
-                    "style": {
-                        "bold": True,
-                        "fontSize": {"magnitude": 24, "unit": "PT"},
-                        "foregroundColor": {
-                            "opaqueColor": {
-                                "rgbColor": {"red": 1, "green": 1, "blue": 1}
-                            }
-                        },
-                    },
-                    "fields": "bold,fontSize,foregroundColor",
-                }
-            },
-            {
-                "updateShapeProperties": {
-                    "objectId": title_id,
-                    "shapeProperties": {
-                        "shapeBackgroundFill": {
-                            "solidFill": {
-                                "color": {
-                                    "rgbColor": {"red": 0.0, "green": 0.2, "blue": 0.8}
-                                }
-                            }
-                        }
-                    },
-                    "fields": "shapeBackgroundFill.solidFill.color",
-                }
-            },
-        ]
-
-    def _create_table(
-        self, slide_id: str, table_id: str, routine: Routine
-    ) -> List[dict]:
-        num_rows = len(routine.exercises) + 1
-        requests = [
-            {
-                "createTable": {
-                    "objectId": table_id,
-                    "rows": num_rows,
-                    "columns": 3,
-                    "elementProperties": {
-                        "pageObjectId": slide_id,
-                        "size": {
-                            "height": {"magnitude": 250, "unit": "PT"},
-                            "width": {"magnitude": 600, "unit": "PT"},
-                        },
-                        "transform": {
-                            "scaleX": 1,
-                            "scaleY": 1,
-                            "translateX": 50,
-                            "translateY": 80,
-                            "unit": "PT",
-                        },
-                    },
-                }
-            }
-        ]
-
-        # Encabezados
-        headers = ["Ejercicio", "Series", "Repeticiones"]
-        for col, text in enumerate(headers):
-            requests.append(
-                {
-                    "insertText": {
-                        "objectId": table_id,
-                        "cellLocation": {"rowIndex": 0, "columnIndex": col},
-                        "text": text,
-                    }
-                }
+    def exists(self, presentation_id: str) -> bool:
+        """Comprueba en Drive que el fichero existe y no está en la papelera."""
+        try:
+            info = (
+                self.drive_service.files()
+                .get(fileId=presentation_id, fields="id,trashed")
+                .execute()
             )
+        except HttpError as e:
+            if e.resp.status == 404:
+                return False
+            raise
+        return not info.get("trashed", False)
 
-        # Datos
-        for row, ex in enumerate(routine.exercises, start=1):
-            requests.append(
-                {
-                    "insertText": {
-                        "objectId": table_id,
-                        "cellLocation": {"rowIndex": row, "columnIndex": 0},
-                        "text": ex.name,
-                    }
-                }
-            )
-            requests.append(
-                {
-                    "insertText": {
-                        "objectId": table_id,
-                        "cellLocation": {"rowIndex": row, "columnIndex": 1},
-                        "text": ex.sets,
-                    }
-                }
+    def owner_email(self, presentation_id: str) -> Optional[str]:
+        """
+        Email del propietario del fichero en Drive.
+
+        Returns:
+            El email, o None si esta cuenta no ve el fichero o está en la
+            papelera
+        """
+        try:
+            info = (
+                self.drive_service.files()
+                .get(fileId=presentation_id, fields="owners(emailAddress),trashed")
+                .execute()
             )
-            requests.append(
-                {
-                    "insertText": {
-                        "objectId": table_id,
-                        "cellLocation": {"rowIndex": row, "columnIndex": 2},
-                        "text": ", ".join(ex.reps),
-                    }
-                }
+        except HttpError as e:
+            if e.resp.status in (403, 404):
+                return None
+            raise
+        if info.get("trashed", False):
+            return None
+        owners = info.get("owners") or [{}]
+        return owners[0].get("emailAddress")
+
+    def delete_many(self, presentation_ids: List[str]) -> Tuple[List[str], int]:
+        """
+        Borra varias presentaciones con peticiones batch de Drive.
+
+        Primero se consulta el espacio que ocupa cada fichero y después se
+        borran, en dos round trips para todo el lote.
+
+        Args:
+            presentation_ids: IDs a borrar (como mucho 100 por lote)
+
+        Returns:
+            (IDs borrados o que ya no existían, bytes liberados)
+        """
+        drive = self.drive_service
+        sizes: Dict[str, int] = {}
+        deleted: List[str] = []
+
+        def on_get(request_id: str, response: Any, exception: Any) -> None:
+            if exception is None:
+                sizes[request_id] = int(response.get("quotaBytesUsed", 0))
+
+        def on_delete(request_id: str, response: Any, exception: Any) -> None:
+            if exception is None or (
+                isinstance(exception, HttpError) and exception.resp.status == 404
+            ):
+                deleted.append(request_id)
+            else:
+                logger.warning(f"No se pudo borrar {request_id}: {exception}")
+
+        batch = drive.new_batch_http_request(callback=on_get)
+        for presentation_id in presentation_ids:
+            batch.add(
+                drive.files().get(fileId=presentation_id, fields="quotaBytesUsed"),
+                request_id=presentation_id,
             )
+        batch.execute()
 
-        return requests
-
-    def _format_table(self, table_id: str, routine: Routine) -> List[dict]:
-        requests = []
-
-        # Estilo encabezados (blanco + bold)
-        for col in range(3):
-            requests.append(
-                {
-                    "updateTextStyle": {
-                        "objectId": table_id,
-                        "cellLocation": {"rowIndex": 0, "columnIndex": col},
-                        "style": {
-                            "bold": True,
-                            "foregroundColor": {
-                                "opaqueColor": {
-                                    "rgbColor": {"red": 1, "green": 1, "blue": 1}
-                                }
-                            },
-                        },
-                        "fields": "bold,foregroundColor",
-                    }
-                }
+        batch = drive.new_batch_http_request(callback=on_delete)
+        for presentation_id in presentation_ids:
+            batch.add(
+                drive.files().delete(fileId=presentation_id),
+                request_id=presentation_id,
             )
+        batch.execute()
+
+        return deleted, sum(sizes.get(pid, 0) for pid in deleted)
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados de generación
+    # ─────────────────────────────────────────────────────────
+
+    def _acquire_copy(self) -> str:
+        """Toma una copia del pool o copia la plantilla en línea."""
+        presentation_id = self.copy_pool.acquire() if self.copy_pool else None
+        if presentation_id:
+            logger.info(f"Presentación tomada del pool: {presentation_id}")
+        else:
+            presentation_id = self._copy_template(self.drive_service)
+            logger.info(f"Presentación copiada: {presentation_id}")
+        return presentation_id
+
+    def _fill(
+        self, presentation_id: str, routines: List[Routine], num_existing: int
+    ) -> None:
+        """Inserta contenido y formato (en uno o varios batchUpdate)."""
+        requests = self.planner.compile(routines, num_existing)
+        if requests:
+            self._batch_update(presentation_id, requests)
+            logger.info(f"Contenido y formato aplicados ({len(requests)} requests)")
+        if self.snapshots:
+            self.snapshots.put(presentation_id, num_existing, routines)
+
+    def _batch_update(self, presentation_id: str, requests: List[dict]) -> None:
+        """Envía los requests en lotes consecutivos dentro de los límites de la API."""
+        for batch in self.planner.chunk(requests):
+            self.slides_service.presentations().batchUpdate(
+                presentationId=presentation_id,
+                body={"requests": batch},
+                fields="presentationId",
+            ).execute()
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados de Drive
+    # ─────────────────────────────────────────────────────────
+
+    def _copy_template(self, drive_service: Any, share: bool = False) -> str:
+        """
+        Copia la plantilla y devuelve el ID de la copia.
 
-        # Estilo datos (blanco + fondo alternado)
-        for row in range(1, len(routine.exercises) + 1):
-            bg_color = (
-                {"red": 0.2, "green": 0.2, "blue": 0.2}
-                if row % 2 == 0
-                else {"red": 0.27, "green": 0.27, "blue": 0.27}
+        La copia se registra para retención nada más crearse (también las
+        del pool, que así no se pierden si el proceso muere). Si fallan
+        los permisos, la copia se borra antes de propagar el error.
+        """
+        copy = (
+            drive_service.files()
+            .copy(
+                fileId=self.template_id,
+                body={"name": PRESENTATION_NAME},
+                fields="id",
             )
+            .execute()
+        )
+        presentation_id = copy["id"]
+        if self.retention:
+            self.retention.record(presentation_id)
+        if share:
+            try:
+                self._share(drive_service, presentation_id)
+            except Exception:
+                self._discard_copy(drive_service, presentation_id)
+                raise
+            self._shared_ids.add(presentation_id)
+        return presentation_id
+
+    def _delete_copy(self, drive_service: Any, presentation_id: str) -> None:
+        drive_service.files().delete(fileId=presentation_id).execute()
+        self._shared_ids.discard(presentation_id)
+        if self.retention:
+            self.retention.remove([presentation_id])
+
+    def _discard_copy(self, drive_service: Any, presentation_id: str) -> None:
+        """Borra una copia que no se va a usar (si falla, queda en retención)."""
+        try:
+            self._delete_copy(drive_service, presentation_id)
+        except Exception as e:
+            logger.warning(f"No se pudo borrar la copia fallida {presentation_id}: {e}")
+
+    def _share(self, drive_service: Any, presentation_id: str) -> None:
+        drive_service.permissions().create(
+            fileId=presentation_id,
+            body={"type": "anyone", "role": "writer"},
+            fields="id",
+        ).execute()
 
-            for col in range(3):
-                # Texto blanco
-                requests.append(
-                    {
-                        "updateTextStyle": {
-                            "objectId": table_id,
-                            "cellLocation": {"rowIndex": row, "columnIndex": col},
-                            "style": {
-                                "foregroundColor": {
-                                    "opaqueColor": {
-                                        "rgbColor": {"red": 1, "green": 1, "blue": 1}
-                                    }
-                                }
-                            },
-                            "fields": "foregroundColor",
-                        }
-                    }
-                )
-                # Fondo
-                requests.append(
-                    {
-                        "updateTableCellProperties": {
-                            "objectId": table_id,
-                            "tableRange": {
-                                "location": {"rowIndex": row, "columnIndex": col},
-                                "rowSpan": 1,
-                                "columnSpan": 1,
-                            },
-                            "tableCellProperties": {
-                                "tableCellBackgroundFill": {
-                                    "solidFill": {"color": {"rgbColor": bg_color}}
-                                }
-                            },
-                            "fields": "tableCellBackgroundFill.solidFill.color",
-                        }
-                    }
-                )
-
-        return requests
+    def _template_revision(self) -> str:
+        """Revisión de la plantilla en caché (sin llamar a la API)."""
+        metadata = self.template_cache.current()
+        return metadata.revision if metadata else ""
@@ -0,0 +1,151 @@
+"""
+Caché de metadatos de la plantilla de Google Slides.
+
+Todas las copias de una plantilla tienen las mismas slides, layouts y
+placeholders, así que no hace falta pedir `presentations().get` por cada
+copia: se lee una vez y se revalida contra la revisión del fichero en Drive.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Máscaras de campos: solo lo que se usa, no la presentación entera
+PRESENTATION_FIELDS = (
+    "slides(objectId),"
+    "layouts(objectId,layoutProperties(name),pageElements(objectId,shape(placeholder)))"
+)
+REVISION_FIELDS = "version,modifiedTime"
+
+
+@dataclass(frozen=True)
+class TemplateMetadata:
+    """
+    Metadatos de una plantilla.
+
+    Attributes:
+        template_id: ID de la presentación plantilla
+        revision: Versión del fichero en Drive cuando se leyó
+        slide_ids: IDs de las slides de la plantilla, en orden
+        layout_ids: Nombre del layout -> ID del layout
+        placeholder_ids: ID del layout -> IDs de sus placeholders
+    """
+
+    template_id: str
+    revision: str
+    slide_ids: Tuple[str, ...] = ()
+    layout_ids: Dict[str, str] = field(default_factory=dict)
+    placeholder_ids: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    @property
+    def slide_count(self) -> int:
+        return len(self.slide_ids)
+
+
+class TemplateMetadataCache:
+    """
+    Caché de TemplateMetadata con revalidación periódica.
+
+    Cada `revalidate_interval` segundos se compara la versión del fichero
+    en Drive (una llamada pequeña con field mask); solo si cambió se vuelve
+    a leer la presentación.
+    """
+
+    def __init__(
+        self,
+        slides_service: Callable[[], Any],
+        drive_service: Callable[[], Any],
+        template_id: str,
+        revalidate_interval: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            slides_service: Devuelve el servicio de Slides a usar
+            drive_service: Devuelve el servicio de Drive a usar
+            template_id: ID de la plantilla
+            revalidate_interval: Segundos entre revalidaciones
+            clock: Reloj monotónico (inyectable para tests)
+        """
+        self._slides = slides_service
+        self._drive = drive_service
+        self.template_id = template_id
+        self.revalidate_interval = revalidate_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._metadata: Optional[TemplateMetadata] = None
+        self._checked_at = 0.0
+
+    def get(self) -> TemplateMetadata:
+        """Devuelve los metadatos, cargándolos o revalidándolos si toca."""
+        with self._lock:
+            now = self._clock()
+            if self._metadata is None:
+                self._metadata = self._load(self._revision())
+                self._checked_at = now
+            elif now - self._checked_at >= self.revalidate_interval:
+                revision = self._revision()
+                if revision != self._metadata.revision:
+                    logger.info("Plantilla modificada, recargando metadatos")
+                    self._metadata = self._load(revision)
+                self._checked_at = now
+            return self._metadata
+
+    def current(self) -> Optional[TemplateMetadata]:
+        """Devuelve los metadatos en caché sin llamar a la API."""
+        return self._metadata
+
+    def invalidate(self) -> None:
+        """Fuerza una recarga completa en el próximo `get`."""
+        with self._lock:
+            self._metadata = None
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _revision(self) -> str:
+        info = (
+            self._drive()
+            .files()
+            .get(fileId=self.template_id, fields=REVISION_FIELDS)
+            .execute()
+        )
+        return f"{info.get('version', '')}:{info.get('modifiedTime', '')}"
+
+    def _load(self, revision: str) -> TemplateMetadata:
+        presentation = (
+            self._slides()
+            .presentations()
+            .get(presentationId=self.template_id, fields=PRESENTATION_FIELDS)
+            .execute()
+        )
+
+        layout_ids = {}
+        placeholder_ids = {}
+        for layout in presentation.get("layouts", []):
+            layout_id = layout["objectId"]
+            name = layout.get("layoutProperties", {}).get("name", layout_id)
+            layout_ids[name] = layout_id
+            placeholder_ids[layout_id] = tuple(
+                element["objectId"]
+                for element in layout.get("pageElements", [])
+                if "placeholder" in element.get("shape", {})
+            )
+
+        metadata = TemplateMetadata(
+            template_id=self.template_id,
+            revision=revision,
+            slide_ids=tuple(s["objectId"] for s in presentation.get("slides", [])),
+            layout_ids=layout_ids,
+            placeholder_ids=placeholder_ids,
+        )
+        logger.info(
+            f"Metadatos de plantilla cargados: {metadata.slide_count} slides, "
+            f"{len(layout_ids)} layouts"
+        )
+        return metadata
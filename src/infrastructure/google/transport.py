@@ -0,0 +1,159 @@
+"""
+Transporte HTTP para las APIs de Google.
+
+httplib2 no es seguro entre hilos, así que cada hilo obtiene su propio
+cliente (con su propia conexión keep-alive) sobre unas credenciales
+compartidas que se refrescan solas. Los objetos de servicio, en cambio,
+se construyen una sola vez por proceso a partir de los documentos de
+discovery que trae googleapiclient, sin I/O de red.
+"""
+
+import json
+import logging
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+import google_auth_httplib2
+import httplib2
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def discovery_document(api: str, version: str) -> Dict[str, Any]:
+    """
+    Devuelve el documento de discovery empaquetado, parseado una vez por proceso.
+
+    Raises:
+        ValueError: Si googleapiclient no trae el documento de esa API
+    """
+    content = get_static_doc(api, version)
+    if content is None:
+        raise ValueError(f"No hay documento de discovery para {api} {version}")
+    return json.loads(content)
+
+
+class GoogleTransport:
+    """
+    Proveedor de servicios de Google.
+
+    - Un único objeto de servicio por API, construido la primera vez que
+      se pide desde el documento de discovery empaquetado.
+    - Las llamadas salen por el `httplib2.Http` del hilo actual (con timeout
+      y keep-alive), creado también bajo demanda.
+    - Las credenciales se comparten y su refresco se serializa con un lock.
+    - `http_factory` y `endpoints` permiten apuntar a un servidor falso
+      en tests.
+    """
+
+    def __init__(
+        self,
+        credentials: Any,
+        timeout: float = 30.0,
+        http_factory: Optional[Callable[[], httplib2.Http]] = None,
+        endpoints: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            credentials: Credenciales de google-auth (compartidas entre hilos)
+            timeout: Timeout por llamada en segundos
+            http_factory: Crea el cliente HTTP de cada hilo
+            endpoints: API -> URL base alternativa (ej: {"slides": "http://localhost:9000/"})
+        """
+        self.credentials = credentials
+        self.timeout = timeout
+        self._http_factory = http_factory or (lambda: httplib2.Http(timeout=timeout))
+        self._endpoints = endpoints or {}
+        self._local = threading.local()
+        self._refresh_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._services: Dict[str, Any] = {}
+        self._http = _ThreadLocalHttp(self)
+
+    def slides(self) -> Any:
+        """Servicio de Slides v1 (compartido entre hilos)."""
+        return self._service("slides", "v1")
+
+    def drive(self) -> Any:
+        """Servicio de Drive v3 (compartido entre hilos)."""
+        return self._service("drive", "v3")
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _service(self, api: str, version: str) -> Any:
+        key = f"{api}:{version}"
+        service = self._services.get(key)
+        if service is None:
+            with self._build_lock:
+                service = self._services.get(key)
+                if service is None:
+                    service = self._services[key] = self._build(api, version)
+        return service
+
+    def _build(self, api: str, version: str) -> Any:
+        client_options = None
+        if api in self._endpoints:
+            client_options = {"api_endpoint": self._endpoints[api]}
+
+        logger.debug(f"Construyendo servicio {api} {version}")
+        return build_from_document(
+            discovery_document(api, version),
+            http=self._http,
+            client_options=client_options,
+        )
+
+    def thread_http(self) -> httplib2.Http:
+        """Cliente HTTP autorizado del hilo actual."""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = _SharedCredentialsHttp(
+                self, http=self._http_factory()
+            )
+        return http
+
+    def ensure_fresh_credentials(self, http: httplib2.Http) -> None:
+        """Refresca las credenciales compartidas una sola vez si caducaron."""
+        if self.credentials.valid:
+            return
+        with self._refresh_lock:
+            if not self.credentials.valid:
+                self.credentials.refresh(google_auth_httplib2.Request(http))
+
+
+class _SharedCredentialsHttp(google_auth_httplib2.AuthorizedHttp):
+    """AuthorizedHttp que refresca las credenciales bajo el lock del transporte."""
+
+    def __init__(self, transport: GoogleTransport, http: httplib2.Http):
+        super().__init__(transport.credentials, http=http)
+        self._transport = transport
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        self._transport.ensure_fresh_credentials(self.http)
+        return super().request(uri, method, body=body, headers=headers, **kwargs)
+
+
+class _ThreadLocalHttp:
+    """
+    Http compartido por los objetos de servicio.
+
+    Delega cada petición en el cliente del hilo que la ejecuta, de modo que
+    un mismo servicio se puede usar desde varios hilos a la vez.
+    """
+
+    def __init__(self, transport: GoogleTransport):
+        self._transport = transport
+
+    @property
+    def credentials(self) -> Any:
+        return self._transport.credentials
+
+    def request(self, *args, **kwargs):
+        return self._transport.thread_http().request(*args, **kwargs)
+
+    def close(self) -> None:
+        self._transport.thread_http().close()
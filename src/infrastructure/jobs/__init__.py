@@ -0,0 +1,36 @@
+"""
+Cola de trabajos en segundo plano.
+
+This module provides:
+- JobQueueInterface: Interface de la cola persistente
+- SQLiteJobQueue: Cola en un fichero SQLite local
+- JobWorkerPool: Workers con reintentos y backoff
+- FairScheduler: Prioridad por clase y reparto justo entre clientes
+"""
+
+from .interface import (
+    JOB_GENERATE_PRESENTATION,
+    JOB_UPDATE_PRESENTATION,
+    LANE_BULK,
+    LANE_INTERACTIVE,
+    Job,
+    JobQueueInterface,
+    JobStatus,
+)
+from .scheduler import FairScheduler, LanePolicy
+from .sqlite_queue import SQLiteJobQueue
+from .worker_pool import JobWorkerPool
+
+__all__ = [
+    "JOB_GENERATE_PRESENTATION",
+    "JOB_UPDATE_PRESENTATION",
+    "LANE_BULK",
+    "LANE_INTERACTIVE",
+    "Job",
+    "JobQueueInterface",
+    "JobStatus",
+    "SQLiteJobQueue",
+    "JobWorkerPool",
+    "FairScheduler",
+    "LanePolicy",
+]
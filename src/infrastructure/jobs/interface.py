@@ -0,0 +1,165 @@
+"""
+Interface de la cola de trabajos.
+
+Define el contrato de la cola persistente en la que se encolan las
+tareas lentas (como generar una presentación) para ejecutarlas fuera
+de la petición HTTP.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Optional
+
+# Tipos de trabajo
+JOB_GENERATE_PRESENTATION = "generate_presentation"
+JOB_UPDATE_PRESENTATION = "update_presentation"
+
+# Clases de prioridad (lanes): usuarios esperando frente a importaciones
+LANE_INTERACTIVE = "interactive"
+LANE_BULK = "bulk"
+
+
+class JobStatus(str, Enum):
+    """Estado de un trabajo."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """
+    Un trabajo de la cola.
+
+    Attributes:
+        id: ID del trabajo
+        kind: Tipo de trabajo (ej: "generate_presentation")
+        payload: Datos de entrada (serializables a JSON)
+        status: Estado actual
+        attempts: Intentos ya iniciados
+        result: Resultado si terminó bien
+        error: Último error si falló algún intento
+        run_at: Momento (epoch) a partir del cual se puede ejecutar
+        lane: Clase de prioridad (LANE_INTERACTIVE o LANE_BULK)
+        tenant: Cliente que lo encoló (ej: "chat:123"), para el reparto justo
+    """
+
+    id: str
+    kind: str
+    payload: Dict[str, Any]
+    lane: str = LANE_BULK
+    tenant: str = ""
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    run_at: float = 0.0
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class JobQueueInterface(ABC):
+    """Interface para colas de trabajos persistentes."""
+
+    @abstractmethod
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        lane: str = LANE_BULK,
+        tenant: str = "",
+    ) -> Job:
+        """Encola un trabajo nuevo y lo devuelve."""
+        pass
+
+    @abstractmethod
+    def claim(
+        self, lane: Optional[str] = None, tenant: Optional[str] = None
+    ) -> Optional[Job]:
+        """
+        Toma el siguiente trabajo listo y lo marca como en ejecución.
+
+        Args:
+            lane: Solo trabajos de esta clase (None = cualquiera)
+            tenant: Solo trabajos de este cliente (None = cualquiera)
+
+        Returns:
+            El trabajo (con `attempts` ya incrementado), o None si no hay
+        """
+        pass
+
+    @abstractmethod
+    def ready_tenants(self, lane: str) -> Dict[str, int]:
+        """Clientes con trabajos listos en una clase y cuántos tiene cada uno."""
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Marca un trabajo como terminado con éxito."""
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: str, error: str, retry_at: Optional[float] = None) -> None:
+        """
+        Registra un intento fallido.
+
+        Args:
+            job_id: ID del trabajo
+            error: Descripción del error
+            retry_at: Momento del reintento (None = fallo definitivo)
+        """
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """Devuelve un trabajo por ID, o None si no existe."""
+        pass
+
+    @abstractmethod
+    def recover(self) -> int:
+        """
+        Devuelve a la cola los trabajos que quedaron en ejecución (ej: tras
+        una caída del proceso). Con varios procesos, solo los que su
+        dueño dejó de renovar.
+
+        Returns:
+            Número de trabajos recuperados
+        """
+        pass
+
+    def renew(self) -> int:
+        """
+        Prolonga el lease de los trabajos que este proceso está ejecutando.
+
+        Por defecto no hace nada (colas sin leases).
+
+        Returns:
+            Número de trabajos renovados
+        """
+        return 0
+
+    def purge(self, max_age: float) -> int:
+        """
+        Borra los trabajos terminados hace más de `max_age` segundos.
+
+        Por defecto no borra nada.
+        """
+        return 0
+
+    def stats(self) -> Dict[str, int]:
+        """Número de trabajos por estado (por defecto, vacío)."""
+        return {}
+
+    def lane_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Profundidad de cada clase: trabajos en cola, en ejecución y espera
+        del más antiguo listo (por defecto, vacío).
+        """
+        return {}
@@ -0,0 +1,153 @@
+"""
+Planificador justo para la cola de trabajos.
+
+Decide qué trabajo toma cada worker cuando compiten usuarios interactivos
+(Telegram) e importaciones masivas (API) por la misma capacidad de
+Gemini y Google Slides:
+
+- Clases de prioridad (lanes) en orden estricto, cada una con su límite
+  de trabajos simultáneos: una importación no puede ocupar todos los
+  workers y un usuario nunca espera detrás de ella.
+- Dentro de cada clase, weighted fair queuing por cliente: quien encola
+  500 rutinas avanza a la misma velocidad que quien encola una.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from infrastructure.jobs.interface import (
+    LANE_BULK,
+    LANE_INTERACTIVE,
+    Job,
+    JobQueueInterface,
+)
+
+
+@dataclass
+class LanePolicy:
+    """
+    Configuración de una clase de prioridad.
+
+    Attributes:
+        name: Nombre de la clase (ej: LANE_INTERACTIVE)
+        max_concurrency: Trabajos de esta clase en ejecución a la vez
+    """
+
+    name: str
+    max_concurrency: int
+    in_flight: int = 0
+    dispatched: int = 0
+
+
+class FairScheduler:
+    """
+    Reparto de los workers entre clases y clientes.
+
+    El reparto por cliente es start-time fair queuing: cada cliente tiene
+    una marca virtual que avanza `1 / peso` con cada trabajo que se le
+    sirve, y se elige siempre el cliente listo con la marca más baja. Un
+    cliente que llega nuevo empieza en el reloj virtual actual, así que
+    no acumula crédito mientras está inactivo.
+    """
+
+    def __init__(
+        self,
+        lanes: List[LanePolicy],
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Args:
+            lanes: Clases de prioridad, de mayor a menor
+            weights: Peso por cliente (por defecto 1)
+        """
+        if not lanes:
+            raise ValueError("FairScheduler necesita al menos una clase")
+
+        self.lanes = lanes
+        self.weights = weights or {}
+        self._lock = threading.Lock()
+        self._virtual: Dict[str, float] = {lane.name: 0.0 for lane in lanes}
+        self._finish: Dict[str, Dict[str, float]] = {lane.name: {} for lane in lanes}
+
+    @classmethod
+    def default(
+        cls,
+        interactive: int,
+        bulk: int,
+        weights: Optional[Dict[str, float]] = None,
+    ) -> "FairScheduler":
+        """Planificador con las clases interactiva y masiva."""
+        return cls(
+            [LanePolicy(LANE_INTERACTIVE, interactive), LanePolicy(LANE_BULK, bulk)],
+            weights,
+        )
+
+    def next(self, queue: JobQueueInterface) -> Optional[Job]:
+        """
+        Toma de la cola el siguiente trabajo que corresponde ejecutar.
+
+        Returns:
+            El trabajo ya marcado como en ejecución, o None si no hay nada
+            listo en las clases con hueco
+        """
+        with self._lock:
+            for lane in self.lanes:
+                if lane.in_flight >= lane.max_concurrency:
+                    continue
+                tenants = queue.ready_tenants(lane.name)
+                # Los clientes se prueban por orden de marca: si otro worker se
+                # adelantó con el trabajo de uno, se pasa al siguiente
+                for tenant in self._order(lane.name, tenants):
+                    job = queue.claim(lane.name, tenant)
+                    if job is None:
+                        continue
+                    self._charge(lane.name, tenant)
+                    lane.in_flight += 1
+                    lane.dispatched += 1
+                    return job
+        return None
+
+    def release(self, job: Job) -> None:
+        """Libera el hueco de su clase cuando un trabajo termina."""
+        with self._lock:
+            for lane in self.lanes:
+                if lane.name == job.lane:
+                    lane.in_flight = max(0, lane.in_flight - 1)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Ocupación de cada clase."""
+        with self._lock:
+            return {
+                lane.name: {
+                    "in_flight": lane.in_flight,
+                    "max_concurrency": lane.max_concurrency,
+                    "dispatched": lane.dispatched,
+                    "tenants": len(self._finish[lane.name]),
+                }
+                for lane in self.lanes
+            }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados (requieren el lock)
+    # ─────────────────────────────────────────────────────────
+
+    def _order(self, lane: str, tenants: Dict[str, int]) -> List[str]:
+        """Clientes listos ordenados por su marca de inicio."""
+        virtual = self._virtual[lane]
+        finish = self._finish[lane]
+
+        # Los clientes sin trabajos cuya marca ya alcanzó el reloj no aportan
+        # nada: olvidarlos mantiene el estado acotado
+        for tenant in [t for t, f in finish.items() if t not in tenants]:
+            if finish[tenant] <= virtual:
+                del finish[tenant]
+
+        return sorted(tenants, key=lambda t: (max(virtual, finish.get(t, 0.0)), t))
+
+    def _charge(self, lane: str, tenant: str) -> None:
+        """Avanza la marca del cliente servido y el reloj virtual de la clase."""
+        finish = self._finish[lane]
+        start = max(self._virtual[lane], finish.get(tenant, 0.0))
+        self._virtual[lane] = start
+        finish[tenant] = start + 1.0 / self.weights.get(tenant, 1.0)
@@ -0,0 +1,321 @@
+"""
+Cola de trabajos en SQLite.
+
+Implementa JobQueueInterface con un fichero local: los trabajos
+sobreviven a reinicios y un trabajo que estaba en ejecución cuando su
+proceso cayó vuelve a la cola al caducar su lease. Varios procesos
+pueden compartir el fichero.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from infrastructure.jobs.interface import (
+    LANE_BULK,
+    Job,
+    JobQueueInterface,
+    JobStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    "id, kind, payload, lane, tenant, status, attempts, result, error, run_at, "
+    "created_at, updated_at"
+)
+
+
+class SQLiteJobQueue(JobQueueInterface):
+    """Cola de trabajos persistente en SQLite (modo WAL)."""
+
+    def __init__(
+        self,
+        path: str,
+        clock: Callable[[], float] = time.time,
+        lease: float = 300.0,
+        owner: Optional[str] = None,
+    ):
+        """
+        Args:
+            path: Ruta del fichero SQLite
+            clock: Reloj de pared (inyectable para tests)
+            lease: Segundos que un trabajo tomado es de este proceso sin
+                renovar; al caducar, vuelve a la cola
+            owner: Identificador de este proceso (por defecto, aleatorio)
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.lease = lease
+        self.owner = owner or uuid.uuid4().hex
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                lane TEXT NOT NULL DEFAULT 'bulk',
+                tenant TEXT NOT NULL DEFAULT '',
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                run_at REAL NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                owner TEXT,
+                lease_until REAL
+            )
+            """
+        )
+        self._migrate()
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_lane "
+            "ON jobs (status, lane, tenant, run_at)"
+        )
+        self._conn.commit()
+        logger.info(f"Cola de trabajos en {path}")
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        lane: str = LANE_BULK,
+        tenant: str = "",
+    ) -> Job:
+        now = self._clock()
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            payload=payload,
+            lane=lane,
+            tenant=tenant,
+            run_at=now,
+            created_at=now,
+            updated_at=now,
+        )
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO jobs ({_COLUMNS}) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0, NULL, NULL, ?, ?, ?)",
+                (
+                    job.id,
+                    kind,
+                    json.dumps(payload, ensure_ascii=False),
+                    lane,
+                    tenant,
+                    job.status.value,
+                    now,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+        return job
+
+    def claim(
+        self, lane: Optional[str] = None, tenant: Optional[str] = None
+    ) -> Optional[Job]:
+        now = self._clock()
+        query = "SELECT id FROM jobs WHERE status = ? AND run_at <= ?"
+        params: List[Any] = [JobStatus.QUEUED.value, now]
+        if lane is not None:
+            query += " AND lane = ?"
+            params.append(lane)
+        if tenant is not None:
+            query += " AND tenant = ?"
+            params.append(tenant)
+
+        with self._lock:
+            row = self._conn.execute(
+                f"{query} ORDER BY run_at LIMIT 1", params
+            ).fetchone()
+            if not row:
+                return None
+
+            # La condición sobre el estado evita que dos procesos tomen el mismo
+            claimed = self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ?, "
+                "owner = ?, lease_until = ? WHERE id = ? AND status = ?",
+                (
+                    JobStatus.RUNNING.value,
+                    now,
+                    self.owner,
+                    now + self.lease,
+                    row[0],
+                    JobStatus.QUEUED.value,
+                ),
+            ).rowcount
+            self._conn.commit()
+            if not claimed:
+                return None
+            return self._get(row[0])
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, updated_at = ?, "
+                "lease_until = NULL WHERE id = ? AND owner = ? AND status = ?",
+                (
+                    JobStatus.SUCCEEDED.value,
+                    json.dumps(result, ensure_ascii=False),
+                    self._clock(),
+                    job_id,
+                    self.owner,
+                    JobStatus.RUNNING.value,
+                ),
+            ).rowcount
+            self._conn.commit()
+        if not updated:
+            logger.warning(f"Trabajo {job_id} ya no era de este proceso (lease)")
+
+    def fail(self, job_id: str, error: str, retry_at: Optional[float] = None) -> None:
+        status = JobStatus.QUEUED if retry_at is not None else JobStatus.FAILED
+        now = self._clock()
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, run_at = ?, updated_at = ?, "
+                "lease_until = NULL WHERE id = ? AND owner = ? AND status = ?",
+                (
+                    status.value,
+                    error,
+                    retry_at or now,
+                    now,
+                    job_id,
+                    self.owner,
+                    JobStatus.RUNNING.value,
+                ),
+            ).rowcount
+            self._conn.commit()
+        if not updated:
+            logger.warning(f"Trabajo {job_id} ya no era de este proceso (lease)")
+
+    def ready_tenants(self, lane: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT tenant, COUNT(*) FROM jobs "
+                "WHERE status = ? AND lane = ? AND run_at <= ? GROUP BY tenant",
+                (JobStatus.QUEUED.value, lane, self._clock()),
+            ).fetchall()
+        return dict(rows)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._get(job_id)
+
+    def renew(self) -> int:
+        now = self._clock()
+        with self._lock:
+            renewed = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE status = ? AND owner = ?",
+                (now + self.lease, JobStatus.RUNNING.value, self.owner),
+            ).rowcount
+            self._conn.commit()
+        return renewed
+
+    def recover(self) -> int:
+        now = self._clock()
+        with self._lock:
+            # Solo los de leases caducados: otros procesos vivos los renuevan
+            recovered = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, owner = NULL, "
+                "lease_until = NULL "
+                "WHERE status = ? AND (lease_until IS NULL OR lease_until < ?)",
+                (JobStatus.QUEUED.value, now, JobStatus.RUNNING.value, now),
+            ).rowcount
+            self._conn.commit()
+        if recovered:
+            logger.info(f"{recovered} trabajos interrumpidos devueltos a la cola")
+        return recovered
+
+    def purge(self, max_age: float) -> int:
+        with self._lock:
+            purged = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (
+                    JobStatus.SUCCEEDED.value,
+                    JobStatus.FAILED.value,
+                    self._clock() - max_age,
+                ),
+            ).rowcount
+            self._conn.commit()
+        return purged
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update(dict(rows))
+        return counts
+
+    def lane_stats(self) -> Dict[str, Dict[str, float]]:
+        now = self._clock()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT lane, status, COUNT(*), MIN(run_at) FROM jobs "
+                "WHERE status IN (?, ?) GROUP BY lane, status",
+                (JobStatus.QUEUED.value, JobStatus.RUNNING.value),
+            ).fetchall()
+
+        lanes: Dict[str, Dict[str, float]] = {}
+        for lane, status, count, oldest in rows:
+            depth = lanes.setdefault(
+                lane, {"queued": 0, "running": 0, "oldest_wait_seconds": 0.0}
+            )
+            depth[status] = count
+            if status == JobStatus.QUEUED.value:
+                depth["oldest_wait_seconds"] = round(max(0.0, now - oldest), 3)
+        return lanes
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _migrate(self) -> None:
+        """Añade las columnas nuevas a colas creadas por versiones previas."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "lane" not in columns:
+            self._conn.execute(
+                "ALTER TABLE jobs ADD COLUMN lane TEXT NOT NULL DEFAULT 'bulk'"
+            )
+        if "tenant" not in columns:
+            self._conn.execute(
+                "ALTER TABLE jobs ADD COLUMN tenant TEXT NOT NULL DEFAULT ''"
+            )
+        if "owner" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        if "lease_until" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+
+    def _get(self, job_id: str) -> Optional[Job]:
+        """Lee un trabajo (requiere el lock)."""
+        row = self._conn.execute(
+            f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if not row:
+            return None
+        return Job(
+            id=row[0],
+            kind=row[1],
+            payload=json.loads(row[2]),
+            lane=row[3],
+            tenant=row[4],
+            status=JobStatus(row[5]),
+            attempts=row[6],
+            result=json.loads(row[7]) if row[7] else None,
+            error=row[8],
+            run_at=row[9],
+            created_at=row[10],
+            updated_at=row[11],
+        )
@@ -0,0 +1,263 @@
+"""
+Pool de workers para la cola de trabajos.
+
+Ejecuta en hilos propios los trabajos encolados, con reintentos y
+backoff exponencial, y avisa a los interesados cuando cada uno termina.
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from infrastructure.jobs.interface import LANE_BULK, Job, JobQueueInterface
+from infrastructure.jobs.scheduler import FairScheduler
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any]], Dict[str, Any]]
+JobListener = Callable[[Job], None]
+
+
+class JobWorkerPool:
+    """
+    Workers que consumen una JobQueueInterface.
+
+    - Cada tipo de trabajo tiene un handler: recibe el payload y devuelve
+      el resultado (serializable a JSON).
+    - Un intento fallido se reintenta tras `backoff_base * 2^(intento-1)`
+      segundos (con jitter y tope `backoff_max`) hasta `max_attempts`.
+    - Los listeners de un tipo se llaman cuando el trabajo termina, tanto
+      si acaba bien como si agota los reintentos.
+    - El FairScheduler decide qué trabajo toma cada worker (prioridad por
+      clase y reparto justo entre clientes).
+    - Un hilo aparte renueva cada `heartbeat` segundos el lease de los
+      trabajos en curso y recupera los que otros procesos abandonaron.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueueInterface,
+        workers: int = 2,
+        max_attempts: int = 3,
+        backoff_base: float = 2.0,
+        backoff_max: float = 60.0,
+        poll_interval: float = 1.0,
+        job_ttl: float = 24 * 3600,
+        scheduler: Optional[FairScheduler] = None,
+        heartbeat: float = 60.0,
+    ):
+        """
+        Args:
+            queue: Cola de trabajos
+            workers: Número de hilos
+            max_attempts: Intentos máximos por trabajo
+            backoff_base: Espera antes del primer reintento en segundos
+            backoff_max: Espera máxima entre reintentos en segundos
+            poll_interval: Segundos entre consultas cuando la cola está vacía
+            job_ttl: Segundos que se conservan los trabajos terminados
+            scheduler: Planificador (por defecto, ambas clases sin límite
+                propio más allá del número de workers)
+            heartbeat: Segundos entre renovaciones de leases (menor que el
+                lease de la cola)
+        """
+        self.queue = queue
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.job_ttl = job_ttl
+        self.heartbeat = heartbeat
+        self.scheduler = scheduler or FairScheduler.default(workers, workers)
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._listeners: Dict[str, List[JobListener]] = {}
+        self._wakeup = threading.Condition()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._purged_at = 0.0
+        self._lock = threading.Lock()
+
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Registra el handler de un tipo de trabajo."""
+        self._handlers[kind] = handler
+
+    def add_listener(self, kind: str, listener: JobListener) -> None:
+        """Registra una función a la que avisar cuando termine un trabajo."""
+        self._listeners.setdefault(kind, []).append(listener)
+
+    def submit(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        lane: str = LANE_BULK,
+        tenant: str = "",
+    ) -> Job:
+        """
+        Encola un trabajo y despierta a un worker.
+
+        Args:
+            kind: Tipo de trabajo
+            payload: Datos de entrada
+            lane: Clase de prioridad
+            tenant: Cliente que lo encola (chat o cliente de la API)
+
+        Raises:
+            ValueError: Si no hay handler para ese tipo de trabajo
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Tipo de trabajo desconocido: {kind}")
+        job = self.queue.enqueue(kind, payload, lane=lane, tenant=tenant)
+        with self._wakeup:
+            self._wakeup.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Devuelve el estado de un trabajo."""
+        return self.queue.get(job_id)
+
+    def start(self) -> None:
+        """Recupera trabajos interrumpidos y arranca los workers."""
+        if self._threads:
+            return
+        self._stopped.clear()
+        self.queue.recover()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"jobs-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(
+            target=self._keep_leases, name="jobs-heartbeat", daemon=True
+        )
+        thread.start()
+        self._threads.append(thread)
+        logger.info(f"Pool de trabajos iniciado con {self.workers} workers")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Detiene los workers.
+
+        Los trabajos en curso que no terminen a tiempo vuelven a la cola
+        cuando caduca su lease.
+        """
+        self._stopped.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de la cola, de cada clase y de los workers."""
+        lanes = self.scheduler.stats()
+        for name, depth in self.queue.lane_stats().items():
+            lanes.setdefault(name, {}).update(depth)
+        return {
+            "queue": self.queue.stats(),
+            "lanes": lanes,
+            "workers": self.workers,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "retried": self.retried,
+        }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                job = self.scheduler.next(self.queue)
+            except Exception as e:
+                logger.warning(f"Error leyendo la cola de trabajos: {e}")
+                job = None
+
+            if job is None:
+                self._purge()
+                with self._wakeup:
+                    self._wakeup.wait(timeout=self.poll_interval)
+                continue
+
+            try:
+                self._execute(job)
+            except Exception as e:
+                # Fallo al guardar el resultado (ej: "database is locked"): el
+                # worker sigue vivo y el trabajo vuelve a la cola cuando caduque
+                # su lease (recover)
+                logger.error(f"Error registrando el trabajo {job.id}: {e}")
+            finally:
+                self.scheduler.release(job)
+                # Hay hueco en la clase: otro worker puede tomar el siguiente
+                with self._wakeup:
+                    self._wakeup.notify()
+
+    def _keep_leases(self) -> None:
+        while not self._stopped.wait(self.heartbeat):
+            try:
+                self.queue.renew()
+                self.queue.recover()
+            except Exception as e:
+                logger.warning(f"Error renovando los trabajos en curso: {e}")
+
+    def _execute(self, job: Job) -> None:
+        handler = self._handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise ValueError(f"Tipo de trabajo desconocido: {job.kind}")
+            result = handler(job.payload)
+        except Exception as e:
+            self._on_error(job, e)
+            return
+
+        self.queue.complete(job.id, result)
+        with self._lock:
+            self.succeeded += 1
+        logger.info(f"Trabajo {job.id} ({job.kind}) completado")
+        self._notify(job.id)
+
+    def _on_error(self, job: Job, error: Exception) -> None:
+        if job.attempts < self.max_attempts:
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (job.attempts - 1))
+            delay *= random.uniform(0.5, 1.0)
+            self.queue.fail(job.id, str(error), retry_at=time.time() + delay)
+            with self._lock:
+                self.retried += 1
+            logger.warning(
+                f"Trabajo {job.id} falló (intento {job.attempts}), "
+                f"reintento en {delay:.1f}s: {error}"
+            )
+            return
+
+        self.queue.fail(job.id, str(error))
+        with self._lock:
+            self.failed += 1
+        logger.error(f"Trabajo {job.id} falló definitivamente: {error}")
+        self._notify(job.id)
+
+    def _notify(self, job_id: str) -> None:
+        job = self.queue.get(job_id)
+        if job is None:
+            return
+        for listener in self._listeners.get(job.kind, []):
+            try:
+                listener(job)
+            except Exception as e:
+                logger.warning(f"Error avisando del trabajo {job_id}: {e}")
+
+    def _purge(self) -> None:
+        """Borra los trabajos terminados antiguos (como mucho una vez por hora)."""
+        now = time.monotonic()
+        if now - self._purged_at < 3600:
+            return
+        self._purged_at = now
+        try:
+            self.queue.purge(self.job_ttl)
+        except Exception as e:
+            logger.warning(f"Error purgando trabajos antiguos: {e}")
@@ -0,0 +1 @@
+"""Almacenamiento local persistente (SQLite)."""
@@ -0,0 +1,92 @@
+"""
+Caché de presentaciones en SQLite.
+
+Implementa PresentationCacheInterface del dominio con un fichero local
+y expiración por TTL.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from domain.interfaces.presentation_cache import PresentationCacheInterface
+
+logger = logging.getLogger(__name__)
+
+
+class SQLitePresentationCache(PresentationCacheInterface):
+    """
+    Caché persistente hash de rutina -> presentación.
+
+    Las entradas caducan a los `ttl` segundos; las caducadas se ignoran al
+    leer y se purgan al escribir.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 7 * 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: Ruta del fichero SQLite
+            ttl: Segundos de vida de cada entrada
+            clock: Reloj de pared (inyectable para tests)
+        """
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS presentation_cache (
+                key TEXT PRIMARY KEY,
+                presentation_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        logger.info(f"Caché de presentaciones en {path}")
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT presentation_id, url FROM presentation_cache "
+                "WHERE key = ? AND expires_at > ?",
+                (key, self._clock()),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, key: str, presentation_id: str, url: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO presentation_cache VALUES (?, ?, ?, ?)",
+                (key, presentation_id, url, now + self.ttl),
+            )
+            self._conn.execute(
+                "DELETE FROM presentation_cache WHERE expires_at <= ?", (now,)
+            )
+            self._conn.commit()
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM presentation_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def discard_presentation(self, presentation_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM presentation_cache WHERE presentation_id = ?",
+                (presentation_id,),
+            )
+            self._conn.commit()
@@ -0,0 +1,80 @@
+"""
+Registro de propietarios de presentaciones en SQLite.
+
+Implementa PresentationOwnershipInterface del dominio. Las presentaciones
+sin registro (generadas antes de existir este registro, o por otra
+instancia) se consideran ajenas: nunca se modifican en sitio.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+from domain.interfaces.presentation_ownership import PresentationOwnershipInterface
+
+logger = logging.getLogger(__name__)
+
+
+class SQLitePresentationOwnership(PresentationOwnershipInterface):
+    """Presentación -> (propietario, compartida)."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: Ruta del fichero SQLite
+            clock: Reloj de pared (inyectable para tests)
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS presentation_owners (
+                presentation_id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                shared INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def record(self, presentation_id: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO presentation_owners VALUES (?, ?, 0, ?)",
+                (presentation_id, owner, self._clock()),
+            )
+            self._conn.commit()
+
+    def share(self, presentation_id: str, owner: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE presentation_owners SET shared = 1 "
+                "WHERE presentation_id = ? AND owner != ?",
+                (presentation_id, owner),
+            )
+            self._conn.commit()
+
+    def can_modify(self, presentation_id: str, owner: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM presentation_owners "
+                "WHERE presentation_id = ? AND owner = ? AND shared = 0",
+                (presentation_id, owner),
+            ).fetchone()
+        return row is not None
+
+    def forget(self, presentation_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM presentation_owners WHERE presentation_id = ?",
+                (presentation_id,),
+            )
+            self._conn.commit()
@@ -0,0 +1,166 @@
+"""
+Registro de presentaciones generadas en SQLite.
+
+Guarda el ID y la fecha de creación de cada fichero creado en Drive para
+que el sweeper de retención pueda borrar los que caducan. Los borrados
+que fallan se reintentan con espera exponencial, sin bloquear al resto.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteRetentionStore:
+    """Presentación -> fecha de creación e intentos de borrado fallidos."""
+
+    def __init__(
+        self,
+        path: str,
+        clock: Callable[[], float] = time.time,
+        base_backoff: float = 300.0,
+        max_backoff: float = 24 * 3600.0,
+        max_attempts: int = 10,
+    ):
+        """
+        Args:
+            path: Ruta del fichero SQLite
+            clock: Reloj de pared (inyectable para tests)
+            base_backoff: Espera tras el primer borrado fallido (se duplica)
+            max_backoff: Espera máxima entre reintentos
+            max_attempts: Intentos tras los que se abandona una presentación
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS created_presentations (
+                presentation_id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._migrate()
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_created_at "
+            "ON created_presentations (created_at)"
+        )
+        self._conn.commit()
+
+    def record(self, presentation_id: str) -> None:
+        """Registra una presentación recién creada."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO created_presentations "
+                "(presentation_id, created_at) VALUES (?, ?)",
+                (presentation_id, self._clock()),
+            )
+            self._conn.commit()
+
+    def expired(self, max_age: float, limit: int) -> List[str]:
+        """
+        Devuelve hasta `limit` presentaciones más antiguas que `max_age`.
+
+        Las que fallaron al borrarse no vuelven hasta que pasa su espera.
+        """
+        now = self._clock()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT presentation_id FROM created_presentations "
+                "WHERE created_at < ? AND retry_at <= ? "
+                "ORDER BY created_at LIMIT ?",
+                (now - max_age, now, limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def fail(self, presentation_ids: List[str], error: str) -> List[str]:
+        """
+        Anota un borrado fallido y aplaza el siguiente intento.
+
+        Returns:
+            Las presentaciones abandonadas por agotar `max_attempts` (se
+            quitan del registro)
+        """
+        now = self._clock()
+        abandoned: List[str] = []
+        with self._lock:
+            for presentation_id in presentation_ids:
+                row = self._conn.execute(
+                    "SELECT attempts FROM created_presentations "
+                    "WHERE presentation_id = ?",
+                    (presentation_id,),
+                ).fetchone()
+                if row is None:
+                    continue
+                attempts = row[0] + 1
+                if attempts >= self.max_attempts:
+                    self._conn.execute(
+                        "DELETE FROM created_presentations WHERE presentation_id = ?",
+                        (presentation_id,),
+                    )
+                    abandoned.append(presentation_id)
+                    continue
+                backoff = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+                self._conn.execute(
+                    "UPDATE created_presentations "
+                    "SET attempts = ?, last_error = ?, retry_at = ? "
+                    "WHERE presentation_id = ?",
+                    (attempts, error[:500], now + backoff, presentation_id),
+                )
+            self._conn.commit()
+        return abandoned
+
+    def remove(self, presentation_ids: List[str]) -> None:
+        """Olvida presentaciones ya borradas."""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM created_presentations WHERE presentation_id = ?",
+                [(pid,) for pid in presentation_ids],
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        """Número de presentaciones registradas."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM created_presentations"
+            ).fetchone()[0]
+
+    def failing(self) -> int:
+        """Número de presentaciones con algún borrado fallido pendiente."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM created_presentations WHERE attempts > 0"
+            ).fetchone()[0]
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _migrate(self) -> None:
+        """Añade las columnas de reintentos a registros de versiones previas."""
+        columns = {
+            row[1]
+            for row in self._conn.execute("PRAGMA table_info(created_presentations)")
+        }
+        for column, kind in (
+            ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+            ("last_error", "TEXT"),
+            ("retry_at", "REAL NOT NULL DEFAULT 0"),
+        ):
+            if column not in columns:
+                self._conn.execute(
+                    f"ALTER TABLE created_presentations ADD COLUMN {column} {kind}"
+                )
@@ -0,0 +1,71 @@
+"""
+Almacén de rutinas por hash de contenido en SQLite.
+
+Guarda cada rutina publicada bajo su hash para poder renderizarla más
+tarde (visor HTML/PDF) sin que el cliente tenga que reenviarla.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from domain.entities.routine import Routine
+from infrastructure.persistence.sqlite_snapshot_store import (
+    dump_routines,
+    load_routines,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteRoutineStore:
+    """Hash de contenido -> rutinas."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Ruta del fichero SQLite
+        """
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS routines (
+                key TEXT PRIMARY KEY,
+                routines TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[List[Routine]]:
+        """Devuelve las rutinas guardadas con ese hash, o None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT routines FROM routines WHERE key = ?", (key,)
+            ).fetchone()
+        return load_routines(row[0]) if row else None
+
+    def exists(self, key: str) -> bool:
+        """Indica si hay rutinas guardadas con ese hash (sin deserializarlas)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM routines WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def put(self, key: str, routines: List[Routine]) -> None:
+        """Guarda las rutinas (el mismo hash implica el mismo contenido)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO routines VALUES (?, ?, ?)",
+                (key, dump_routines(routines), time.time()),
+            )
+            self._conn.commit()
@@ -0,0 +1,91 @@
+"""
+Registro de update_id ya recibidos, compartido entre procesos (SQLite).
+
+Con varios workers de uvicorn cada uno tiene su propia memoria: esta
+tabla es el nivel común del deduplicador. La inserción es atómica, así
+que de dos entregas simultáneas del mismo update solo una la gana.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Set
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteSeenUpdates:
+    """update_id -> fecha en que se vio por primera vez."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: Ruta del fichero SQLite
+            clock: Reloj de pared (inyectable para tests)
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS seen_updates (
+                update_id INTEGER PRIMARY KEY,
+                seen_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_seen_at ON seen_updates (seen_at)"
+        )
+        self._conn.commit()
+
+    def add_new(self, update_ids: Iterable[int]) -> Set[int]:
+        """
+        Registra los update_id y devuelve los que no estaban ya.
+
+        Returns:
+            Los update_id nuevos (el resto son duplicados)
+        """
+        now = self._clock()
+        new: Set[int] = set()
+        with self._lock:
+            for update_id in update_ids:
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO seen_updates VALUES (?, ?)",
+                    (update_id, now),
+                ).rowcount
+                if inserted:
+                    new.add(update_id)
+            self._conn.commit()
+        return new
+
+    def remove(self, update_ids: Iterable[int]) -> None:
+        """Olvida update_id registrados (ej: si no se pudieron guardar)."""
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM seen_updates WHERE update_id = ?",
+                [(update_id,) for update_id in update_ids],
+            )
+            self._conn.commit()
+
+    def purge(self, max_age: float) -> int:
+        """Olvida los update_id vistos hace más de `max_age` segundos."""
+        with self._lock:
+            purged = self._conn.execute(
+                "DELETE FROM seen_updates WHERE seen_at < ?",
+                (self._clock() - max_age,),
+            ).rowcount
+            self._conn.commit()
+        return purged
+
+    def count(self) -> int:
+        """Número de update_id registrados."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM seen_updates"
+            ).fetchone()[0]
@@ -0,0 +1,127 @@
+"""
+Almacén de versiones de rutinas por presentación en SQLite.
+
+Guarda con qué rutinas se generó cada presentación para poder calcular
+después qué cambió y actualizarla de forma incremental, y con qué cuenta
+de Google se creó (la única que puede modificarla o borrarla).
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from domain.entities.routine import Exercise, Routine
+
+logger = logging.getLogger(__name__)
+
+
+def dump_routines(routines: List[Routine]) -> str:
+    """Serializa rutinas en JSON compacto: [[día, [[nombre, series, [reps]]]]]."""
+    data = [
+        [r.day_number, [[ex.name, ex.sets, ex.reps] for ex in r.exercises]]
+        for r in routines
+    ]
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_routines(payload: str) -> List[Routine]:
+    """Deserializa rutinas guardadas con `dump_routines`."""
+    return [
+        Routine(
+            day_number=day,
+            exercises=[Exercise(name=n, sets=s, reps=r) for n, s, r in exercises],
+        )
+        for day, exercises in json.loads(payload)
+    ]
+
+
+class SQLiteRoutineSnapshotStore:
+    """Presentación -> (slides previas de la plantilla, rutinas) y cuenta."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Ruta del fichero SQLite
+        """
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS routine_snapshots (
+                presentation_id TEXT PRIMARY KEY,
+                num_existing INTEGER NOT NULL,
+                routines TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS presentation_accounts (
+                presentation_id TEXT PRIMARY KEY,
+                account TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, presentation_id: str) -> Optional[Tuple[int, List[Routine]]]:
+        """Devuelve (num_existing, rutinas) de la última versión, o None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT num_existing, routines FROM routine_snapshots "
+                "WHERE presentation_id = ?",
+                (presentation_id,),
+            ).fetchone()
+        if not row:
+            return None
+        return row[0], load_routines(row[1])
+
+    def put(
+        self, presentation_id: str, num_existing: int, routines: List[Routine]
+    ) -> None:
+        """Guarda la versión actual de una presentación."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO routine_snapshots VALUES (?, ?, ?, ?)",
+                (presentation_id, num_existing, dump_routines(routines), time.time()),
+            )
+            self._conn.commit()
+
+    def account(self, presentation_id: str) -> Optional[str]:
+        """Cuenta de Google que creó la presentación, o None si no consta."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT account FROM presentation_accounts WHERE presentation_id = ?",
+                (presentation_id,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_account(self, presentation_id: str, account: str) -> None:
+        """Anota la cuenta de Google que creó la presentación."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO presentation_accounts VALUES (?, ?)",
+                (presentation_id, account),
+            )
+            self._conn.commit()
+
+    def delete(self, presentation_id: str) -> None:
+        """Olvida una presentación (ej: tras borrarla de Drive)."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM routine_snapshots WHERE presentation_id = ?",
+                (presentation_id,),
+            )
+            self._conn.execute(
+                "DELETE FROM presentation_accounts WHERE presentation_id = ?",
+                (presentation_id,),
+            )
+            self._conn.commit()
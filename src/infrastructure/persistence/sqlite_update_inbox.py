@@ -0,0 +1,301 @@
+"""
+Bandeja de entrada de updates de Telegram en SQLite.
+
+El webhook solo añade el update a esta tabla y responde; el procesamiento
+(Gemini, envíos a Telegram...) ocurre después, fuera de la petición. Si
+el proceso cae, los updates pendientes o a medio procesar siguen aquí y
+se procesan al arrancar.
+
+Varios procesos (workers de uvicorn) pueden compartir la bandeja: cada
+uno toma los updates con un lease que renueva mientras los procesa, y
+no toma updates de un chat que otro proceso tiene en curso.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from infrastructure.telegram.chat_executor import chat_key
+
+logger = logging.getLogger(__name__)
+
+_PENDING = "pending"
+_PROCESSING = "processing"
+_DONE = "done"
+_FAILED = "failed"
+
+
+@dataclass
+class InboxItem:
+    """Un update recibido, con su posición en la bandeja."""
+
+    seq: int
+    update: Dict[str, Any]
+    received_at: float
+
+
+class SQLiteUpdateInbox:
+    """Cola de updates de Telegram en orden de llegada (modo WAL)."""
+
+    def __init__(
+        self,
+        path: str,
+        clock: Callable[[], float] = time.time,
+        lease: float = 120.0,
+        owner: Optional[str] = None,
+    ):
+        """
+        Args:
+            path: Ruta del fichero SQLite
+            clock: Reloj de pared (inyectable para tests)
+            lease: Segundos que un update tomado es de este proceso sin
+                renovar; al caducar, otro proceso puede reprocesarlo
+            owner: Identificador de este proceso (por defecto, aleatorio)
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.lease = lease
+        self.owner = owner or uuid.uuid4().hex
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS updates (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                update_id INTEGER,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                received_at REAL NOT NULL,
+                processed_at REAL,
+                chat_id INTEGER,
+                owner TEXT,
+                lease_until REAL
+            )
+            """
+        )
+        self._migrate()
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_updates_status ON updates (status, seq)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_updates_chat ON updates (status, chat_id)"
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cursors (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        logger.info(f"Bandeja de updates en {path}")
+
+    def append(self, update: Dict[str, Any]) -> int:
+        """
+        Guarda un update recibido.
+
+        Returns:
+            Posición (seq) del update en la bandeja
+        """
+        with self._lock:
+            seq = self._conn.execute(
+                "INSERT INTO updates "
+                "(update_id, payload, status, received_at, chat_id) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    update.get("update_id"),
+                    json.dumps(update, ensure_ascii=False),
+                    _PENDING,
+                    self._clock(),
+                    chat_key(update),
+                ),
+            ).lastrowid
+            self._conn.commit()
+        return seq
+
+    def append_batch(self, updates: List[Dict[str, Any]], offset: int) -> None:
+        """
+        Guarda un lote de getUpdates y el offset siguiente en una sola
+        transacción: tras una caída no se pierde ni se repite ningún lote.
+        """
+        now = self._clock()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO updates "
+                "(update_id, payload, status, received_at, chat_id) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        update.get("update_id"),
+                        json.dumps(update, ensure_ascii=False),
+                        _PENDING,
+                        now,
+                        chat_key(update),
+                    )
+                    for update in updates
+                ],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cursors VALUES ('offset', ?)", (offset,)
+            )
+            self._conn.commit()
+
+    def offset(self) -> int:
+        """Offset de getUpdates guardado (0 si nunca se ha sondeado)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cursors WHERE name = 'offset'"
+            ).fetchone()
+        return row[0] if row else 0
+
+    def claim(self, limit: int = 1) -> List[InboxItem]:
+        """
+        Toma los `limit` updates pendientes más antiguos.
+
+        Se saltan los updates de chats que otro proceso tiene en curso (y
+        con ellos los posteriores del mismo chat), para que el orden por
+        chat se mantenga también entre procesos.
+        """
+        now = self._clock()
+        with self._lock:
+            # BEGIN IMMEDIATE: la lectura y la toma son atómicas entre procesos
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire_leases(now)
+                rows = self._conn.execute(
+                    "SELECT seq, payload, received_at FROM updates "
+                    "WHERE status = ? AND (chat_id IS NULL OR chat_id NOT IN ("
+                    "  SELECT chat_id FROM updates WHERE status = ? "
+                    "  AND owner != ? AND chat_id IS NOT NULL"
+                    ")) ORDER BY seq LIMIT ?",
+                    (_PENDING, _PROCESSING, self.owner, limit),
+                ).fetchall()
+                claimed = []
+                for row in rows:
+                    # La condición sobre el estado evita tomar dos veces el mismo
+                    if self._conn.execute(
+                        "UPDATE updates SET status = ?, owner = ?, lease_until = ? "
+                        "WHERE seq = ? AND status = ?",
+                        (_PROCESSING, self.owner, now + self.lease, row[0], _PENDING),
+                    ).rowcount:
+                        claimed.append(row)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+        return [InboxItem(row[0], json.loads(row[1]), row[2]) for row in claimed]
+
+    def renew(self) -> int:
+        """
+        Prolonga el lease de los updates que este proceso tiene en curso.
+
+        Returns:
+            Número de updates renovados
+        """
+        with self._lock:
+            renewed = self._conn.execute(
+                "UPDATE updates SET lease_until = ? WHERE status = ? AND owner = ?",
+                (self._clock() + self.lease, _PROCESSING, self.owner),
+            ).rowcount
+            self._conn.commit()
+        return renewed
+
+    def ack(self, seq: int, error: Optional[str] = None) -> None:
+        """
+        Marca un update como procesado (o fallido, si hay error).
+
+        Si el lease caducó y otro proceso lo tomó, no se toca.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE updates SET status = ?, error = ?, processed_at = ?, "
+                "lease_until = NULL WHERE seq = ? AND owner = ? AND status = ?",
+                (
+                    _FAILED if error else _DONE,
+                    error,
+                    self._clock(),
+                    seq,
+                    self.owner,
+                    _PROCESSING,
+                ),
+            )
+            self._conn.commit()
+
+    def recover(self) -> int:
+        """
+        Devuelve a pendientes los updates en proceso cuyo lease caducó (su
+        proceso cayó o dejó de renovarlo). Los que otros procesos vivos
+        tienen en curso no se tocan.
+
+        Returns:
+            Número de updates recuperados
+        """
+        with self._lock:
+            recovered = self._expire_leases(self._clock())
+            self._conn.commit()
+        if recovered:
+            logger.info(f"{recovered} updates interrumpidos devueltos a la bandeja")
+        return recovered
+
+    def purge(self, max_age: float) -> int:
+        """Borra los updates procesados hace más de `max_age` segundos."""
+        with self._lock:
+            purged = self._conn.execute(
+                "DELETE FROM updates WHERE status IN (?, ?) AND processed_at < ?",
+                (_DONE, _FAILED, self._clock() - max_age),
+            ).rowcount
+            self._conn.commit()
+        return purged
+
+    def stats(self) -> Dict[str, Any]:
+        """Updates por estado y antigüedad del pendiente más viejo (lag)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*), MIN(received_at) FROM updates "
+                "GROUP BY status"
+            ).fetchall()
+
+        counts: Dict[str, Any] = {
+            status: 0 for status in (_PENDING, _PROCESSING, _DONE, _FAILED)
+        }
+        oldest = None
+        for status, count, received_at in rows:
+            counts[status] = count
+            if status in (_PENDING, _PROCESSING):
+                oldest = received_at if oldest is None else min(oldest, received_at)
+        lag = max(0.0, self._clock() - oldest) if oldest is not None else 0.0
+        counts["lag_seconds"] = round(lag, 3)
+        return counts
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _migrate(self) -> None:
+        """Añade las columnas de leases a bandejas creadas por versiones previas."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(updates)")}
+        for column, kind in (
+            ("chat_id", "INTEGER"),
+            ("owner", "TEXT"),
+            ("lease_until", "REAL"),
+        ):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE updates ADD COLUMN {column} {kind}")
+
+    def _expire_leases(self, now: float) -> int:
+        """Devuelve a pendientes los updates con el lease caducado (con lock)."""
+        return self._conn.execute(
+            "UPDATE updates SET status = ?, owner = NULL, lease_until = NULL "
+            "WHERE status = ? AND (lease_until IS NULL OR lease_until < ?)",
+            (_PENDING, _PROCESSING, now),
+        ).rowcount
@@ -0,0 +1 @@
+"""Generación local de presentaciones PowerPoint (.pptx)."""
@@ -0,0 +1,167 @@
+"""
+Generador compuesto con respaldo local.
+
+Implementa PresentationGeneratorInterface del dominio delegando en un
+generador principal (Google Slides) y, si falla o tarda demasiado, en el
+generador local de .pptx.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
+
+from domain.entities.routine import Routine
+from domain.interfaces.presentation_generator import PresentationGeneratorInterface
+from infrastructure.powerpoint.pptx_generator import LOCAL_ID_PREFIX
+
+logger = logging.getLogger(__name__)
+
+
+class FallbackPresentationGenerator(PresentationGeneratorInterface):
+    """
+    Generador que recurre al backend local cuando el principal no responde.
+
+    Las operaciones sobre una presentación existente se envían al backend
+    que la creó (los IDs locales empiezan por `local-`). Si el principal
+    supera `fallback_after` segundos se responde con la versión local; la
+    llamada original sigue en segundo plano y, si acaba creando una
+    presentación que ya nadie va a usar, se borra.
+    """
+
+    def __init__(
+        self,
+        primary: PresentationGeneratorInterface,
+        fallback: PresentationGeneratorInterface,
+        fallback_after: Optional[float] = None,
+    ):
+        """
+        Args:
+            primary: Generador preferido (ej: Google Slides)
+            fallback: Generador local de respaldo
+            fallback_after: Segundos de espera al principal (None = sin límite)
+        """
+        self.primary = primary
+        self.fallback = fallback
+        self.fallback_after = fallback_after
+        self._executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="presentation"
+        )
+        self._lock = threading.Lock()
+        self.primary_count = 0
+        self.fallback_count = 0
+
+    def create(self, routines: List[Routine]) -> str:
+        return self._with_fallback(
+            lambda: self.primary.create(routines),
+            lambda: self.fallback.create(routines),
+        )
+
+    def create_and_share(self, routines: List[Routine]) -> str:
+        return self._with_fallback(
+            lambda: self.primary.create_and_share(routines),
+            lambda: self.fallback.create_and_share(routines),
+        )
+
+    def update(self, presentation_id: str, routines: List[Routine]) -> str:
+        if self._is_local(presentation_id):
+            return self.fallback.update(presentation_id, routines)
+        # Una presentación de Google no se puede parchear en local: se regenera
+        return self._with_fallback(
+            lambda: self.primary.update(presentation_id, routines),
+            lambda: self.fallback.create_and_share(routines),
+            keep=presentation_id,
+        )
+
+    def set_permissions(self, presentation_id: str) -> None:
+        self._owner(presentation_id).set_permissions(presentation_id)
+
+    def exists(self, presentation_id: str) -> bool:
+        return self._owner(presentation_id).exists(presentation_id)
+
+    def get_url(self, presentation_id: str) -> str:
+        return self._owner(presentation_id).get_url(presentation_id)
+
+    def local_path(self, presentation_id: str) -> Optional[str]:
+        return self._owner(presentation_id).local_path(presentation_id)
+
+    def delete_many(self, presentation_ids: List[str]) -> Tuple[List[str], int]:
+        """Borra cada presentación con el backend que la creó."""
+        local = [pid for pid in presentation_ids if self._is_local(pid)]
+        remote = [pid for pid in presentation_ids if not self._is_local(pid)]
+        deleted, reclaimed = self.fallback.delete_many(local) if local else ([], 0)
+        if remote:
+            ids, size = self.primary.delete_many(remote)
+            deleted, reclaimed = deleted + ids, reclaimed + size
+        return deleted, reclaimed
+
+    def stats(self) -> Dict[str, int]:
+        """Presentaciones servidas por cada backend."""
+        return {"primary": self.primary_count, "fallback": self.fallback_count}
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _is_local(presentation_id: str) -> bool:
+        return presentation_id.startswith(LOCAL_ID_PREFIX)
+
+    def _owner(self, presentation_id: str) -> PresentationGeneratorInterface:
+        return self.fallback if self._is_local(presentation_id) else self.primary
+
+    def _with_fallback(
+        self,
+        primary_call: Callable[[], str],
+        fallback_call: Callable[[], str],
+        keep: Optional[str] = None,
+    ) -> str:
+        """
+        Ejecuta la llamada en el principal y, si no responde, en el local.
+
+        Args:
+            primary_call: Llamada al generador principal
+            fallback_call: Llamada al generador local
+            keep: ID que no se borra aunque el principal llegue tarde (la
+                presentación actualizada en sitio)
+        """
+        future = self._executor.submit(primary_call)
+        try:
+            result = future.result(timeout=self.fallback_after)
+        except FutureTimeoutError:
+            future.add_done_callback(lambda late: self._discard_late(late, keep))
+            logger.warning(
+                f"El generador principal superó {self.fallback_after}s, "
+                "se genera en local"
+            )
+        except Exception as e:
+            logger.warning(f"El generador principal falló ({e}), se genera en local")
+        else:
+            with self._lock:
+                self.primary_count += 1
+            return result
+
+        result = fallback_call()
+        with self._lock:
+            self.fallback_count += 1
+        return result
+
+    def _discard_late(self, future: Future, keep: Optional[str]) -> None:
+        """Borra la presentación que el principal creó tras el respaldo."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        presentation_id = future.result()
+        if presentation_id == keep:
+            logger.info(f"Presentación principal actualizada tras el respaldo: {keep}")
+            return
+        try:
+            deleted, _ = self.primary.delete_many([presentation_id])
+        except Exception as e:
+            deleted = []
+            logger.warning(f"Error borrando {presentation_id}: {e}")
+        if deleted:
+            logger.info(f"Presentación principal tardía borrada: {presentation_id}")
+        else:
+            # Queda en el registro de retención: la borrará el sweeper
+            logger.warning(f"Presentación tardía {presentation_id} sin borrar")
@@ -0,0 +1,337 @@
+"""
+Generador de presentaciones PowerPoint en local.
+
+Implementa PresentationGeneratorInterface del dominio con python-pptx,
+con la misma maquetación de días y tablas que GoogleSlidesGenerator. No
+hace llamadas de red ni consume cuota de Google, así que sirve como
+backend offline y como respaldo cuando la API de Slides va lenta.
+"""
+
+import copy
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from domain.entities.routine import Exercise, Routine
+from domain.exceptions import PresentationError
+from domain.interfaces.presentation_generator import PresentationGeneratorInterface
+from infrastructure.google.request_planner import (
+    ROW_HEIGHT_PT,
+    TABLE_MAX_HEIGHT_PT,
+    TABLE_MIN_HEIGHT_PT,
+    SlidePage,
+    paginate,
+)
+from infrastructure.persistence.sqlite_retention_store import SQLiteRetentionStore
+
+try:
+    from pptx import Presentation
+    from pptx.dml.color import RGBColor
+    from pptx.util import Pt
+except ImportError:  # python-pptx es opcional
+    Presentation = None
+
+logger = logging.getLogger(__name__)
+
+LOCAL_ID_PREFIX = "local-"
+PPTX_MEDIA_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+
+_LOCAL_ID = re.compile(rf"^{LOCAL_ID_PREFIX}[0-9a-f]{{32}}$")
+
+# Colores (RGB 0-255) equivalentes a los de SlidesRequestPlanner
+_WHITE = (0xFF, 0xFF, 0xFF)
+_TITLE_BG = (0x00, 0x33, 0xCC)
+_BG_ODD = (0x45, 0x45, 0x45)
+_BG_EVEN = (0x33, 0x33, 0x33)
+_HEADERS = ("Ejercicio", "Series", "Repeticiones")
+
+# Plantilla ya parseada por cada proceso del pool: ruta ("" = por defecto)
+_templates: Dict[str, Any] = {}
+
+
+# ─────────────────────────────────────────────────────────
+# Renderizado (se ejecuta en los procesos del pool)
+# ─────────────────────────────────────────────────────────
+
+
+def _load_template(template_path: Optional[str]) -> Any:
+    """
+    Inicializador del proceso: deja la plantilla parseada en memoria.
+
+    Cada render trabaja sobre una copia profunda, que cuesta menos que
+    volver a descomprimir y parsear el .pptx.
+    """
+    key = template_path or ""
+    if key not in _templates:
+        # Presentation(None) carga la plantilla por defecto de python-pptx
+        _templates[key] = Presentation(template_path)
+    return _templates[key]
+
+
+def render_pptx(
+    pages: List[SlidePage],
+    output_path: str,
+    template_path: Optional[str] = None,
+    layout_index: int = 6,
+) -> str:
+    """
+    Renderiza las slides en un fichero .pptx.
+
+    Args:
+        pages: Slides a generar (ver `paginate`)
+        output_path: Ruta del fichero de salida
+        template_path: Plantilla .pptx (None = plantilla por defecto de python-pptx)
+        layout_index: Índice del layout a usar para cada slide
+
+    Returns:
+        Ruta del fichero generado
+    """
+    presentation = copy.deepcopy(_load_template(template_path))
+
+    layouts = presentation.slide_layouts
+    layout = layouts[min(layout_index, len(layouts) - 1)]
+    for page in pages:
+        slide = presentation.slides.add_slide(layout)
+        _add_title(slide, page.title)
+        _add_table(slide, page.exercises)
+
+    # Escritura atómica: nunca se sirve un fichero a medio escribir
+    partial = f"{output_path}.part"
+    presentation.save(partial)
+    os.replace(partial, output_path)
+    return output_path
+
+
+def _add_title(slide: Any, text: str) -> None:
+    box = slide.shapes.add_textbox(Pt(50), Pt(10), Pt(600), Pt(50))
+    box.fill.solid()
+    box.fill.fore_color.rgb = RGBColor(*_TITLE_BG)
+    run = box.text_frame.paragraphs[0].add_run()
+    run.text = text
+    run.font.bold = True
+    run.font.size = Pt(24)
+    run.font.color.rgb = RGBColor(*_WHITE)
+
+
+def _add_table(slide: Any, exercises: List[Exercise]) -> None:
+    num_rows = len(exercises) + 1
+    height = min(
+        TABLE_MAX_HEIGHT_PT, max(TABLE_MIN_HEIGHT_PT, num_rows * ROW_HEIGHT_PT)
+    )
+    table = slide.shapes.add_table(
+        num_rows, 3, Pt(50), Pt(80), Pt(600), Pt(height)
+    ).table
+
+    for col, text in enumerate(_HEADERS):
+        _write_cell(table.cell(0, col), text, bold=True)
+
+    for row, ex in enumerate(exercises, start=1):
+        fill = _BG_EVEN if row % 2 == 0 else _BG_ODD
+        texts = (ex.name, ex.sets, ", ".join(ex.reps))
+        for col, text in enumerate(texts):
+            cell = table.cell(row, col)
+            cell.fill.solid()
+            cell.fill.fore_color.rgb = RGBColor(*fill)
+            _write_cell(cell, text)
+
+
+def _write_cell(cell: Any, text: str, bold: bool = False) -> None:
+    cell.text = text
+    font = cell.text_frame.paragraphs[0].runs[0].font
+    font.bold = bold
+    font.color.rgb = RGBColor(*_WHITE)
+
+
+# ─────────────────────────────────────────────────────────
+# Generador
+# ─────────────────────────────────────────────────────────
+
+
+class PptxPresentationGenerator(PresentationGeneratorInterface):
+    """
+    Generador de presentaciones .pptx en local.
+
+    El renderizado (CPU) se ejecuta en un pool de procesos para no bloquear
+    el servidor; cada proceso parsea la plantilla una sola vez al arrancar.
+    Los ficheros se guardan en `output_dir` con IDs `local-<hex>` y se
+    sirven por el endpoint de descarga. Con `retention` se registran para
+    que el sweeper los borre al caducar (ver `delete_many`).
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        template_path: Optional[str] = None,
+        layout_index: int = 6,
+        base_url: str = "",
+        max_rows_per_slide: int = (TABLE_MAX_HEIGHT_PT // ROW_HEIGHT_PT) - 1,
+        max_workers: int = 2,
+        render_timeout: float = 30.0,
+        retention: Optional[SQLiteRetentionStore] = None,
+    ):
+        """
+        Args:
+            output_dir: Directorio donde se guardan los .pptx
+            template_path: Plantilla .pptx (None = plantilla por defecto)
+            layout_index: Índice del layout de las slides de rutina
+            base_url: URL pública del servicio para construir enlaces de descarga
+            max_rows_per_slide: Ejercicios máximos por tabla
+            max_workers: Procesos de renderizado
+            render_timeout: Tiempo máximo de renderizado en segundos
+            retention: Registro de presentaciones creadas (para borrarlas al caducar)
+
+        Raises:
+            PresentationError: Si python-pptx no está instalado
+        """
+        if Presentation is None:
+            raise PresentationError(
+                "El generador local requiere python-pptx (pip install python-pptx)"
+            )
+
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.template_path = template_path
+        self.layout_index = layout_index
+        self.base_url = base_url.rstrip("/")
+        self.max_rows_per_slide = max_rows_per_slide
+        self.max_workers = max_workers
+        self.render_timeout = render_timeout
+        self.retention = retention
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.rendered = 0
+        self.errors = 0
+        self.render_seconds = 0.0
+
+        logger.info("PptxPresentationGenerator inicializado")
+
+    def create(self, routines: List[Routine]) -> str:
+        """
+        Renderiza las rutinas en un fichero .pptx.
+
+        Args:
+            routines: Lista de rutinas (una por día)
+
+        Returns:
+            ID local de la presentación
+
+        Raises:
+            PresentationError: Si falla el renderizado
+        """
+        presentation_id = f"{LOCAL_ID_PREFIX}{uuid.uuid4().hex}"
+        pages = paginate(routines, self.max_rows_per_slide)
+
+        started = time.monotonic()
+        try:
+            future = self._pool().submit(
+                render_pptx,
+                pages,
+                str(self._path(presentation_id)),
+                self.template_path,
+                self.layout_index,
+            )
+            future.result(timeout=self.render_timeout)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            raise PresentationError(f"Error renderizando el .pptx: {e}")
+
+        if self.retention:
+            self.retention.record(presentation_id)
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.rendered += 1
+            self.render_seconds += elapsed
+        logger.info(f"Presentación local {presentation_id} ({elapsed * 1000:.0f} ms)")
+        return presentation_id
+
+    def set_permissions(self, presentation_id: str) -> None:
+        """Sin permisos que configurar: el fichero se sirve por la API."""
+
+    def exists(self, presentation_id: str) -> bool:
+        """Comprueba que el fichero sigue en disco."""
+        return self.local_path(presentation_id) is not None
+
+    def get_url(self, presentation_id: str) -> str:
+        """URL del endpoint de descarga."""
+        return (
+            f"{self.base_url}/api/v1/routines/presentations/"
+            f"{presentation_id}/download"
+        )
+
+    def local_path(self, presentation_id: str) -> Optional[str]:
+        """Ruta del .pptx, o None si el ID no es local o el fichero no existe."""
+        if not _LOCAL_ID.match(presentation_id):
+            return None
+        path = self._path(presentation_id)
+        return str(path) if path.exists() else None
+
+    def delete_many(self, presentation_ids: List[str]) -> Tuple[List[str], int]:
+        """
+        Borra varios .pptx del disco.
+
+        Returns:
+            (IDs borrados o que ya no existían, bytes liberados); los IDs
+            que no son locales no se borran
+        """
+        deleted: List[str] = []
+        reclaimed = 0
+        for presentation_id in presentation_ids:
+            if not _LOCAL_ID.match(presentation_id):
+                logger.warning(f"{presentation_id} no es una presentación local")
+                continue
+            path = self._path(presentation_id)
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                size = 0
+            except OSError as e:
+                logger.warning(f"No se pudo borrar {path}: {e}")
+                continue
+            deleted.append(presentation_id)
+            reclaimed += size
+        return deleted, reclaimed
+
+    def stop(self) -> None:
+        """Detiene el pool de procesos."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del generador."""
+        with self._lock:
+            average = self.render_seconds / self.rendered if self.rendered else 0.0
+            return {
+                "rendered": self.rendered,
+                "errors": self.errors,
+                "avg_render_ms": round(average * 1000, 1),
+            }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _path(self, presentation_id: str) -> Path:
+        return self.output_dir / f"{presentation_id}.pptx"
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_load_template,
+                    initargs=(self.template_path,),
+                )
+            return self._executor
@@ -0,0 +1,23 @@
+"""
+Estado de conversación de Telegram (rutina pendiente por chat).
+
+This module provides:
+- ConversationStateStoreInterface: Interface del almacén con caducidad
+- MemoryStateStore: En memoria, con TTL y tamaño máximo (un solo worker)
+- SQLiteStateStore: En un fichero SQLite local (workers de una máquina)
+- RedisStateStore: En Redis, vía protocolo RESP (workers en varias máquinas)
+"""
+
+from .interface import ConversationStateStoreInterface, decode_state, encode_state
+from .memory_store import MemoryStateStore
+from .redis_store import RedisStateStore
+from .sqlite_store import SQLiteStateStore
+
+__all__ = [
+    "ConversationStateStoreInterface",
+    "decode_state",
+    "encode_state",
+    "MemoryStateStore",
+    "RedisStateStore",
+    "SQLiteStateStore",
+]
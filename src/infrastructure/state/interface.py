@@ -0,0 +1,59 @@
+"""
+Interface del almacén de estado de conversación.
+
+Guarda la rutina pendiente de confirmar de cada chat de Telegram entre
+el análisis y el botón "Crear Presentación". Con un almacén compartido
+(SQLite o Redis) la confirmación puede llegar a cualquier worker.
+"""
+
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from application.dtos.routine_dto import RoutineDTO
+
+# Los estados se guardan como JSON compacto comprimido con zlib
+_COMPRESSION_LEVEL = 6
+
+
+def encode_state(routine: RoutineDTO) -> bytes:
+    """Serializa una rutina pendiente en forma compacta."""
+    return zlib.compress(routine.model_dump_json().encode(), _COMPRESSION_LEVEL)
+
+
+def decode_state(data: bytes) -> RoutineDTO:
+    """Inversa de encode_state."""
+    return RoutineDTO.model_validate_json(zlib.decompress(data))
+
+
+class ConversationStateStoreInterface(ABC):
+    """
+    Rutina pendiente por chat, con caducidad.
+
+    Las implementaciones hacen I/O bloqueante: desde código asíncrono hay
+    que llamarlas con asyncio.to_thread.
+    """
+
+    @abstractmethod
+    def get(self, chat_id: int) -> Optional[RoutineDTO]:
+        """Rutina pendiente del chat (None si no hay o caducó)."""
+        pass
+
+    @abstractmethod
+    def set(self, chat_id: int, routine: RoutineDTO) -> None:
+        """Guarda (o reemplaza) la rutina pendiente del chat."""
+        pass
+
+    @abstractmethod
+    def pop(self, chat_id: int) -> Optional[RoutineDTO]:
+        """
+        Quita y devuelve la rutina pendiente del chat.
+
+        Es atómico: si dos workers confirman a la vez, solo uno la obtiene.
+        """
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del almacén."""
+        pass
@@ -0,0 +1,101 @@
+"""
+Almacén de estado de conversación en memoria.
+
+Válido con un solo worker: el estado se pierde al reiniciar y otros
+procesos no lo ven. Caduca por TTL y expulsa el menos usado al llenarse.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from application.dtos.routine_dto import RoutineDTO
+from infrastructure.state.interface import (
+    ConversationStateStoreInterface,
+    decode_state,
+    encode_state,
+)
+
+
+class MemoryStateStore(ConversationStateStoreInterface):
+    """chat_id -> (rutina serializada, caducidad), en orden LRU."""
+
+    def __init__(
+        self,
+        ttl: float = 24 * 3600,
+        max_size: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            ttl: Segundos que se conserva una rutina pendiente
+            max_size: Chats con rutina pendiente como máximo
+            clock: Reloj monotónico (inyectable para tests)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states: "OrderedDict[int, Tuple[bytes, float]]" = OrderedDict()
+
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, chat_id: int) -> Optional[RoutineDTO]:
+        with self._lock:
+            data = self._live(chat_id)
+            if data is not None:
+                self._states.move_to_end(chat_id)
+        return decode_state(data) if data is not None else None
+
+    def set(self, chat_id: int, routine: RoutineDTO) -> None:
+        data = encode_state(routine)
+        with self._lock:
+            self._states[chat_id] = (data, self._clock() + self.ttl)
+            self._states.move_to_end(chat_id)
+            self._evict()
+
+    def pop(self, chat_id: int) -> Optional[RoutineDTO]:
+        with self._lock:
+            data = self._live(chat_id)
+            self._states.pop(chat_id, None)
+        return decode_state(data) if data is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "states": len(self._states),
+                "bytes": sum(len(data) for data, _ in self._states.values()),
+                "expired": self.expired,
+                "evicted": self.evicted,
+            }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _live(self, chat_id: int) -> Optional[bytes]:
+        """Estado del chat si no ha caducado (con el lock tomado)."""
+        entry = self._states.get(chat_id)
+        if entry is None:
+            return None
+        data, expires_at = entry
+        if expires_at <= self._clock():
+            del self._states[chat_id]
+            self.expired += 1
+            return None
+        return data
+
+    def _evict(self) -> None:
+        """Quita los caducados y, si sigue lleno, los menos usados."""
+        if len(self._states) <= self.max_size:
+            return
+        now = self._clock()
+        for chat_id in [c for c, (_, exp) in self._states.items() if exp <= now]:
+            del self._states[chat_id]
+            self.expired += 1
+        while len(self._states) > self.max_size:
+            self._states.popitem(last=False)
+            self.evicted += 1
@@ -0,0 +1,226 @@
+"""
+Almacén de estado de conversación en Redis.
+
+Para varios workers en máquinas distintas. Habla el protocolo de Redis
+(RESP) directamente sobre un socket, así que no necesita el paquete
+redis y funciona con cualquier servidor compatible (Redis, Valkey,
+KeyDB...). La caducidad la aplica el propio servidor (SET ... EX).
+"""
+
+import logging
+import socket
+import threading
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import unquote, urlparse
+
+from application.dtos.routine_dto import RoutineDTO
+from infrastructure.state.interface import (
+    ConversationStateStoreInterface,
+    decode_state,
+    encode_state,
+)
+
+logger = logging.getLogger(__name__)
+
+RespValue = Union[None, int, bytes, List[Any]]
+
+
+class RedisError(Exception):
+    """Error devuelto por el servidor Redis."""
+
+
+class RespConnection:
+    """Conexión mínima con un servidor Redis (comandos síncronos)."""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        """
+        Args:
+            url: redis://[:password@]host[:port][/db]
+            timeout: Timeout de conexión y de cada comando en segundos
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"URL de Redis no soportada: {url}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+
+    def command(self, *args: Union[str, bytes, int, float]) -> RespValue:
+        """
+        Envía un comando y devuelve la respuesta.
+
+        Solo se reintenta (una vez, reconectando) si falla el envío: el
+        servidor no ha recibido el comando completo y repetirlo es seguro.
+        Si falla la lectura de la respuesta el comando puede haberse
+        ejecutado ya (ej: un GETDEL), así que se cierra la conexión y se
+        propaga el error.
+
+        Raises:
+            RedisError: Si el servidor responde con un error
+        """
+        payload = self._encode(args)
+        for attempt in range(2):
+            try:
+                if self._sock is not None and self._is_stale():
+                    self.close()
+                if self._sock is None:
+                    self._connect()
+                self._sock.sendall(payload)
+                break
+            except (OSError, EOFError):
+                self.close()
+                if attempt:
+                    raise
+
+        try:
+            return self._read()
+        except (OSError, EOFError, ValueError):
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Cierra la conexión (la siguiente llamada reconecta)."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _is_stale(self) -> bool:
+        """
+        Indica si el servidor cerró la conexión mientras estaba inactiva.
+
+        Mira sin bloquear si hay algo por leer: entre comandos no debería
+        haber nada, así que un EOF (o datos inesperados) la invalida.
+        """
+        try:
+            self._sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT)
+        except BlockingIOError:
+            return False
+        except OSError:
+            return True
+        # EOF (b"") o bytes sueltos de una respuesta anterior
+        return True
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection(
+            (self.host, self.port), timeout=self.timeout
+        )
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if self.password:
+            auth = [self.username, self.password] if self.username else [self.password]
+            self._sock.sendall(self._encode(["AUTH", *auth]))
+            self._read()
+        if self.db:
+            self._sock.sendall(self._encode(["SELECT", self.db]))
+            self._read()
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def _read(self) -> RespValue:
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise EOFError("Conexión con Redis cerrada")
+        kind, rest = line[:1], line[1:-2]
+
+        if kind == b"+":
+            return rest
+        if kind == b"-":
+            raise RedisError(rest.decode(errors="replace"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            if len(data) != length + 2:
+                raise EOFError("Conexión con Redis cerrada")
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            if length < 0:
+                return None
+            return [self._read() for _ in range(length)]
+        raise RedisError(f"Respuesta RESP desconocida: {line!r}")
+
+
+class RedisStateStore(ConversationStateStoreInterface):
+    """chat_id -> rutina serializada en claves de Redis con caducidad."""
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float = 24 * 3600,
+        prefix: str = "coach:state:",
+        timeout: float = 5.0,
+    ):
+        """
+        Args:
+            url: redis://[:password@]host[:port][/db]
+            ttl: Segundos que se conserva una rutina pendiente
+            prefix: Prefijo de las claves
+            timeout: Timeout de cada comando en segundos
+        """
+        self.ttl = max(1, int(ttl))
+        self.prefix = prefix
+        self._conn = RespConnection(url, timeout=timeout)
+        self._lock = threading.Lock()
+        logger.info(
+            f"Estado de conversación en Redis {self._conn.host}:{self._conn.port}"
+        )
+
+    def get(self, chat_id: int) -> Optional[RoutineDTO]:
+        data = self._command("GET", self._key(chat_id))
+        return decode_state(data) if data is not None else None
+
+    def set(self, chat_id: int, routine: RoutineDTO) -> None:
+        self._command("SET", self._key(chat_id), encode_state(routine), "EX", self.ttl)
+
+    def pop(self, chat_id: int) -> Optional[RoutineDTO]:
+        # GETDEL (Redis >= 6.2) lee y borra de forma atómica
+        data = self._command("GETDEL", self._key(chat_id))
+        return decode_state(data) if data is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            reachable = self._command("PING") == b"PONG"
+        except Exception:
+            reachable = False
+        return {"backend": "redis", "reachable": reachable}
+
+    def close(self) -> None:
+        """Cierra la conexión con Redis."""
+        with self._lock:
+            self._conn.close()
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _key(self, chat_id: int) -> str:
+        return f"{self.prefix}{chat_id}"
+
+    def _command(self, *args: Union[str, bytes, int]) -> RespValue:
+        with self._lock:
+            return self._conn.command(*args)
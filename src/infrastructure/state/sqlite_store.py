@@ -0,0 +1,110 @@
+"""
+Almacén de estado de conversación en SQLite.
+
+Sobrevive a reinicios y lo comparten todos los workers de la máquina
+(el fichero está en DATA_DIR).
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from application.dtos.routine_dto import RoutineDTO
+from infrastructure.state.interface import (
+    ConversationStateStoreInterface,
+    decode_state,
+    encode_state,
+)
+
+logger = logging.getLogger(__name__)
+
+# Cada cuántas escrituras se borran los estados caducados
+_PURGE_EVERY = 100
+
+
+class SQLiteStateStore(ConversationStateStoreInterface):
+    """chat_id -> rutina serializada, con caducidad (modo WAL)."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 24 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: Ruta del fichero SQLite
+            ttl: Segundos que se conserva una rutina pendiente
+            clock: Reloj de pared (inyectable para tests)
+        """
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, timeout=10, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS conversation_states (
+                chat_id INTEGER PRIMARY KEY,
+                payload BLOB NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_states_expires "
+            "ON conversation_states (expires_at)"
+        )
+        logger.info(f"Estado de conversación en {path}")
+
+    def get(self, chat_id: int) -> Optional[RoutineDTO]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM conversation_states "
+                "WHERE chat_id = ? AND expires_at > ?",
+                (chat_id, self._clock()),
+            ).fetchone()
+        return decode_state(row[0]) if row else None
+
+    def set(self, chat_id: int, routine: RoutineDTO) -> None:
+        data = encode_state(routine)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO conversation_states VALUES (?, ?, ?)",
+                (chat_id, data, self._clock() + self.ttl),
+            )
+            self._writes += 1
+            if self._writes % _PURGE_EVERY == 0:
+                self._conn.execute(
+                    "DELETE FROM conversation_states WHERE expires_at <= ?",
+                    (self._clock(),),
+                )
+
+    def pop(self, chat_id: int) -> Optional[RoutineDTO]:
+        with self._lock:
+            # DELETE ... RETURNING: leer y borrar en una sola sentencia
+            rows = self._conn.execute(
+                "DELETE FROM conversation_states WHERE chat_id = ? "
+                "RETURNING payload, expires_at",
+                (chat_id,),
+            ).fetchall()
+        if not rows or rows[0][1] <= self._clock():
+            return None
+        return decode_state(rows[0][0])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) "
+                "FROM conversation_states WHERE expires_at > ?",
+                (self._clock(),),
+            ).fetchone()
+        return {"backend": "sqlite", "states": count, "bytes": size}
@@ -0,0 +1,168 @@
+"""
+Cliente asíncrono de Telegram Bot API.
+
+Misma interfaz que TelegramBot, pero sobre un único httpx.AsyncClient
+compartido: las conexiones (HTTP/2 si está disponible) se reutilizan
+entre envíos en lugar de abrir una conexión TLS nueva por llamada, y
+ningún envío bloquea el event loop.
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from infrastructure.telegram.rate_limiter import TelegramRateLimiter
+
+try:
+    import h2  # noqa: F401  (httpx lo necesita para HTTP/2)
+except ImportError:  # Sin h2 se usa HTTP/1.1 con keep-alive
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+
+class AsyncTelegramBot:
+    """Cliente asíncrono para la API de Telegram Bot."""
+
+    def __init__(
+        self,
+        token: str,
+        webhook_url: str,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        http2: bool = True,
+        limiter: Optional[TelegramRateLimiter] = None,
+        api_url: str = TELEGRAM_API_URL,
+    ):
+        """
+        Args:
+            token: Token del bot
+            webhook_url: URL del webhook
+            timeout: Timeout de cada petición en segundos
+            max_connections: Conexiones simultáneas máximas con Telegram
+            http2: Usar HTTP/2 (requiere el paquete h2)
+            limiter: Limitador de envíos (None = sin límite)
+            api_url: URL de la Bot API (ej: un servidor local o de pruebas)
+        """
+        self.token = token
+        self.webhook_url = webhook_url
+        self.base_url = f"{api_url.rstrip('/')}/bot{token}"
+        self.http2 = http2 and h2 is not None
+        self.limiter = limiter
+        self._client = httpx.AsyncClient(
+            http2=self.http2,
+            timeout=httpx.Timeout(timeout, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        if http2 and not self.http2:
+            logger.info("h2 no está instalado: el bot usará HTTP/1.1 con keep-alive")
+
+    async def send_message(
+        self, chat_id: int, text: str, parse_mode: str = "Markdown"
+    ) -> Dict[str, Any]:
+        """Envía un mensaje de texto."""
+        payload = {"chat_id": chat_id, "text": text, "parse_mode": parse_mode}
+        return await self._post("sendMessage", chat_id, json=payload)
+
+    async def send_document(
+        self, chat_id: int, path: str, filename: str, caption: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Envía un fichero como documento."""
+        data = {"chat_id": str(chat_id)}
+        if caption:
+            data["caption"] = caption
+            data["parse_mode"] = "Markdown"
+        content = await asyncio.to_thread(Path(path).read_bytes)
+        return await self._post(
+            "sendDocument", chat_id, data=data, files={"document": (filename, content)}
+        )
+
+    async def send_typing_action(self, chat_id: int) -> None:
+        """Envía indicador de 'escribiendo...'."""
+        payload = {"chat_id": chat_id, "action": "typing"}
+        await self._post("sendChatAction", chat_id, json=payload)
+
+    async def send_message_with_keyboard(
+        self, chat_id: int, text: str, keyboard: List[List[Dict[str, str]]]
+    ) -> Dict[str, Any]:
+        """Envía mensaje con teclado inline."""
+        payload = {
+            "chat_id": chat_id,
+            "text": text,
+            "parse_mode": "Markdown",
+            "reply_markup": {"inline_keyboard": keyboard},
+        }
+        return await self._post("sendMessage", chat_id, json=payload)
+
+    async def answer_callback(
+        self, callback_id: str, text: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Responde a un callback query."""
+        payload = {"callback_query_id": callback_id}
+        if text:
+            payload["text"] = text
+        return await self._post("answerCallbackQuery", None, json=payload)
+
+    async def edit_message_markup(
+        self, chat_id: int, message_id: int, keyboard: Optional[List] = None
+    ) -> Dict[str, Any]:
+        """Edita el teclado de un mensaje."""
+        payload = {
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "reply_markup": {"inline_keyboard": keyboard or []},
+        }
+        return await self._post("editMessageReplyMarkup", chat_id, json=payload)
+
+    async def set_webhook(self) -> Dict[str, Any]:
+        """Configura el webhook."""
+        return await self._post("setWebhook", None, json={"url": self.webhook_url})
+
+    async def delete_webhook(self) -> Dict[str, Any]:
+        """Elimina el webhook (necesario para usar getUpdates)."""
+        return await self._post("deleteWebhook", None, json={})
+
+    async def get_updates(
+        self, offset: int, limit: int = 100, timeout: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Long polling de updates (no pasa por el limitador: no es un envío).
+
+        Raises:
+            RuntimeError: Si Telegram devuelve un error
+        """
+        response = await self._client.post(
+            f"{self.base_url}/getUpdates",
+            json={"offset": offset, "limit": limit, "timeout": timeout},
+            # La petición se queda abierta hasta `timeout` segundos
+            timeout=timeout + 10,
+        )
+        data = response.json()
+        if not data.get("ok"):
+            raise RuntimeError(data.get("description", "getUpdates falló"))
+        return data["result"]
+
+    async def aclose(self) -> None:
+        """Cierra las conexiones abiertas."""
+        await self._client.aclose()
+
+    async def _post(
+        self, method: str, chat_id: Optional[int], **kwargs: Any
+    ) -> Dict[str, Any]:
+        """Llama a un método de la Bot API (a través del limitador, si hay)."""
+
+        async def call() -> Dict[str, Any]:
+            response = await self._client.post(f"{self.base_url}/{method}", **kwargs)
+            return response.json()
+
+        if self.limiter is None:
+            return await call()
+        return await self.limiter.run(method, chat_id, call)
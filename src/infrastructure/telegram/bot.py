@@ -15,10 +15,15 @@ logger = logging.getLogger(__name__)
 class TelegramBot:
     """Cliente para la API de Telegram Bot."""
 
-    def __init__(self, token: str, webhook_url: str):
+    def __init__(
+        self,
+        token: str,
+        webhook_url: str,
+        api_url: str = "https://api.telegram.org",
+    ):
         self.token = token
         self.webhook_url = webhook_url
-        self.base_url = f"https://api.telegram.org/bot{token}"
+        self.base_url = f"{api_url.rstrip('/')}/bot{token}"
 
     def send_message(
         self, chat_id: int, text: str, parse_mode: str = "Markdown"
@@ -29,6 +34,21 @@ class TelegramBot:
         response = requests.post(url, json=payload)
         return response.json()
 
+    def send_document(
+        self, chat_id: int, path: str, filename: str, caption: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Envía un fichero como documento."""
+        url = f"{self.base_url}/sendDocument"
+        data = {"chat_id": chat_id}
+        if caption:
+            data["caption"] = caption
+            data["parse_mode"] = "Markdown"
+        with open(path, "rb") as document:
+            response = requests.post(
+                url, data=data, files={"document": (filename, document)}
+            )
+        return response.json()
+
     def send_typing_action(self, chat_id: int) -> None:
         """Envía indicador de 'escribiendo...'."""
         url = f"{self.base_url}/sendChatAction"
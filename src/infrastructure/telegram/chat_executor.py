@@ -0,0 +1,102 @@
+"""
+Ejecución en serie por chat.
+
+Dos updates del mismo chat no pueden procesarse a la vez: la
+confirmación de una rutina podría adelantarse al análisis que la creó.
+Los de chats distintos, en cambio, sí se procesan en paralelo.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ChatSerialExecutor:
+    """
+    Cola FIFO por clave (chat) sobre el event loop.
+
+    Cada llamada se encadena detrás de la anterior de su misma clave; el
+    orden es el de llamada a `run`. Cuando una clave se queda sin
+    llamadas pendientes se olvida, así que la memoria depende de los
+    chats activos, no de los chats vistos.
+    """
+
+    def __init__(self):
+        self._tails: Dict[Hashable, asyncio.Future] = {}
+        self.waiting = 0
+        self.max_queue = 0
+        self._queued: Dict[Hashable, int] = {}
+
+    async def run(
+        self, key: Optional[Hashable], call: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Ejecuta `call` cuando hayan terminado las anteriores de `key`.
+
+        La posición en la cola se reserva al llamar (antes del primer
+        await), así que el orden lo decide quien llama. Sin clave se
+        ejecuta al momento.
+
+        Si la llamada se cancela mientras espera su turno, su hueco no se
+        libera hasta que termine la anterior: la siguiente de la misma
+        clave nunca se adelanta a una que aún se está ejecutando.
+        """
+        if key is None:
+            return await call()
+
+        previous = self._tails.get(key)
+        done = asyncio.get_running_loop().create_future()
+        self._tails[key] = done
+        queued = self._queued.get(key, 0) + 1
+        self._queued[key] = queued
+        self.max_queue = max(self.max_queue, queued)
+        started = False
+        try:
+            if previous is not None:
+                self.waiting += 1
+                try:
+                    # shield: cancelar esta espera no debe cancelar la anterior
+                    await asyncio.shield(previous)
+                finally:
+                    self.waiting -= 1
+            started = True
+            return await call()
+        finally:
+            if started or previous is None or previous.done():
+                self._finish(key, done)
+            else:
+                previous.add_done_callback(lambda _: self._finish(key, done))
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de las colas por chat."""
+        return {
+            "active_chats": len(self._tails),
+            "waiting": self.waiting,
+            "max_chat_queue": self.max_queue,
+        }
+
+    def _finish(self, key: Hashable, done: asyncio.Future) -> None:
+        """Libera el turno de una llamada y olvida la clave si era la última."""
+        done.set_result(None)
+        if self._queued[key] == 1:
+            del self._queued[key]
+        else:
+            self._queued[key] -= 1
+        if self._tails.get(key) is done:
+            del self._tails[key]
+
+
+def chat_key(update: Dict[str, Any]) -> Optional[int]:
+    """Chat al que pertenece un update (None si no va a ningún chat)."""
+    callback = update.get("callback_query")
+    if callback:
+        message = callback.get("message") or {}
+        chat = message.get("chat") or callback.get("from") or {}
+        return chat.get("id")
+
+    for field in ("message", "edited_message", "channel_post"):
+        message = update.get(field)
+        if message:
+            return (message.get("chat") or {}).get("id")
+    return None
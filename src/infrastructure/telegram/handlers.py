@@ -2,8 +2,13 @@
 Handlers de Telegram.
 
 Maneja los diferentes tipos de mensajes y callbacks.
+
+El handler es asíncrono: los envíos a Telegram van por el cliente
+asíncrono y los casos de uso (síncronos: Gemini, Slides...) se ejecutan
+en hilos para no bloquear el event loop.
 """
 
+import asyncio
 import logging
 from typing import Any, Dict, Optional
 
@@ -12,7 +17,15 @@ from application.use_cases.generate_presentation import GeneratePresentationUseC
 from application.use_cases.parse_routine import ParseRoutineUseCase
 from domain.exceptions import DomainException
 from infrastructure.chatwoot.interface import ChatwootLoggerInterface
-from infrastructure.telegram.bot import TelegramBot
+from infrastructure.jobs import (
+    JOB_GENERATE_PRESENTATION,
+    LANE_INTERACTIVE,
+    Job,
+    JobWorkerPool,
+)
+from infrastructure.state import ConversationStateStoreInterface, MemoryStateStore
+from infrastructure.telegram.async_bot import AsyncTelegramBot
+from infrastructure.viewer.routine_viewer import RoutineViewer
 
 logger = logging.getLogger(__name__)
 
@@ -52,10 +65,11 @@ Muscle ups 5,6,7,8 reps
 MSG_NO_PENDING = "📭 No tienes ninguna rutina pendiente."
 MSG_CANCELLED = "🚫 Rutina cancelada. Puedes enviarme una nueva cuando quieras."
 MSG_PROCESSING = "⏳ Procesando tu rutina..."
-MSG_CREATING = "⏳ Creando presentación en Google Slides..."
+MSG_CREATING = "⏳ Creando tu presentación..."
 MSG_ERROR_PARSE = (
     "❌ *No pude procesar la rutina*\n\nVerifica el formato e intenta de nuevo."
 )
+MSG_CREATED = "✅ *¡Presentación creada!*"
 MSG_ERROR_SLIDES = "❌ Error al crear la presentación. Intenta de nuevo más tarde."
 
 
@@ -64,29 +78,48 @@ class TelegramHandler:
 
     def __init__(
         self,
-        bot: TelegramBot,
+        bot: AsyncTelegramBot,
         parse_use_case: ParseRoutineUseCase,
         generate_use_case: GeneratePresentationUseCase,
         chatwoot_logger: Optional[ChatwootLoggerInterface] = None,
+        viewer: Optional[RoutineViewer] = None,
+        jobs: Optional[JobWorkerPool] = None,
+        states: Optional[ConversationStateStoreInterface] = None,
     ):
         self.bot = bot
         self.parse_use_case = parse_use_case
         self.generate_use_case = generate_use_case
         self.chatwoot_logger = chatwoot_logger
-        self.user_states: Dict[int, RoutineDTO] = {}
+        self.viewer = viewer
+        self.jobs = jobs
+        # Rutina pendiente de confirmar por chat
+        self.states = states or MemoryStateStore()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        if jobs:
+            jobs.add_listener(JOB_GENERATE_PRESENTATION, self._on_presentation_job)
 
-    def handle_update(self, update: Dict[str, Any]) -> Dict[str, str]:
+    async def start(self) -> None:
+        """
+        Asocia el handler al event loop en marcha.
+
+        Los trabajos de generación terminan en hilos de la cola; el aviso
+        al usuario se programa en este loop, que es el del cliente HTTP.
+        """
+        self._loop = asyncio.get_running_loop()
+
+    async def handle_update(self, update: Dict[str, Any]) -> Dict[str, str]:
         """Punto de entrada para procesar un update de Telegram."""
 
         if "callback_query" in update:
-            return self._handle_callback(update["callback_query"])
+            return await self._handle_callback(update["callback_query"])
 
         if "message" in update:
-            return self._handle_message(update["message"])
+            return await self._handle_message(update["message"])
 
         return {"status": "ok"}
 
-    def _handle_message(self, message: Dict[str, Any]) -> Dict[str, str]:
+    async def _handle_message(self, message: Dict[str, Any]) -> Dict[str, str]:
         """Procesa un mensaje de texto."""
         chat_id = message["chat"]["id"]
         text = message.get("text", "").strip()
@@ -96,70 +129,69 @@ class TelegramHandler:
             return {"status": "empty"}
 
         # Log incoming message to Chatwoot
-        self._log_incoming(chat_id, user_name, text)
+        await self._log_incoming(chat_id, user_name, text)
 
         # Comandos
         if text.startswith("/"):
-            return self._handle_command(chat_id, text.lower(), user_name)
+            return await self._handle_command(chat_id, text.lower(), user_name)
 
         # Rutina
-        return self._handle_routine(chat_id, text, user_name)
+        return await self._handle_routine(chat_id, text, user_name)
 
-    def _handle_command(
+    async def _handle_command(
         self, chat_id: int, command: str, user_name: str = "Usuario"
     ) -> Dict[str, str]:
         """Procesa comandos."""
 
         if command in ["/start", "/inicio"]:
-            self.user_states.pop(chat_id, None)
-            self._send_and_log(chat_id, MSG_WELCOME)
+            await asyncio.to_thread(self.states.pop, chat_id)
+            await self._send_and_log(chat_id, MSG_WELCOME)
             return {"status": "welcome"}
 
         if command in ["/ayuda", "/help"]:
-            self._send_and_log(chat_id, MSG_HELP)
+            await self._send_and_log(chat_id, MSG_HELP)
             return {"status": "help"}
 
         if command in ["/cancelar", "/cancel"]:
-            if chat_id in self.user_states:
-                self.user_states.pop(chat_id)
-                self._send_and_log(chat_id, MSG_CANCELLED)
+            if await asyncio.to_thread(self.states.pop, chat_id):
+                await self._send_and_log(chat_id, MSG_CANCELLED)
             else:
-                self._send_and_log(chat_id, MSG_NO_PENDING)
+                await self._send_and_log(chat_id, MSG_NO_PENDING)
             return {"status": "cancelled"}
 
         if command == "/estado":
-            if chat_id in self.user_states:
-                self._send_and_log(
+            if await asyncio.to_thread(self.states.get, chat_id):
+                await self._send_and_log(
                     chat_id,
                     "📌 Tienes una rutina pendiente.\nUsa /cancelar para descartarla.",
                 )
             else:
-                self._send_and_log(chat_id, MSG_NO_PENDING)
+                await self._send_and_log(chat_id, MSG_NO_PENDING)
             return {"status": "state"}
 
         return {"status": "unknown_command"}
 
-    def _handle_routine(
+    async def _handle_routine(
         self, chat_id: int, text: str, user_name: str = "Usuario"
     ) -> Dict[str, str]:
         """Procesa texto de rutina."""
 
-        if chat_id in self.user_states:
-            self._send_and_log(
+        if await asyncio.to_thread(self.states.get, chat_id):
+            await self._send_and_log(
                 chat_id,
                 "⚠️ Ya tienes una rutina pendiente.\nUsa /cancelar para descartarla.",
             )
             return {"status": "pending"}
 
-        self.bot.send_typing_action(chat_id)
-        self._send_and_log(chat_id, MSG_PROCESSING)
+        await self.bot.send_typing_action(chat_id)
+        await self._send_and_log(chat_id, MSG_PROCESSING)
 
         try:
-            routine = self.parse_use_case.execute(text)
-            self.user_states[chat_id] = routine
+            routine = await asyncio.to_thread(self.parse_use_case.execute, text)
+            await asyncio.to_thread(self.states.set, chat_id, routine)
 
             preview = self._format_preview(routine)
-            self.bot.send_message_with_keyboard(
+            await self.bot.send_message_with_keyboard(
                 chat_id,
                 preview,
                 [
@@ -169,58 +201,117 @@ class TelegramHandler:
                     ]
                 ],
             )
-            self._log_outgoing(chat_id, preview)
+            await self._log_outgoing(chat_id, preview)
             return {"status": "awaiting"}
 
         except DomainException as e:
             logger.error(f"Error parsing: {e}")
-            self._send_and_log(chat_id, MSG_ERROR_PARSE)
+            await self._send_and_log(chat_id, MSG_ERROR_PARSE)
             return {"status": "error"}
 
-    def _handle_callback(self, callback: Dict[str, Any]) -> Dict[str, str]:
+    async def _handle_callback(self, callback: Dict[str, Any]) -> Dict[str, str]:
         """Procesa callbacks de botones."""
         callback_id = callback.get("id")
         chat_id = callback["message"]["chat"]["id"]
         message_id = callback["message"]["message_id"]
         action = callback.get("data")
 
-        self.bot.answer_callback(callback_id)
-        self.bot.edit_message_markup(chat_id, message_id, None)
+        await self.bot.answer_callback(callback_id)
+        await self.bot.edit_message_markup(chat_id, message_id, None)
 
         if action == "confirm":
-            return self._confirm_presentation(chat_id)
+            return await self._confirm_presentation(chat_id)
 
         if action == "cancel":
-            self.user_states.pop(chat_id, None)
-            self._send_and_log(chat_id, MSG_CANCELLED)
+            await asyncio.to_thread(self.states.pop, chat_id)
+            await self._send_and_log(chat_id, MSG_CANCELLED)
             return {"status": "cancelled"}
 
         return {"status": "unknown_callback"}
 
-    def _confirm_presentation(self, chat_id: int) -> Dict[str, str]:
+    async def _confirm_presentation(self, chat_id: int) -> Dict[str, str]:
         """Genera la presentación."""
-        if chat_id not in self.user_states:
-            self._send_and_log(chat_id, MSG_NO_PENDING)
+        # pop es atómico: un doble clic (o dos workers) no genera dos veces
+        routine = await asyncio.to_thread(self.states.pop, chat_id)
+        if routine is None:
+            await self._send_and_log(chat_id, MSG_NO_PENDING)
             return {"status": "no_pending"}
 
-        routine = self.user_states.pop(chat_id)
-
-        self.bot.send_typing_action(chat_id)
-        self._send_and_log(chat_id, MSG_CREATING)
+        await self.bot.send_typing_action(chat_id)
+        await self._send_and_log(chat_id, await self._creating_message(routine))
+
+        if self.jobs:
+            # Se genera en segundo plano; el enlace llega al terminar el trabajo
+            await asyncio.to_thread(
+                self.jobs.submit,
+                JOB_GENERATE_PRESENTATION,
+                {
+                    "routine": routine.model_dump(),
+                    "chat_id": chat_id,
+                    "owner": f"chat:{chat_id}",
+                },
+                lane=LANE_INTERACTIVE,
+                tenant=f"chat:{chat_id}",
+            )
+            return {"status": "queued"}
 
         try:
-            result = self.generate_use_case.execute(routine)
-            success_msg = (
-                f"✅ *¡Presentación creada!*\n\n🔗 [Abrir presentación]({result.url})"
+            result = await asyncio.to_thread(
+                self.generate_use_case.execute, routine, f"chat:{chat_id}"
             )
-            self._send_and_log(chat_id, success_msg)
-            return {"status": "success"}
-
         except DomainException as e:
             logger.error(f"Error generating: {e}")
-            self._send_and_log(chat_id, MSG_ERROR_SLIDES)
+            await self._send_and_log(chat_id, MSG_ERROR_SLIDES)
             return {"status": "error"}
 
+        await self._send_presentation(chat_id, result.url, result.file_path)
+        return {"status": "success"}
+
+    def _on_presentation_job(self, job: Job) -> None:
+        """Listener de la cola (se llama desde el hilo del worker)."""
+        if job.payload.get("chat_id") is None:
+            return  # Trabajo encolado desde la API REST
+        if self._loop is None or self._loop.is_closed():
+            logger.warning(f"Sin event loop para avisar del trabajo {job.id}")
+            return
+        asyncio.run_coroutine_threadsafe(self._deliver(job), self._loop)
+
+    async def _deliver(self, job: Job) -> None:
+        """Entrega al usuario el resultado de un trabajo de generación."""
+        chat_id = job.payload["chat_id"]
+        if job.result is None:
+            logger.error(f"Error generating (job {job.id}): {job.error}")
+            await self._send_and_log(chat_id, MSG_ERROR_SLIDES)
+            return
+
+        result = job.result
+        await self._send_presentation(chat_id, result["url"], result["file_path"])
+
+    async def _send_presentation(
+        self, chat_id: int, url: str, file_path: Optional[str]
+    ) -> None:
+        """Envía el enlace a la presentación, o el fichero si es local."""
+        if file_path:
+            await self.bot.send_document(chat_id, file_path, "rutina.pptx", MSG_CREATED)
+            await self._log_outgoing(chat_id, MSG_CREATED)
+            return
+
+        success_msg = f"{MSG_CREATED}\n\n🔗 [Abrir presentación]({url})"
+        await self._send_and_log(chat_id, success_msg)
+
+    async def _creating_message(self, routine: RoutineDTO) -> str:
+        """Mensaje de espera, con enlace al visor web si está disponible."""
+        if not self.viewer:
+            return MSG_CREATING
+        try:
+            url = await asyncio.to_thread(
+                self.viewer.publish, routine.content_hash(), routine.to_entities()
+            )
+        except Exception as e:
+            logger.warning(f"No se pudo publicar la rutina en el visor: {e}")
+            return MSG_CREATING
+        return f"{MSG_CREATING}\n\n👀 [Ver rutina mientras tanto]({url})"
+
     def _format_preview(self, routine: RoutineDTO) -> str:
         """Formatea el preview de la rutina."""
         lines = ["📋 *Rutina Detectada*\n"]
@@ -240,24 +331,26 @@ class TelegramHandler:
     # Chatwoot Logging Helpers
     # ─────────────────────────────────────────────────────────
 
-    def _send_and_log(self, chat_id: int, message: str) -> None:
+    async def _send_and_log(self, chat_id: int, message: str) -> None:
         """Envía mensaje al usuario y lo loguea en Chatwoot."""
-        self.bot.send_message(chat_id, message)
-        self._log_outgoing(chat_id, message)
+        await self.bot.send_message(chat_id, message)
+        await self._log_outgoing(chat_id, message)
 
-    def _log_incoming(self, chat_id: int, user_name: str, content: str) -> None:
+    async def _log_incoming(self, chat_id: int, user_name: str, content: str) -> None:
         """Loguea mensaje entrante en Chatwoot si está habilitado."""
-        if self.chatwoot_logger:
-            self.chatwoot_logger.log_incoming_message(
+        if self.chatwoot_logger and self.chatwoot_logger.is_enabled():
+            await asyncio.to_thread(
+                self.chatwoot_logger.log_incoming_message,
                 source_id=str(chat_id),
                 user_name=user_name,
                 content=content,
             )
 
-    def _log_outgoing(self, chat_id: int, content: str) -> None:
+    async def _log_outgoing(self, chat_id: int, content: str) -> None:
         """Loguea mensaje saliente en Chatwoot si está habilitado."""
-        if self.chatwoot_logger:
-            self.chatwoot_logger.log_outgoing_message(
+        if self.chatwoot_logger and self.chatwoot_logger.is_enabled():
+            await asyncio.to_thread(
+                self.chatwoot_logger.log_outgoing_message,
                 source_id=str(chat_id),
                 content=content,
             )
@@ -0,0 +1,189 @@
+"""
+Limitador de envíos a la Bot API de Telegram.
+
+Telegram limita los mensajes de un bot (aprox. 30 por segundo en total,
+1 por segundo por chat y 20 por minuto por grupo) y responde 429 con un
+`retry_after` al pasarse. Este limitador reserva un hueco para cada
+envío antes de hacerlo, mantiene el orden de los envíos de cada chat y
+reintenta los 429 tras la espera que indica Telegram.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Métodos que cuentan como mensaje para los límites por chat
+MESSAGE_METHODS = frozenset({"sendMessage", "sendDocument", "editMessageReplyMarkup"})
+
+# Por encima de este número de chats se olvidan los que ya no tienen espera
+_MAX_TRACKED_CHATS = 1000
+
+
+class TelegramRateLimiter:
+    """
+    Planificador de envíos con límites global, por chat y por grupo.
+
+    - Cada envío reserva el primer instante libre que respeta los tres
+      límites y espera hasta entonces (sin bloquear el event loop).
+    - Los envíos de un mismo chat salen en orden de llegada (FIFO), también
+      cuando uno de ellos tiene que reintentarse.
+    - Un 429 retrasa el chat `retry_after` segundos y se reintenta hasta
+      `max_retries` veces.
+    """
+
+    def __init__(
+        self,
+        global_per_second: float = 30.0,
+        chat_per_second: float = 1.0,
+        group_per_minute: float = 20.0,
+        max_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            global_per_second: Mensajes por segundo entre todos los chats
+            chat_per_second: Mensajes por segundo a un chat privado
+            group_per_minute: Mensajes por minuto a un grupo
+            max_retries: Reintentos tras un 429
+            clock: Reloj monotónico (inyectable para tests)
+        """
+        self._global_interval = 1.0 / global_per_second
+        self._chat_interval = 1.0 / chat_per_second
+        self._group_interval = 60.0 / group_per_minute
+        self.max_retries = max_retries
+        self._clock = clock
+
+        self._global_next = 0.0
+        self._chat_next: Dict[int, float] = {}
+        self._tails: Dict[int, asyncio.Future] = {}
+
+        self.sent = 0
+        self.throttled = 0
+        self.dropped = 0
+        self.waiting = 0
+        self.max_delay = 0.0
+
+    async def run(
+        self,
+        method: str,
+        chat_id: Optional[int],
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Ejecuta una llamada a la Bot API respetando los límites.
+
+        Args:
+            method: Método de la Bot API (ej: "sendMessage")
+            chat_id: Chat destino (None si la llamada no va a un chat)
+            call: Hace la petición y devuelve el JSON de respuesta
+
+        Returns:
+            La respuesta de Telegram (la del último intento si se agotan
+            los reintentos)
+        """
+        if chat_id is None:
+            return await self._send(method, None, call)
+
+        # Encadenar detrás del envío anterior al mismo chat
+        previous = self._tails.get(chat_id)
+        done = asyncio.get_running_loop().create_future()
+        self._tails[chat_id] = done
+        try:
+            if previous is not None:
+                await previous
+            return await self._send(method, chat_id, call)
+        finally:
+            done.set_result(None)
+            if self._tails.get(chat_id) is done:
+                del self._tails[chat_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del limitador."""
+        return {
+            "sent": self.sent,
+            "throttled": self.throttled,
+            "dropped": self.dropped,
+            "waiting": self.waiting,
+            "max_delay_seconds": round(self.max_delay, 3),
+            "chats": len(self._chat_next),
+        }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    async def _send(
+        self,
+        method: str,
+        chat_id: Optional[int],
+        call: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        for attempt in range(self.max_retries + 1):
+            delay = self._reserve(method, chat_id)
+            if delay > 0:
+                self.waiting += 1
+                try:
+                    await asyncio.sleep(delay)
+                finally:
+                    self.waiting -= 1
+
+            response = await call()
+            retry_after = self._retry_after(response)
+            if retry_after is None:
+                self.sent += 1
+                return response
+
+            self.throttled += 1
+            logger.warning(
+                f"Telegram 429 en {method} (chat {chat_id}), "
+                f"reintento {attempt + 1} en {retry_after}s"
+            )
+            self._postpone(chat_id, retry_after)
+
+        self.dropped += 1
+        logger.error(f"Envío {method} a {chat_id} descartado tras {attempt + 1} 429")
+        return response
+
+    def _reserve(self, method: str, chat_id: Optional[int]) -> float:
+        """Reserva el siguiente hueco libre y devuelve cuánto hay que esperar."""
+        now = self._clock()
+        slot = max(now, self._global_next)
+
+        if chat_id is not None:
+            slot = max(slot, self._chat_next.get(chat_id, 0.0))
+
+        # Solo los mensajes consumen el cupo del chat
+        if chat_id is not None and method in MESSAGE_METHODS:
+            # Los IDs negativos son grupos y canales
+            interval = self._group_interval if chat_id < 0 else self._chat_interval
+            self._chat_next[chat_id] = slot + interval
+            if len(self._chat_next) > _MAX_TRACKED_CHATS:
+                self._forget_idle(now)
+
+        self._global_next = slot + self._global_interval
+        delay = slot - now
+        self.max_delay = max(self.max_delay, delay)
+        return delay
+
+    def _postpone(self, chat_id: Optional[int], retry_after: float) -> None:
+        """Retrasa los próximos envíos tras un 429."""
+        until = self._clock() + retry_after
+        if chat_id is None:
+            self._global_next = max(self._global_next, until)
+        else:
+            self._chat_next[chat_id] = max(self._chat_next.get(chat_id, 0.0), until)
+
+    def _forget_idle(self, now: float) -> None:
+        for chat_id in [c for c, t in self._chat_next.items() if t <= now]:
+            del self._chat_next[chat_id]
+
+    @staticmethod
+    def _retry_after(response: Dict[str, Any]) -> Optional[float]:
+        """`retry_after` de una respuesta 429, o None si no lo es."""
+        if response.get("ok", True) or response.get("error_code") != 429:
+            return None
+        parameters = response.get("parameters") or {}
+        return float(parameters.get("retry_after", 1))
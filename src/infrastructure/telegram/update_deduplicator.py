@@ -0,0 +1,140 @@
+"""
+Descarte de updates de Telegram repetidos.
+
+Telegram reenvía un update si el webhook tarda en responder (y tras
+cambiar entre webhook y getUpdates puede llegar dos veces). Sin este
+filtro cada reenvío repetía todo el procesamiento: llamadas a Gemini,
+presentaciones duplicadas...
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from infrastructure.persistence.sqlite_seen_updates import SQLiteSeenUpdates
+
+logger = logging.getLogger(__name__)
+
+# Cada cuántos updates nuevos se purga el nivel compartido
+_PURGE_EVERY = 1000
+
+
+class UpdateDeduplicator:
+    """
+    Conjunto acotado de update_id ya recibidos.
+
+    - Nivel en memoria: los últimos `capacity` update_id (se olvidan los
+      más antiguos). Basta con un solo proceso.
+    - Nivel compartido opcional (SQLite): para varios workers, que no
+      comparten memoria. Se consulta solo si la memoria no lo conoce.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10_000,
+        shared: Optional[SQLiteSeenUpdates] = None,
+        retention: float = 24 * 3600,
+    ):
+        """
+        Args:
+            capacity: update_id recordados en memoria
+            shared: Registro compartido entre procesos (None = solo memoria)
+            retention: Segundos que se recuerda un update_id en el registro
+                compartido (Telegram no reenvía updates de más de 24 h)
+        """
+        self.capacity = capacity
+        self.shared = shared
+        self.retention = retention
+        self._seen: "OrderedDict[int, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._since_purge = 0
+
+        self.accepted = 0
+        self.duplicates = 0
+
+    def filter(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Devuelve los updates no vistos antes, en el mismo orden.
+
+        Los updates sin update_id se dejan pasar. Si hay nivel compartido
+        hace I/O: desde código asíncrono hay que llamarlo con to_thread.
+        """
+        with self._lock:
+            candidates = []
+            for update in updates:
+                update_id = update.get("update_id")
+                if update_id is not None and update_id in self._seen:
+                    self._seen.move_to_end(update_id)
+                    continue
+                candidates.append(update)
+                if update_id is not None:
+                    self._remember(update_id)
+
+        if self.shared is not None and candidates:
+            candidates = self._filter_shared(candidates)
+
+        dropped = len(updates) - len(candidates)
+        with self._lock:
+            self.accepted += len(candidates)
+            self.duplicates += dropped
+        if dropped:
+            logger.info(f"{dropped} updates repetidos descartados")
+        return candidates
+
+    def is_new(self, update: Dict[str, Any]) -> bool:
+        """True si el update no se había recibido antes."""
+        return bool(self.filter([update]))
+
+    def release(self, updates: List[Dict[str, Any]]) -> None:
+        """
+        Deshace `filter` para updates que al final no se guardaron, para
+        que el reenvío de Telegram no se descarte como repetido.
+        """
+        ids = [u["update_id"] for u in updates if u.get("update_id") is not None]
+        if not ids:
+            return
+        with self._lock:
+            for update_id in ids:
+                self._seen.pop(update_id, None)
+            self.accepted -= len(ids)
+        if self.shared is not None:
+            try:
+                self.shared.remove(ids)
+            except Exception as e:
+                logger.warning(f"Error olvidando updates no guardados: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del deduplicador."""
+        return {
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "memory": len(self._seen),
+            "capacity": self.capacity,
+            "shared": self.shared.count() if self.shared else None,
+        }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    def _remember(self, update_id: int) -> None:
+        self._seen[update_id] = None
+        while len(self._seen) > self.capacity:
+            self._seen.popitem(last=False)
+
+    def _filter_shared(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        ids = [u["update_id"] for u in updates if u.get("update_id") is not None]
+        try:
+            new = self.shared.add_new(ids)
+            self._since_purge += len(new)
+            if self._since_purge >= _PURGE_EVERY:
+                self._since_purge = 0
+                self.shared.purge(self.retention)
+        except Exception as e:
+            # Ante la duda se procesa: mejor un duplicado que perder un update
+            logger.warning(f"Error consultando updates vistos: {e}")
+            return updates
+        return [
+            u for u in updates if u.get("update_id") is None or u["update_id"] in new
+        ]
@@ -0,0 +1,233 @@
+"""
+Procesamiento en segundo plano de los updates de Telegram.
+
+El webhook guarda cada update en la bandeja y responde al momento;
+este dispatcher la vacía con varias tareas asyncio. Telegram deja así
+de ver webhooks lentos (y de reintentarlos o frenar la entrega).
+"""
+
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from infrastructure.persistence.sqlite_update_inbox import (
+    InboxItem,
+    SQLiteUpdateInbox,
+)
+from infrastructure.telegram.chat_executor import ChatSerialExecutor, chat_key
+from infrastructure.telegram.update_deduplicator import UpdateDeduplicator
+
+logger = logging.getLogger(__name__)
+
+UpdateHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# Updates tomados de la bandeja (en proceso o esperando turno) por worker
+_CLAIMED_PER_WORKER = 4
+
+
+class UpdateDispatcher:
+    """
+    Procesa los updates guardados en la bandeja.
+
+    - Una tarea lectora toma los updates en orden de llegada y lanza una
+      tarea por update.
+    - Los updates de un mismo chat se procesan de uno en uno y en orden;
+      los de chats distintos, en paralelo (hasta `workers` a la vez). Un
+      update que espera turno en su chat no ocupa worker.
+    - Al arrancar se recuperan los updates que quedaron a medias (los de
+      leases caducados: otros procesos vivos pueden compartir la bandeja).
+    - Mientras hay updates en curso se renueva su lease en la bandeja.
+    - Los updates repetidos (mismo update_id) se descartan antes de
+      guardarlos, si hay deduplicador.
+    """
+
+    def __init__(
+        self,
+        inbox: SQLiteUpdateInbox,
+        handle: UpdateHandler,
+        workers: int = 4,
+        poll_interval: float = 1.0,
+        retention: float = 24 * 3600,
+        dedup: Optional[UpdateDeduplicator] = None,
+    ):
+        """
+        Args:
+            inbox: Bandeja de updates
+            handle: Procesa un update (ej: TelegramHandler.handle_update)
+            workers: Updates procesados a la vez
+            poll_interval: Segundos entre consultas cuando no hay avisos
+            retention: Segundos que se conservan los updates procesados
+            dedup: Filtro de updates repetidos (None = sin filtro)
+        """
+        self.inbox = inbox
+        self._handle = handle
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.dedup = dedup
+
+        self._wakeup = asyncio.Event()
+        self._stopped = asyncio.Event()
+        self._reader: Optional[asyncio.Task] = None
+        self._active: Set[asyncio.Task] = set()
+        self._slots = asyncio.Semaphore(workers)
+        self._chats = ChatSerialExecutor()
+        self._purged_at = 0.0
+        self._renewed_at = 0.0
+
+        self.processed = 0
+        self.failed = 0
+        self.last_lag_seconds = 0.0
+
+    async def submit(self, update: Dict[str, Any]) -> Optional[int]:
+        """
+        Guarda un update en la bandeja y despierta a un worker.
+
+        El update_id solo queda como visto si el update se guarda: si falla
+        la escritura se libera y la excepción se propaga.
+
+        Returns:
+            Posición del update en la bandeja (None si era repetido)
+        """
+        if self.dedup is not None and not await asyncio.to_thread(
+            self.dedup.is_new, update
+        ):
+            return None
+        try:
+            seq = await asyncio.to_thread(self.inbox.append, update)
+        except Exception:
+            if self.dedup is not None:
+                await asyncio.to_thread(self.dedup.release, [update])
+            raise
+        self.notify()
+        return seq
+
+    def notify(self) -> None:
+        """Avisa a los workers de que hay updates nuevos en la bandeja."""
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        """Recupera los updates interrumpidos y arranca los workers."""
+        if self._reader:
+            return
+        self._stopped.clear()
+        await asyncio.to_thread(self.inbox.recover)
+        self._reader = asyncio.create_task(self._run(), name="inbox-reader")
+        logger.info(f"Dispatcher de updates iniciado con {self.workers} workers")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Detiene los workers.
+
+        Los updates en curso que no terminen a tiempo se reprocesan cuando
+        caduque su lease.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        tasks = list(self._active) + ([self._reader] if self._reader else [])
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+        self._reader = None
+        self._active.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de la bandeja y del procesamiento."""
+        return {
+            **self.inbox.stats(),
+            "workers": self.workers,
+            "in_flight": len(self._active),
+            **self._chats.stats(),
+            "processed": self.processed,
+            "errors": self.failed,
+            "last_lag_seconds": round(self.last_lag_seconds, 3),
+        }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    async def _run(self) -> None:
+        limit = self.workers * _CLAIMED_PER_WORKER
+        while not self._stopped.is_set():
+            await self._renew()
+            if len(self._active) >= limit:
+                await asyncio.wait(
+                    self._active,
+                    timeout=self.poll_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                continue
+
+            self._wakeup.clear()
+            try:
+                items = await asyncio.to_thread(
+                    self.inbox.claim, limit - len(self._active)
+                )
+            except Exception as e:
+                logger.warning(f"Error leyendo la bandeja de updates: {e}")
+                items = []
+
+            if not items:
+                await self._purge()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Las tareas arrancan en el orden en que se crean y cada una
+            # reserva su turno en el chat antes de su primer await: el orden
+            # dentro de cada chat es el de llegada.
+            for item in items:
+                task = asyncio.create_task(
+                    self._chats.run(chat_key(item.update), partial(self._work, item))
+                )
+                self._active.add(task)
+                task.add_done_callback(self._active.discard)
+
+    async def _work(self, item: InboxItem) -> None:
+        """Procesa un update cuando queda un worker libre."""
+        async with self._slots:
+            await self._process(item)
+
+    async def _process(self, item: InboxItem) -> None:
+        self.last_lag_seconds = max(0.0, time.time() - item.received_at)
+        error: Optional[str] = None
+        try:
+            await self._handle(item.update)
+            self.processed += 1
+        except Exception as e:
+            logger.error(f"Error procesando update {item.seq}: {e}", exc_info=True)
+            self.failed += 1
+            error = str(e) or type(e).__name__
+
+        try:
+            await asyncio.to_thread(self.inbox.ack, item.seq, error)
+        except Exception as e:
+            logger.warning(f"No se pudo confirmar el update {item.seq}: {e}")
+
+    async def _renew(self) -> None:
+        """Renueva los leases en curso (cada tercio de la duración del lease)."""
+        now = time.monotonic()
+        if not self._active or now - self._renewed_at < self.inbox.lease / 3:
+            return
+        self._renewed_at = now
+        try:
+            await asyncio.to_thread(self.inbox.renew)
+        except Exception as e:
+            logger.warning(f"Error renovando los updates en curso: {e}")
+
+    async def _purge(self) -> None:
+        """Borra los updates procesados antiguos (como mucho una vez por hora)."""
+        now = time.monotonic()
+        if now - self._purged_at < 3600:
+            return
+        self._purged_at = now
+        try:
+            await asyncio.to_thread(self.inbox.purge, self.retention)
+        except Exception as e:
+            logger.warning(f"Error purgando la bandeja de updates: {e}")
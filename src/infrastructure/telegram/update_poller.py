@@ -0,0 +1,149 @@
+"""
+Ingesta de updates por long polling (getUpdates).
+
+Alternativa al webhook para entornos sin TLS de entrada o detrás de NAT,
+para vaciar un atasco tras una caída o para pruebas de carga contra una
+Bot API falsa. Los lotes se guardan en la misma bandeja que usa el
+webhook, así que el procesamiento (y su concurrencia) es el mismo.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from infrastructure.persistence.sqlite_update_inbox import SQLiteUpdateInbox
+from infrastructure.telegram.async_bot import AsyncTelegramBot
+from infrastructure.telegram.update_dispatcher import UpdateDispatcher
+
+logger = logging.getLogger(__name__)
+
+
+class UpdatePoller:
+    """
+    Bucle de getUpdates con offset persistente.
+
+    - Cada lote se guarda en la bandeja junto con el offset siguiente en
+      una sola transacción; el offset solo se confirma a Telegram (en la
+      siguiente llamada) cuando el lote ya está guardado.
+    - Si el lote viene lleno se pide el siguiente sin esperar: así se
+      vacía rápido un atasco.
+    - Los updates repetidos se descartan con el deduplicador del
+      dispatcher antes de guardarlos.
+    - Los errores se reintentan con backoff exponencial.
+    """
+
+    def __init__(
+        self,
+        bot: AsyncTelegramBot,
+        inbox: SQLiteUpdateInbox,
+        dispatcher: UpdateDispatcher,
+        batch_size: int = 100,
+        timeout: int = 30,
+        max_backoff: float = 30.0,
+    ):
+        """
+        Args:
+            bot: Cliente asíncrono de la Bot API
+            inbox: Bandeja donde se guardan los updates
+            dispatcher: Dispatcher que procesa la bandeja
+            batch_size: Updates por llamada (máximo 100 en Telegram)
+            timeout: Segundos que Telegram mantiene abierta cada llamada
+            max_backoff: Espera máxima entre reintentos tras un error
+        """
+        self.bot = bot
+        self.inbox = inbox
+        self.dispatcher = dispatcher
+        self.batch_size = min(batch_size, 100)
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+
+        self._task: Optional[asyncio.Task] = None
+        self.offset = 0
+
+        self.polls = 0
+        self.received = 0
+        self.errors = 0
+        self.last_batch = 0
+
+    async def start(self) -> None:
+        """Elimina el webhook y arranca el bucle de polling."""
+        if self._task:
+            return
+        self.offset = await asyncio.to_thread(self.inbox.offset)
+        await self.bot.delete_webhook()
+        self._task = asyncio.create_task(self._run(), name="telegram-poller")
+        logger.info(f"Polling de Telegram iniciado (offset {self.offset})")
+
+    async def stop(self) -> None:
+        """Detiene el bucle (el lote en curso, si no se guardó, se repite)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def poll_once(self) -> int:
+        """
+        Pide un lote de updates y lo guarda en la bandeja.
+
+        Returns:
+            Número de updates nuevos recibidos (sin contar repetidos)
+        """
+        updates = await self.bot.get_updates(
+            self.offset, limit=self.batch_size, timeout=self.timeout
+        )
+        self.polls += 1
+        self.last_batch = len(updates)
+        if not updates:
+            return 0
+
+        offset = max(update["update_id"] for update in updates) + 1
+        dedup = self.dispatcher.dedup
+        if dedup is not None:
+            # El offset avanza igual aunque todo el lote fuera repetido
+            updates = await asyncio.to_thread(dedup.filter, updates)
+        try:
+            await asyncio.to_thread(self.inbox.append_batch, updates, offset)
+        except Exception:
+            # El lote se pedirá otra vez: no debe contar como visto
+            if dedup is not None:
+                await asyncio.to_thread(dedup.release, updates)
+            raise
+        self.offset = offset
+        self.received += len(updates)
+        if updates:
+            self.dispatcher.notify()
+        return len(updates)
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del polling."""
+        return {
+            "offset": self.offset,
+            "polls": self.polls,
+            "received": self.received,
+            "errors": self.errors,
+            "last_batch": self.last_batch,
+        }
+
+    # ─────────────────────────────────────────────────────────
+    # Métodos privados
+    # ─────────────────────────────────────────────────────────
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                received = await self.poll_once()
+                backoff = 1.0
+                if not received and not self.timeout:
+                    # Sin long polling (timeout=0) no hay espera en Telegram
+                    await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Error en getUpdates, reintento en {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
@@ -0,0 +1 @@
+"""Visor web (HTML/PDF) de rutinas."""
@@ -0,0 +1,156 @@
+"""
+Renderizado de rutinas a HTML y PDF.
+
+Las plantillas (mismo formato que docs/rutina.html) se compilan una sola
+vez al importar el módulo; renderizar es solo sustituir y concatenar.
+El PDF se genera a partir del mismo HTML con WeasyPrint (opcional).
+"""
+
+import hashlib
+from html import escape
+from string import Template
+from typing import List
+
+from domain.entities.routine import Exercise, Routine
+
+try:
+    from weasyprint import HTML
+except ImportError:  # WeasyPrint es opcional
+    HTML = None
+
+_PAGE = Template(
+    """<!DOCTYPE html>
+<html lang="es">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Rutina de Entrenamiento</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            background-color: #f5f5f5;
+            color: #333;
+            text-align: center;
+            margin: 0;
+            padding: 0;
+        }
+        .slide {
+            width: 80%;
+            margin: 50px auto;
+            background: white;
+            padding: 20px;
+            border-radius: 10px;
+            box-shadow: 2px 2px 10px rgba(0,0,0,0.1);
+            display: none;
+        }
+        h1 { color: #0056b3; }
+        table { width: 100%; border-collapse: collapse; margin-top: 10px; }
+        th, td { border: 1px solid #ddd; padding: 10px; text-align: left; }
+        th { background-color: #0056b3; color: white; }
+        .controls { margin-top: 20px; }
+        button {
+            padding: 10px 20px;
+            font-size: 16px;
+            border: none;
+            cursor: pointer;
+            margin: 5px;
+        }
+        .prev { background-color: #666; color: white; }
+        .next { background-color: #0056b3; color: white; }
+        @media print {
+            .slide {
+                display: block !important;
+                box-shadow: none;
+                page-break-after: always;
+            }
+            .controls { display: none; }
+        }
+    </style>
+</head>
+<body>
+    <h1>Rutina de Entrenamiento</h1>
+$slides
+    <div class="controls">
+        <button class="prev" onclick="changeSlide(-1)">Anterior</button>
+        <button class="next" onclick="changeSlide(1)">Siguiente</button>
+    </div>
+    <script>
+        let currentSlide = 0;
+        const slides = document.querySelectorAll(".slide");
+
+        function showSlide(index) {
+            slides.forEach(slide => slide.style.display = "none");
+            slides[index].style.display = "block";
+        }
+
+        function changeSlide(direction) {
+            currentSlide += direction;
+            if (currentSlide >= slides.length) currentSlide = 0;
+            if (currentSlide < 0) currentSlide = slides.length - 1;
+            showSlide(currentSlide);
+        }
+
+        showSlide(currentSlide);
+    </script>
+</body>
+</html>
+"""
+)
+
+_SLIDE = Template(
+    """    <div class="slide" id="slide-$index">
+        <h2>Día $day</h2>
+        <table>
+            <tr><th>Ejercicio</th><th>Series</th><th>Repeticiones</th></tr>
+$rows
+        </table>
+    </div>
+"""
+)
+
+_ROW = Template(
+    "            <tr><td>$name</td><td>$sets</td><td>$reps</td></tr>\n"
+)
+
+# Cambia si cambian las plantillas: forma parte del ETag de lo renderizado
+TEMPLATE_VERSION = hashlib.sha256(
+    (_PAGE.template + _SLIDE.template + _ROW.template).encode("utf-8")
+).hexdigest()[:12]
+
+
+def pdf_available() -> bool:
+    """Indica si WeasyPrint está instalado."""
+    return HTML is not None
+
+
+def render_html(routines: List[Routine]) -> str:
+    """Renderiza las rutinas como página HTML con una "slide" por día."""
+    slides = "".join(
+        _SLIDE.substitute(
+            index=index,
+            day=routine.day_number,
+            rows="".join(_row(ex) for ex in routine.exercises),
+        )
+        for index, routine in enumerate(routines)
+    )
+    return _PAGE.substitute(slides=slides)
+
+
+def render_pdf(html: str) -> bytes:
+    """
+    Convierte el HTML renderizado en PDF (una página por día).
+
+    Raises:
+        RuntimeError: Si WeasyPrint no está instalado
+    """
+    if HTML is None:
+        raise RuntimeError("La exportación a PDF requiere weasyprint")
+    return HTML(string=html).write_pdf()
+
+
+def _row(exercise: Exercise) -> str:
+    return _ROW.substitute(
+        name=escape(exercise.name),
+        sets=escape(exercise.sets),
+        reps=escape(", ".join(exercise.reps)),
+    )
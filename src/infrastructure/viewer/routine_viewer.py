@@ -0,0 +1,137 @@
+"""
+Visor de rutinas publicadas.
+
+Publicar una rutina solo la guarda bajo su hash de contenido; el HTML o
+PDF se renderiza la primera vez que se pide y se guarda en una caché LRU
+en memoria. Como el contenido de un hash nunca cambia, las respuestas se
+pueden cachear indefinidamente en el cliente (ETag + Cache-Control).
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from domain.entities.routine import Routine
+from infrastructure.persistence.sqlite_routine_store import SQLiteRoutineStore
+from infrastructure.viewer.html_renderer import (
+    TEMPLATE_VERSION,
+    pdf_available,
+    render_html,
+    render_pdf,
+)
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {"html": "text/html; charset=utf-8", "pdf": "application/pdf"}
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@dataclass(frozen=True)
+class RenderedRoutine:
+    """Documento renderizado listo para servir."""
+
+    content: bytes
+    media_type: str
+    etag: str
+
+
+class RoutineViewer:
+    """Publica rutinas y sirve su versión HTML/PDF cacheada."""
+
+    def __init__(
+        self, store: SQLiteRoutineStore, base_url: str = "", max_entries: int = 256
+    ):
+        """
+        Args:
+            store: Almacén de rutinas por hash de contenido
+            base_url: URL pública del servicio para construir enlaces
+            max_entries: Documentos renderizados que se mantienen en memoria
+        """
+        self.store = store
+        self.base_url = base_url.rstrip("/")
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[str, str], RenderedRoutine]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.renders = 0
+        self.hits = 0
+
+    def publish(self, key: str, routines: List[Routine]) -> str:
+        """
+        Guarda la rutina y devuelve la URL de su visor HTML.
+
+        Args:
+            key: Hash de contenido de la rutina
+            routines: Rutinas a publicar
+        """
+        self.store.put(key, routines)
+        return self.url(key)
+
+    def url(self, key: str, fmt: str = "html") -> str:
+        """URL pública del visor."""
+        suffix = "" if fmt == "html" else f"?format={fmt}"
+        return f"{self.base_url}/api/v1/routines/view/{key}{suffix}"
+
+    def etag(self, key: str, fmt: str) -> str:
+        """ETag del documento (se conoce sin renderizar)."""
+        return f'"{key[:32]}-{TEMPLATE_VERSION}-{fmt}"'
+
+    def supports(self, fmt: str) -> bool:
+        """Indica si el formato se puede generar en este despliegue."""
+        if fmt == "pdf":
+            return pdf_available()
+        return fmt in MEDIA_TYPES
+
+    def published(self, key: str, fmt: str = "html") -> bool:
+        """Indica si la rutina está publicada (sin renderizarla)."""
+        with self._lock:
+            if (key, fmt) in self._cache:
+                return True
+        return self.store.exists(key)
+
+    def render(self, key: str, fmt: str = "html") -> Optional[RenderedRoutine]:
+        """
+        Devuelve el documento renderizado, desde caché si ya existe.
+
+        Args:
+            key: Hash de contenido de la rutina
+            fmt: "html" o "pdf"
+
+        Returns:
+            RenderedRoutine, o None si la rutina no está publicada
+        """
+        cache_key = (key, fmt)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached:
+                self._cache.move_to_end(cache_key)
+                self.hits += 1
+                return cached
+
+        routines = self.store.get(key)
+        if routines is None:
+            return None
+
+        html = render_html(routines)
+        content = render_pdf(html) if fmt == "pdf" else html.encode("utf-8")
+        document = RenderedRoutine(content, MEDIA_TYPES[fmt], self.etag(key, fmt))
+
+        with self._lock:
+            self.renders += 1
+            self._cache[cache_key] = document
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        logger.info(f"Rutina {key[:12]} renderizada en {fmt}")
+        return document
+
+    def stats(self) -> Dict[str, int]:
+        """Métricas del visor."""
+        with self._lock:
+            return {
+                "size": len(self._cache),
+                "renders": self.renders,
+                "hits": self.hits,
+            }
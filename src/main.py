@@ -14,7 +14,17 @@ sys.path.insert(0, str(Path(__file__).parent))
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from api.routes import health, routines, telegram_webhook
+from api.dependencies import (
+    get_async_telegram_bot,
+    get_job_pool,
+    get_local_generator,
+    get_retention_sweeper,
+    get_slides_generator,
+    get_telegram_handler,
+    get_update_dispatcher,
+    get_update_poller,
+)
+from api.routes import health, jobs, metrics, routines, telegram_webhook
 from infrastructure.config.settings import settings
 
 # ─────────────────────────────────────────────────────────
@@ -68,7 +78,9 @@ app.add_middleware(
 # ─────────────────────────────────────────────────────────
 
 app.include_router(health.router)
+app.include_router(metrics.router)
 app.include_router(routines.router)
+app.include_router(jobs.router)
 app.include_router(telegram_webhook.router)
 
 
@@ -82,11 +94,90 @@ async def startup_event():
     logger.info(f"🚀 {settings.app_name} v2.0.0 iniciando...")
     logger.info("📝 Docs disponibles en /docs")
 
+    try:
+        generator = get_slides_generator()
+        generator.warm_up()
+        generator.start()
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo precargar la plantilla de Slides: {e}")
+
+    try:
+        sweeper = get_retention_sweeper()
+        if sweeper:
+            sweeper.start()
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo iniciar el sweeper de retención: {e}")
+
+    try:
+        # El handler se suscribe a los trabajos terminados: debe existir antes
+        # de que los workers recuperen los pendientes del arranque anterior
+        await get_telegram_handler().start()
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo inicializar el handler de Telegram: {e}")
+
+    try:
+        get_job_pool().start()
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo iniciar la cola de trabajos: {e}")
+
+    try:
+        await get_update_dispatcher().start()
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo iniciar el dispatcher de updates: {e}")
+
+    try:
+        poller = get_update_poller()
+        if poller:
+            await poller.start()
+    except Exception as e:
+        logger.warning(f"⚠️ No se pudo iniciar el polling de Telegram: {e}")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("👋 Apagando aplicación...")
 
+    try:
+        poller = get_update_poller()
+        if poller:
+            await poller.stop()
+    except Exception as e:
+        logger.warning(f"⚠️ Error deteniendo el polling de Telegram: {e}")
+
+    try:
+        await get_update_dispatcher().stop()
+    except Exception as e:
+        logger.warning(f"⚠️ Error deteniendo el dispatcher de updates: {e}")
+
+    try:
+        get_job_pool().stop()
+    except Exception as e:
+        logger.warning(f"⚠️ Error deteniendo la cola de trabajos: {e}")
+
+    try:
+        sweeper = get_retention_sweeper()
+        if sweeper:
+            sweeper.stop()
+    except Exception as e:
+        logger.warning(f"⚠️ Error deteniendo el sweeper de retención: {e}")
+
+    try:
+        await get_async_telegram_bot().aclose()
+    except Exception as e:
+        logger.warning(f"⚠️ Error cerrando el cliente de Telegram: {e}")
+
+    try:
+        get_slides_generator().stop()
+    except Exception as e:
+        logger.warning(f"⚠️ Error deteniendo el generador de Slides: {e}")
+
+    try:
+        local = get_local_generator()
+        if local:
+            local.stop()
+    except Exception as e:
+        logger.warning(f"⚠️ Error deteniendo el generador local: {e}")
+
 
 # ─────────────────────────────────────────────────────────
 # Root endpoint
@@ -1,3 +1,5 @@
+import time
+
 import requests
 
 BASE_URL = "http://localhost:8000"
@@ -34,25 +36,39 @@ def test_generate_slides_creates_presentation():
     except requests.RequestException as e:
         assert False, f"Request to generate slides failed: {e}"
 
-    # Validate response code
-    assert response.status_code == 200
+    # The request is queued: 202 Accepted with the job to poll
+    assert response.status_code == 202
 
     # Validate response content type
     content_type = response.headers.get("Content-Type", "")
     assert "application/json" in content_type
 
-    response_json = response.json()
+    job = response.json()
+
+    # Validate expected keys in response (JobResponse schema)
+    assert "id" in job, f"Response missing 'id'. Got: {job}"
+    assert "status_url" in job, f"Response missing 'status_url'. Got: {job}"
+    assert response.headers.get("Location") == job["status_url"]
+
+    # Poll the job until it finishes
+    deadline = time.time() + TIMEOUT
+    while job["status"] in ("queued", "running") and time.time() < deadline:
+        time.sleep(1)
+        status = requests.get(f"{BASE_URL}{job['status_url']}", timeout=TIMEOUT)
+        status.raise_for_status()
+        job = status.json()
 
-    # Validate expected keys in response (PresentationResponse schema: id, url)
-    assert "url" in response_json, f"Response missing 'url'. Got: {response_json}"
-    assert "id" in response_json, f"Response missing 'id'. Got: {response_json}"
+    assert job["status"] == "succeeded", f"Job did not succeed. Got: {job}"
 
-    link = response_json["url"]
+    result = job["result"]
+    assert "url" in result, f"Result missing 'url'. Got: {result}"
+    assert "id" in result, f"Result missing 'id'. Got: {result}"
+
+    link = result["url"]
 
     # Simple validation: the link should be a non-empty string and look like a URL
     assert isinstance(link, str) and link.startswith("http"), (
         "Invalid presentation link returned"
     )
 
-
 test_generate_slides_creates_presentation()